@@ -3,7 +3,31 @@ Add election information columns to FLORIDA_FEDERAL_OFFICIALS_COMPLETE.csv
 """
 
 import pandas as pd
-import sqlite3
+from utils.database import CongressDatabase
+
+# Election dates for 2026
+PRIMARY_2026 = "August 18, 2026"
+GENERAL_2026 = "November 3, 2026"
+
+def election_info(office, last_name):
+    """
+    (End_Current_Term, Next_Primary_Election, Next_General_Election) for a
+    member, or None when no rule applies
+    """
+    if office == 'U.S. Senate':
+        if last_name == 'Scott':
+            # Rick Scott - re-elected 2024, term ends 2031
+            return ("January 3, 2031", "August 2030", "November 2030")
+        elif last_name == 'Rubio':
+            # Marco Rubio seat - Special election 2026 (Rubio became Secretary of State)
+            return ("January 3, 2027 (Special Election)", PRIMARY_2026, GENERAL_2026)
+
+    elif office == 'U.S. House':
+        # All House members elected in 2024, terms end January 2027
+        # All up for re-election in 2026
+        return ("January 3, 2027", PRIMARY_2026, GENERAL_2026)
+
+    return None
 
 def add_election_columns():
     """Add election columns to CSV and database"""
@@ -18,10 +42,6 @@ def add_election_columns():
     df['Next_Primary_Election'] = ''
     df['Next_General_Election'] = ''
 
-    # Election dates for 2026
-    PRIMARY_2026 = "August 18, 2026"
-    GENERAL_2026 = "November 3, 2026"
-
     print("\nUpdating election information...")
     print("="*80)
 
@@ -30,29 +50,17 @@ def add_election_columns():
         office = row['Office']
         name = f"{row['First_Name']} {row['Last_Name']}"
 
-        if office == 'U.S. Senate':
-            # Senators
-            if row['Last_Name'] == 'Scott':
-                # Rick Scott - re-elected 2024, term ends 2031
-                df.at[idx, 'End_Current_Term'] = "January 3, 2031"
-                df.at[idx, 'Next_Primary_Election'] = "August 2030"
-                df.at[idx, 'Next_General_Election'] = "November 2030"
-                print(f"[Senate] {name}: Term ends 2031, next election 2030")
-
-            elif row['Last_Name'] == 'Rubio':
-                # Marco Rubio seat - Special election 2026 (Rubio became Secretary of State)
-                df.at[idx, 'End_Current_Term'] = "January 3, 2027 (Special Election)"
-                df.at[idx, 'Next_Primary_Election'] = PRIMARY_2026
-                df.at[idx, 'Next_General_Election'] = GENERAL_2026
-                print(f"[Senate] {name}: SPECIAL ELECTION 2026 (seat vacant - Rubio to Secretary of State)")
-
-        elif office == 'U.S. House':
-            # All House members elected in 2024, terms end January 2027
-            # All up for re-election in 2026
-            df.at[idx, 'End_Current_Term'] = "January 3, 2027"
-            df.at[idx, 'Next_Primary_Election'] = PRIMARY_2026
-            df.at[idx, 'Next_General_Election'] = GENERAL_2026
+        info = election_info(office, row['Last_Name'])
+        if info is None:
+            continue
+        df.at[idx, 'End_Current_Term'], df.at[idx, 'Next_Primary_Election'], df.at[idx, 'Next_General_Election'] = info
+
+        if office == 'U.S. House':
             print(f"[House] {name} ({row['District']}): Term ends 2027, election 2026")
+        elif row['Last_Name'] == 'Scott':
+            print(f"[Senate] {name}: Term ends 2031, next election 2030")
+        else:
+            print(f"[Senate] {name}: SPECIAL ELECTION 2026 (seat vacant - Rubio to Secretary of State)")
 
     # Save updated CSV
     print("\n" + "="*80)
@@ -62,50 +70,31 @@ def add_election_columns():
 
     # Update SQLite database schema and data
     print("\nUpdating SQLite database...")
-    conn = sqlite3.connect('data/congress.db')
-    cursor = conn.cursor()
-
-    # Add new columns to database
-    try:
-        cursor.execute("ALTER TABLE representatives ADD COLUMN end_current_term TEXT")
-        print("[OK] Added column: end_current_term")
-    except sqlite3.OperationalError:
-        print("[INFO] Column end_current_term already exists")
-
-    try:
-        cursor.execute("ALTER TABLE representatives ADD COLUMN next_primary_election TEXT")
-        print("[OK] Added column: next_primary_election")
-    except sqlite3.OperationalError:
-        print("[INFO] Column next_primary_election already exists")
-
-    try:
-        cursor.execute("ALTER TABLE representatives ADD COLUMN next_general_election TEXT")
-        print("[OK] Added column: next_general_election")
-    except sqlite3.OperationalError:
-        print("[INFO] Column next_general_election already exists")
-
-    # Update data in database
-    db_updates = 0
-    for _, row in df.iterrows():
-        cursor.execute("""
+    db = CongressDatabase()
+    db.ensure_schema()  # adds the election columns to older databases
+
+    with db.writer() as conn:
+        # Same rules applied to the database rows, keyed by bioguide_id;
+        # rows whose values already match are left untouched
+        updates = []
+        for member in conn.execute("SELECT bioguide_id, office, last_name FROM representatives WHERE state = 'FL'"):
+            info = election_info(member['office'], member['last_name'])
+            if info is not None:
+                updates.append(info + (member['bioguide_id'],) + info)
+
+        cursor = conn.cursor()
+        cursor.executemany("""
             UPDATE representatives
             SET end_current_term = ?,
                 next_primary_election = ?,
                 next_general_election = ?,
                 last_updated = CURRENT_TIMESTAMP
-            WHERE last_name = ? AND first_name = ?
-        """, (
-            row['End_Current_Term'],
-            row['Next_Primary_Election'],
-            row['Next_General_Election'],
-            row['Last_Name'],
-            row['First_Name']
-        ))
-        if cursor.rowcount > 0:
-            db_updates += 1
-
-    conn.commit()
-    conn.close()
+            WHERE bioguide_id = ?
+              AND (end_current_term IS NOT ?
+                   OR next_primary_election IS NOT ?
+                   OR next_general_election IS NOT ?)
+        """, updates)
+        db_updates = cursor.rowcount
 
     print(f"[OK] Database updated: {db_updates} representatives")
 
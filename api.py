@@ -0,0 +1,373 @@
+"""
+Congress Connect JSON API - read-only lookups for partner sites
+A small ASGI service over search_by_zip, search_by_district and
+search_representatives, next to the Streamlit UI.
+
+Responses are compact JSON with a weak ETag (the data version plus the
+request) and Last-Modified (newest last_updated of the members returned),
+so revalidating clients get 304s without a lookup. Bodies are gzipped when
+the client accepts it, and each client IP is rate limited with a token
+bucket (429 with Retry-After when exceeded). Lookups and data-version
+checks block on SQLite, so they run on worker threads, off the event loop.
+
+Endpoints:
+    GET /v1/zip/{zip}                  House member(s) and senators for a ZIP
+    GET /v1/district/{district}        House member for a district (e.g. FL-27)
+    GET /v1/representatives?state=FL&party=Democrat&office=U.S.%20House
+                           &aipac_funded=Yes&war_industry_funded=No
+                           &aipac_min_cents=5000000&war_industry_min_cents=0
+                           &limit=100&cursor={next_cursor of the previous page}
+    GET /health
+
+Usage:
+    python api.py [--host 127.0.0.1] [--port 8000] [--db data/congress.db]
+                  [--rate 10] [--burst 20]
+    uvicorn api:app --port 8000        (configured by the API_* variables below)
+
+Behind a reverse proxy run uvicorn with --proxy-headers, so clients are
+told apart by their forwarded address.
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from utils.api_clients import TokenBucket
+from utils.cache import MemoCache
+from utils.database import FUNDED_FILTERS, CongressDatabase
+from utils.search import search_by_district, search_by_zip
+from utils.snapshot import get_fingerprint
+
+# Member fields in API responses (None values are left out)
+API_FIELDS = [
+    'bioguide_id', 'first_name', 'last_name', 'party', 'office', 'state', 'district', 'region',
+    'dc_office_address', 'dc_zip', 'dc_phone', 'website', 'contact_form', 'email',
+    'facebook', 'twitter', 'instagram', 'tiktok', 'aipac_cents', 'war_industry_cents',
+    'end_current_term', 'next_primary_election', 'next_general_election', 'last_updated',
+]
+
+# /v1/representatives query parameters: text filters, whole-cent minimums and paging
+TEXT_FILTERS = ['state', 'party', 'office', 'aipac_funded', 'war_industry_funded']
+CENT_FILTERS = ['aipac_min_cents', 'war_industry_min_cents']
+PAGE_PARAMETERS = ['limit', 'cursor']
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Bodies smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 512
+CACHE_CONTROL = b'public, max-age=60'
+
+
+def compact_member(rep: Optional[Mapping]) -> Optional[Dict]:
+    """API view of a representative row"""
+    if rep is None:
+        return None
+    return {field: rep[field] for field in API_FIELDS if rep.get(field) is not None}
+
+
+def http_date(timestamp: Optional[str]) -> Optional[str]:
+    """HTTP-date for a SQLite CURRENT_TIMESTAMP value (UTC)"""
+    if not timestamp:
+        return None
+    try:
+        moment = datetime.fromisoformat(str(timestamp))
+    except ValueError:
+        return None
+    return format_datetime(moment.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+class ApiError(Exception):
+    """A request the API answers with an error status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Response:
+    """A rendered JSON response; the gzipped body is built on first use"""
+
+    def __init__(self, status: int, payload, last_updated: Optional[str] = None):
+        self.status = status
+        self.body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+        self.last_modified = http_date(last_updated)
+        self._gzipped = None
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+class ClientRateLimiter:
+    """One token bucket per client address, for the most recent max_clients clients"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.rejected = 0
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client: str) -> float:
+        """0 when the request may proceed, else the seconds until it may"""
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            wait = bucket.try_acquire()
+            if wait:
+                self.rejected += 1
+        return wait
+
+
+class CongressAPI:
+    """The ASGI application"""
+
+    def __init__(self, db_path: str = "data/congress.db", rate: float = 10, burst: int = 20):
+        self.db_path = db_path
+        self.limiter = ClientRateLimiter(rate, burst)
+        self.counters = {'requests': 0, 'not_modified': 0, 'rate_limited': 0}
+        # Rendered responses per ETag; a data update changes every ETag
+        self._responses = MemoCache(max_entries=4096)
+        self._db = None
+        self._db_lock = threading.Lock()
+
+    @property
+    def db(self) -> CongressDatabase:
+        if self._db is None:
+            with self._db_lock:
+                if self._db is None:
+                    # Read-only: migrations are an explicit step (utils/database.py --upgrade)
+                    db = CongressDatabase(self.db_path, pool_size=8)
+                    db.require_current_schema()
+                    self._db = db
+        return self._db
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        self.counters['requests'] += 1
+        headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        path = scope['path']
+
+        if scope['method'] not in ('GET', 'HEAD'):
+            await self._send(send, scope, Response(405, {'error': 'Only GET and HEAD are supported'}),
+                             extra=[(b'allow', b'GET, HEAD')])
+            return
+        if path == '/health':
+            await self._send(send, scope, Response(200, {'status': 'ok', **self.stats()}), cache=False)
+            return
+
+        client = scope['client'][0] if scope.get('client') else 'unknown'
+        wait = self.limiter.check(client)
+        if wait:
+            self.counters['rate_limited'] += 1
+            await self._send(send, scope, Response(429, {'error': 'Rate limit exceeded'}), cache=False,
+                             extra=[(b'retry-after', str(math.ceil(wait)).encode())])
+            return
+
+        query = tuple(sorted(parse_qsl(scope['query_string'].decode('latin-1'))))
+        etag, response = await asyncio.to_thread(self._resolve, path, query, headers.get('if-none-match'))
+        if response is None:
+            self.counters['not_modified'] += 1
+            await self._send_not_modified(send, etag)
+            return
+
+        since = headers.get('if-modified-since')
+        if 'if-none-match' not in headers and since and response.status == 200 and response.last_modified:
+            try:
+                if parsedate_to_datetime(response.last_modified) <= parsedate_to_datetime(since):
+                    self.counters['not_modified'] += 1
+                    await self._send_not_modified(send, etag, response.last_modified)
+                    return
+            except (TypeError, ValueError):
+                pass  # unparseable date: ignore the condition
+
+        await self._send(send, scope, response, etag=etag,
+                         accepts_gzip='gzip' in headers.get('accept-encoding', ''))
+
+    def stats(self) -> Dict:
+        return {**self.counters, 'cache': self._responses.stats()}
+
+    def _resolve(self, path: str, query: Tuple, if_none_match: Optional[str]) -> Tuple[str, Optional[Response]]:
+        """
+        ETag and response for a request, or (etag, None) when If-None-Match
+        already matches. Blocking (SQLite): called on a worker thread.
+        """
+        etag = self._etag(path, query)
+        if self._matches(if_none_match, etag):
+            return etag, None
+        return etag, self._responses.get_or_compute(('api', etag), self._respond, path, query)
+
+    def _etag(self, path: str, query: Tuple) -> str:
+        version = repr((get_fingerprint(self.db_path), path, query))
+        return 'W/"' + hashlib.sha256(version.encode('utf-8')).hexdigest()[:24] + '"'
+
+    @staticmethod
+    def _matches(if_none_match: Optional[str], etag: str) -> bool:
+        """Weak comparison against an If-None-Match header"""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or any(tag.removeprefix('W/') == etag.removeprefix('W/') for tag in tags)
+
+    def _respond(self, path: str, query: Tuple) -> Response:
+        """Run the lookup for a request (cached per ETag by the caller)"""
+        try:
+            payload, members = self._lookup(path, dict(query))
+        except ApiError as e:
+            return Response(e.status, {'error': str(e)})
+        newest = max((rep['last_updated'] for rep in members if rep.get('last_updated')), default=None)
+        return Response(200, payload, newest)
+
+    def _lookup(self, path: str, query: Dict[str, str]) -> Tuple[Dict, List[Mapping]]:
+        """(payload, members in it) for an endpoint"""
+        parts = path.strip('/').split('/')
+        if len(parts) == 3 and parts[:2] == ['v1', 'zip']:
+            result = search_by_zip(parts[2], self.db)
+            if not result['success']:
+                status = 400 if not (len(parts[2]) == 5 and parts[2].isdigit()) else 404
+                raise ApiError(status, result['message'])
+            members = result['house_reps'] + result['senators']
+            return {
+                'zip': parts[2],
+                'district': result['district'],
+                'districts': result['districts'],
+                'house_reps': [compact_member(rep) for rep in result['house_reps']],
+                'senators': [compact_member(rep) for rep in result['senators']],
+            }, members
+
+        if len(parts) == 3 and parts[:2] == ['v1', 'district']:
+            rep = search_by_district(parts[2].upper(), self.db)
+            if rep is None:
+                raise ApiError(404, f"No representative found for {parts[2]}")
+            return {'district': rep['district'], 'representative': compact_member(rep)}, [rep]
+
+        if parts == ['v1', 'representatives']:
+            unknown = set(query) - set(TEXT_FILTERS) - set(CENT_FILTERS) - set(PAGE_PARAMETERS)
+            if unknown:
+                raise ApiError(400, f"Unknown parameters: {', '.join(sorted(unknown))}")
+            filters = {name: query[name] for name in TEXT_FILTERS if query.get(name)}
+            for name in ('aipac_funded', 'war_industry_funded'):
+                if filters.get(name) not in (None,) + FUNDED_FILTERS:
+                    raise ApiError(400, f"{name} must be one of {', '.join(FUNDED_FILTERS)}")
+            for name in CENT_FILTERS:
+                if query.get(name):
+                    if not query[name].isdigit():
+                        raise ApiError(400, f"{name} must be a whole number of cents")
+                    filters[name] = int(query[name])
+            limit = query.get('limit', str(DEFAULT_PAGE_SIZE))
+            if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+                raise ApiError(400, f"limit must be a whole number from 1 to {MAX_PAGE_SIZE}")
+            try:
+                page = self.db.list_representatives(columns=API_FIELDS, limit=int(limit),
+                                                    cursor=query.get('cursor'), **filters)
+            except ValueError as e:
+                raise ApiError(400, str(e))
+            return {
+                'count': len(page),
+                'representatives': [compact_member(rep) for rep in page],
+                'next_cursor': page.next_cursor,
+            }, page.rows
+
+        raise ApiError(404, f"Unknown endpoint {path}")
+
+    async def _send(self, send, scope, response: Response, etag: str = None, cache: bool = True,
+                    accepts_gzip: bool = False, extra: List[Tuple[bytes, bytes]] = ()):
+        body = response.body
+        headers = [
+            (b'content-type', b'application/json'),
+            (b'access-control-allow-origin', b'*'),
+            (b'vary', b'Accept-Encoding'),
+        ]
+        if accepts_gzip and len(body) >= GZIP_MIN_BYTES:
+            body = response.gzipped()
+            headers.append((b'content-encoding', b'gzip'))
+        if cache and response.status == 200:
+            headers.append((b'cache-control', CACHE_CONTROL))
+            if etag:
+                headers.append((b'etag', etag.encode()))
+            if response.last_modified:
+                headers.append((b'last-modified', response.last_modified.encode()))
+        else:
+            headers.append((b'cache-control', b'no-store'))
+        headers.append((b'content-length', str(len(body)).encode()))
+        headers.extend(extra)
+
+        await send({'type': 'http.response.start', 'status': response.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+
+    @staticmethod
+    async def _send_not_modified(send, etag: str, last_modified: str = None):
+        headers = [(b'etag', etag.encode()), (b'cache-control', CACHE_CONTROL), (b'vary', b'Accept-Encoding'),
+                   (b'access-control-allow-origin', b'*')]
+        if last_modified:
+            headers.append((b'last-modified', last_modified.encode()))
+        await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Open the database before the first request, off the event loop
+                await asyncio.to_thread(lambda: self.db)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._db is not None:
+                    await asyncio.to_thread(self._db.close)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+app = CongressAPI(
+    os.environ.get('API_DB_PATH', 'data/congress.db'),
+    rate=float(os.environ.get('API_RATE_LIMIT', '10')),
+    burst=int(os.environ.get('API_RATE_BURST', '20')),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the JSON lookup API")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port")
+    parser.add_argument("--db", default=app.db_path, help="Database path")
+    parser.add_argument("--rate", type=float, default=app.limiter.rate, help="Requests per second per client")
+    parser.add_argument("--burst", type=int, default=app.limiter.burst, help="Burst size per client")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    api = CongressAPI(args.db, args.rate, args.burst)
+    print(f"[OK] Serving {args.db} on http://{args.host}:{args.port} "
+          f"({args.rate:g} requests/s per client, bursts of {args.burst})")
+    uvicorn.run(api, host=args.host, port=args.port, access_log=False)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
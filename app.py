@@ -3,10 +3,14 @@ Congress Connect - Find and Contact Your Federal Representatives
 A free, privacy-first tool for civic engagement
 """
 
+from typing import Optional
+
 import streamlit as st
 import pandas as pd
-from utils.database import CongressDatabase
-from utils.search import search_by_zip, search_by_district, get_all_florida_reps
+from utils.cards import CARD_CSS, card_html
+from utils.database import CongressDatabase, format_cents, member_label
+from utils.search import search_by_zip, search_by_address, search_by_district
+from utils.snapshot import get_fingerprint
 
 # Page configuration
 st.set_page_config(
@@ -16,14 +20,61 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Browse table: page size and the columns it loads
+BROWSE_PAGE_SIZE = 50
+BROWSE_COLUMNS = [
+    'bioguide_id', 'last_name', 'first_name', 'party', 'district',
+    'aipac_cents', 'war_industry_cents', 'dc_phone',
+]
+
 # Initialize database connection
 @st.cache_resource
 def get_database():
-    """Get or create database connection"""
-    db = CongressDatabase()
-    db.connect()
+    """
+    Get the shared database (pool of read-only connections). The app never
+    writes to the file: an outdated schema is an error telling the operator
+    to run python utils/database.py --upgrade
+    """
+    db = CongressDatabase(pool_size=8)
+    db.require_current_schema()
     return db
 
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_browse_page(_db, data_version: tuple, filters: tuple, cursor: Optional[str]) -> dict:
+    """
+    One browse page: total count, rows, next cursor and the display table.
+    Cached per (data version, filters, cursor), so reruns with unchanged
+    filters run no queries and the table is built once per entry.
+    """
+    filters = dict(filters)
+    total = _db.count_representatives(**filters)
+    page = _db.list_representatives(columns=BROWSE_COLUMNS, limit=BROWSE_PAGE_SIZE, cursor=cursor, **filters)
+
+    # Funding amounts are formatted here, not stored as text
+    table = pd.DataFrame({
+        'Last Name': [r['last_name'] for r in page.rows],
+        'First Name': [r['first_name'] for r in page.rows],
+        'Party': [r['party'] for r in page.rows],
+        'District': [r['district'] for r in page.rows],
+        'AIPAC Funded': [format_cents(r['aipac_cents']) for r in page.rows],
+        'War Industry': [format_cents(r['war_industry_cents']) for r in page.rows],
+        'Phone': [r['dc_phone'] for r in page.rows],
+    })
+    return {
+        'total': total,
+        'rows': page.rows,
+        'labels': [f"{r['first_name']} {r['last_name']} ({r['district']})" for r in page.rows],
+        'next_cursor': page.next_cursor,
+        'table': table,
+    }
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_representative(_db, data_version: tuple, bioguide_id: str) -> Optional[dict]:
+    """Full record of one representative, cached per data version"""
+    return _db.get_representative(bioguide_id)
+
+
 # Custom CSS for mobile-first responsive design
 def inject_custom_css():
     st.markdown("""
@@ -44,58 +95,6 @@ def inject_custom_css():
         margin: 0.5rem 0;
     }
 
-    /* Representative card */
-    .rep-card {
-        background: white;
-        border-radius: 8px;
-        padding: 1.5rem;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        margin-bottom: 1rem;
-    }
-
-    /* Funding transparency highlight */
-    .funding-info {
-        background: #FFF3CD;
-        border-left: 4px solid #FFC107;
-        padding: 1rem;
-        margin: 1rem 0;
-        border-radius: 4px;
-    }
-
-    .funding-label {
-        font-weight: bold;
-        color: #856404;
-        margin-right: 0.5rem;
-    }
-
-    .funding-value-no {
-        color: #28a745;
-        font-weight: bold;
-    }
-
-    .funding-value-yes {
-        color: #dc3545;
-        font-weight: bold;
-    }
-
-    /* Contact buttons */
-    .contact-btn {
-        display: block;
-        width: 100%;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        background: #003366;
-        color: white;
-        text-align: center;
-        border-radius: 6px;
-        text-decoration: none;
-        font-size: 16px;
-    }
-
-    .contact-btn:hover {
-        background: #004080;
-    }
-
     /* Desktop styles */
     @media (min-width: 992px) {
         .main {
@@ -109,6 +108,9 @@ def inject_custom_css():
     </style>
     """, unsafe_allow_html=True)
 
+    # Card styles are shared with the static site export
+    st.markdown(f"<style>\n{CARD_CSS}</style>", unsafe_allow_html=True)
+
 # Main app
 def main():
     inject_custom_css()
@@ -127,23 +129,36 @@ def main():
     st.markdown("---")
 
     # Initialize database
-    db = get_database()
+    try:
+        db = get_database()
+    except RuntimeError as e:
+        st.error(f"❌ {e}")
+        st.stop()
 
-    # Create tabs for different sections
-    tab1, tab2, tab3 = st.tabs(["🔍 Find My Rep", "📋 Browse All", "ℹ️ About"])
+    # Create tabs for different sections. Tabs are lazy: only the selected
+    # tab's body runs, and switching tabs reruns the app
+    tab1, tab2, tab3 = st.tabs(["🔍 Find My Rep", "📋 Browse All", "ℹ️ About"],
+                               key="section", on_change="rerun")
 
-    with tab1:
-        show_search_page(db)
+    if tab1.open:
+        with tab1:
+            show_search_page(db)
 
-    with tab2:
-        show_browse_page(db)
+    if tab2.open:
+        with tab2:
+            show_browse_page(db)
 
-    with tab3:
-        show_about_page()
+    if tab3.open:
+        with tab3:
+            show_about_page()
 
 
+@st.fragment
 def show_search_page(db):
-    """Search for representatives by ZIP code or district"""
+    """
+    Search for representatives by ZIP code or district. A fragment: its
+    widgets rerun only this function, not the whole app
+    """
     st.markdown("### Find Your Representative")
 
     col1, col2 = st.columns([2, 1])
@@ -161,14 +176,47 @@ def show_search_page(db):
         st.write("")  # Spacing
         search_button = st.button("Find My Rep", type="primary", use_container_width=True)
 
+    # The alternative searches are lazy expanders: their widgets and queries
+    # only run while the expander is open
+
     # Manual district selection fallback
-    with st.expander("Or select your district manually"):
-        districts = [f"FL-{str(i).zfill(2)}" for i in range(1, 29)]
-        selected_district = st.selectbox("Select District:", [""] + districts)
-        if selected_district:
-            rep = search_by_district(selected_district, db)
-            if rep:
-                display_representative(rep)
+    manual = st.expander("Or select your district manually", key="manual_expander", on_change="rerun")
+    if manual.open:
+        with manual:
+            districts = [f"FL-{str(i).zfill(2)}" for i in range(1, 29)]
+            selected_district = st.selectbox("Select District:", [""] + districts)
+            if selected_district:
+                rep = search_by_district(selected_district, db)
+                if rep:
+                    display_representative(rep)
+
+    # Exact district from a street address (ZIPs can span several districts)
+    by_address = st.expander("Or search by street address", key="address_expander", on_change="rerun")
+    if by_address.open:
+        with by_address:
+            address = st.text_input("Street address:", placeholder="1234 SW 8th St, Miami, FL 33135")
+            if address:
+                result = search_by_address(address, db)
+                if result["success"]:
+                    st.success(f"✅ {result['message']}")
+                    if result["house_rep"]:
+                        display_representative(result["house_rep"])
+                else:
+                    st.error(result["message"])
+
+    # Full-text search (names, cities, handles; tolerates typos)
+    by_name = st.expander("Or search by name, city or social handle", key="name_expander", on_change="rerun")
+    if by_name.open:
+        with by_name:
+            name_query = st.text_input("Search:", placeholder="Salazar, Doral, @RepDonalds")
+            if name_query:
+                matches = db.search_text(name_query, limit=5)
+                if matches:
+                    labels = [member_label(rep) for rep in matches]
+                    choice = st.selectbox("Matches:", labels)
+                    display_representative(matches[labels.index(choice)])
+                else:
+                    st.info("No representatives match that search.")
 
     # Search by ZIP
     if search_button and zip_code:
@@ -178,8 +226,14 @@ def show_search_page(db):
             if result["success"]:
                 st.success(f"✅ {result['message']}")
 
-                # Display house representative
-                if result["house_rep"]:
+                # Display house representative(s); a ZIP can span several districts
+                if len(result["house_reps"]) > 1:
+                    st.info(f"ZIP {zip_code} spans {', '.join(result['districts'])}. "
+                            "Your representative depends on your street address.")
+                    st.markdown("### Your Possible U.S. House Representatives")
+                    for rep in result["house_reps"]:
+                        display_representative(rep)
+                elif result["house_rep"]:
                     st.markdown("### Your U.S. House Representative")
                     display_representative(result["house_rep"])
 
@@ -195,124 +249,11 @@ def show_search_page(db):
 def display_representative(rep: dict):
     """Display a representative's information"""
     with st.container():
-        # Basic info
-        col1, col2 = st.columns([2, 1])
-
-        with col1:
-            st.markdown(f"## {rep['first_name']} {rep['last_name']}")
-            party_color = "#DC143C" if rep['party'] == "Republican" else "#0015BC"
-            st.markdown(f"""
-            <div style="display: inline-block; background-color: {party_color}; color: white;
-                        padding: 0.25rem 0.75rem; border-radius: 12px; font-weight: bold;">
-                {rep['party']}
-            </div>
-            <span style="margin-left: 1rem;">
-                {rep['office']} • {rep['district'] if rep['district'] != 'Statewide' else 'Statewide'}
-            </span>
-            """, unsafe_allow_html=True)
-
-            if rep['region']:
-                st.caption(f"📍 {rep['region']}")
-
-            # Election Information
-            if rep.get('next_general_election'):
-                if '2026' in rep['next_general_election']:
-                    st.info(f"🗳️ **Up for election:** {rep['next_general_election']}")
-                else:
-                    st.caption(f"🗳️ Next election: {rep['next_general_election']}")
-
-        # Funding Transparency Section
-        st.markdown("---")
-        st.markdown("### 💰 Campaign Funding Transparency")
-
-        funding_col1, funding_col2 = st.columns(2)
-
-        with funding_col1:
-            aipac = rep.get('aipac_funded', 'No')
-            aipac_class = "funding-value-no" if aipac == "No" else "funding-value-yes"
-            st.markdown(f"""
-            <div class="funding-info">
-                <span class="funding-label">AIPAC Funded:</span>
-                <span class="{aipac_class}">{aipac}</span>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with funding_col2:
-            war_industry = rep.get('war_industrial_complex_funded', 'No')
-            war_class = "funding-value-no" if war_industry == "No" else "funding-value-yes"
-            st.markdown(f"""
-            <div class="funding-info">
-                <span class="funding-label">War Industry Funded:</span>
-                <span class="{war_class}">{war_industry}</span>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with st.expander("ℹ️ What does this mean?"):
-            st.write("""
-            **Campaign Funding Transparency:**
-            - **AIPAC**: American Israel Public Affairs Committee funding
-            - **War Industrial Complex**: Defense contractor campaign contributions
-
-            This information helps you understand potential influences on your representative's policy positions.
-            """)
-
-        # Contact Information
-        st.markdown("---")
-        st.markdown("### 📞 Contact Information")
-
-        contact_col1, contact_col2 = st.columns(2)
-
-        with contact_col1:
-            if rep['dc_phone']:
-                st.markdown(f"""
-                <a href="tel:{rep['dc_phone']}" class="contact-btn">
-                    📞 Call: {rep['dc_phone']}
-                </a>
-                """, unsafe_allow_html=True)
-
-            if rep['website']:
-                st.markdown(f"""
-                <a href="{rep['website']}" target="_blank" class="contact-btn">
-                    🌐 Official Website
-                </a>
-                """, unsafe_allow_html=True)
-
-        with contact_col2:
-            if rep['contact_form']:
-                st.markdown(f"""
-                <a href="{rep['contact_form']}" target="_blank" class="contact-btn">
-                    ✉️ Contact Form
-                </a>
-                """, unsafe_allow_html=True)
-
-            if rep['email'] and rep['email'] != "Use web form":
-                st.markdown(f"""
-                <a href="mailto:{rep['email']}" class="contact-btn">
-                    📧 Email
-                </a>
-                """, unsafe_allow_html=True)
-
-        # Office Address
-        if rep['dc_office_address']:
-            st.markdown("**DC Office:**")
-            st.write(f"{rep['dc_office_address']}, Washington, DC {rep['dc_zip']}")
-
-        # Social Media
-        st.markdown("---")
-        st.markdown("### 📱 Social Media")
-
-        social_links = []
-        if rep['facebook']:
-            social_links.append(f"[Facebook]({rep['facebook']})")
-        if rep['twitter']:
-            social_links.append(f"[Twitter/X]({rep['twitter']})")
-        if rep['instagram']:
-            social_links.append(f"[Instagram]({rep['instagram']})")
-        if rep['tiktok']:
-            social_links.append(f"[TikTok]({rep['tiktok']})")
-
-        if social_links:
-            st.markdown(" • ".join(social_links))
+        # Static profile: one pre-rendered HTML element per card. Recent
+        # roll-call votes come from the local copy (see sync_votes.py)
+        db = get_database()
+        recent_votes = db.get_recent_votes(rep.get('bioguide_id'), limit=3)
+        st.markdown(card_html(rep, recent_votes, db.db_path), unsafe_allow_html=True)
 
         # Call Script Generator
         st.markdown("---")
@@ -359,8 +300,9 @@ Tips for an effective call:
     return script
 
 
+@st.fragment
 def show_browse_page(db):
-    """Browse all representatives with filters"""
+    """Browse all representatives with filters (a fragment, like show_search_page)"""
     st.markdown("### Browse All Florida Representatives")
 
     # Filters
@@ -378,65 +320,59 @@ def show_browse_page(db):
     with col4:
         war_filter = st.selectbox("War Industry:", ["All", "Yes", "No"])
 
-    # Get all reps
-    all_reps = get_all_florida_reps(db)
-
-    # Apply filters
-    filtered_reps = all_reps
-
-    if office_filter != "All":
-        filtered_reps = [r for r in filtered_reps if r['office'] == office_filter]
-
-    if party_filter != "All":
-        filtered_reps = [r for r in filtered_reps if r['party'] == party_filter]
+    # Filters run in SQL; only the table columns of one page are loaded
+    filters = {
+        'state': 'FL',
+        'office': None if office_filter == "All" else office_filter,
+        'party': None if party_filter == "All" else party_filter,
+        'aipac_funded': aipac_filter,
+        'war_industry_funded': war_filter,
+    }
 
-    if aipac_filter != "All":
-        if aipac_filter == "Yes":
-            filtered_reps = [r for r in filtered_reps if r['aipac_funded'] != "No"]
-        else:
-            filtered_reps = [r for r in filtered_reps if r['aipac_funded'] == "No"]
+    # Keyset cursors of the pages visited so far; reset when filters change
+    filter_key = tuple(filters.values())
+    if st.session_state.get('browse_filters') != filter_key:
+        st.session_state.browse_filters = filter_key
+        st.session_state.browse_cursors = [None]
+    cursors = st.session_state.browse_cursors
 
-    if war_filter != "All":
-        if war_filter == "Yes":
-            filtered_reps = [r for r in filtered_reps if r['war_industrial_complex_funded'] != "No"]
-        else:
-            filtered_reps = [r for r in filtered_reps if r['war_industrial_complex_funded'] == "No"]
+    # Keyed on the data version, so funding or roster updates show up at once
+    data_version = get_fingerprint(db.db_path)
+    page = load_browse_page(db, data_version, tuple(filters.items()), cursors[-1])
+    total = page['total']
 
     # Display count
-    st.write(f"Showing {len(filtered_reps)} representatives")
-
-    # Convert to dataframe for display
-    if filtered_reps:
-        df = pd.DataFrame(filtered_reps)
-
-        # Select columns to display
-        display_df = df[[
-            'last_name', 'first_name', 'party', 'district',
-            'aipac_funded', 'war_industrial_complex_funded', 'dc_phone'
-        ]].copy()
-
-        display_df.columns = [
-            'Last Name', 'First Name', 'Party', 'District',
-            'AIPAC Funded', 'War Industry', 'Phone'
-        ]
-
-        st.dataframe(display_df, use_container_width=True, hide_index=True)
+    first = (len(cursors) - 1) * BROWSE_PAGE_SIZE
+    if total > BROWSE_PAGE_SIZE:
+        st.write(f"Showing {first + 1}-{first + len(page['rows'])} of {total} representatives")
+    else:
+        st.write(f"Showing {total} representatives")
+
+    if page['rows']:
+        st.dataframe(page['table'], use_container_width=True, hide_index=True)
+
+        # Page navigation
+        if total > BROWSE_PAGE_SIZE:
+            prev_col, next_col = st.columns(2)
+            with prev_col:
+                if st.button("← Previous", disabled=len(cursors) == 1):
+                    cursors.pop()
+                    st.rerun(scope="fragment")
+            with next_col:
+                if st.button("Next →", disabled=page['next_cursor'] is None):
+                    cursors.append(page['next_cursor'])
+                    st.rerun(scope="fragment")
 
         # Detailed view
         st.markdown("---")
         st.markdown("### View Details")
-        selected_name = st.selectbox(
-            "Select a representative for full details:",
-            [f"{r['first_name']} {r['last_name']} ({r['district']})" for r in filtered_reps]
-        )
+        labels = page['labels']
+        selected_name = st.selectbox("Select a representative for full details:", labels)
 
         if selected_name:
-            # Find selected rep
-            selected_rep = next(
-                (r for r in filtered_reps
-                 if f"{r['first_name']} {r['last_name']} ({r['district']})" == selected_name),
-                None
-            )
+            # Load the full record of the selected rep only
+            selected = page['rows'][labels.index(selected_name)]
+            selected_rep = load_representative(db, data_version, selected['bioguide_id'])
             if selected_rep:
                 display_representative(selected_rep)
 
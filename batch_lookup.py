@@ -0,0 +1,93 @@
+"""
+Batch constituent lookup: annotate a CSV of ZIP codes or street addresses
+with congressional district, House member and senators
+
+Usage:
+    python batch_lookup.py members.csv [--column zip] [--output annotated.csv]
+                           [--chunk-size 200000] [--db data/congress.db]
+
+The input is streamed in chunks and each annotated chunk is appended to the
+output (stdout when --output is omitted), so memory stays bounded for
+files of any size.
+"""
+
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from utils.database import CongressDatabase
+from utils.search import search_by_zip_batch
+
+# Input column names tried when --column is not given
+LOCATION_COLUMNS = ['zip', 'zip_code', 'zipcode', 'postal_code', 'zip5', 'address', 'street_address']
+
+
+def pick_column(columns, requested=None):
+    """Column holding the ZIPs/addresses: the requested one, a known name, or the first"""
+    if requested:
+        if requested not in columns:
+            raise ValueError(f"Column '{requested}' not found in input ({', '.join(columns)})")
+        return requested
+    lowered = {column.strip().lower(): column for column in columns}
+    for name in LOCATION_COLUMNS:
+        if name in lowered:
+            return lowered[name]
+    return columns[0]
+
+
+def batch_lookup(input_path, output_path=None, column=None, chunk_size=200_000, db_path="data/congress.db"):
+    """Stream input_path through search_by_zip_batch; returns (rows, matched)"""
+    db = CongressDatabase(db_path)
+    db.require_current_schema()
+    output = open(output_path, 'w', newline='', encoding='utf-8') if output_path else sys.stdout
+    log = sys.stderr if output is sys.stdout else sys.stdout
+
+    rows = matched = invalid = 0
+    start = time.perf_counter()
+    try:
+        chunks = pd.read_csv(
+            sys.stdin if input_path == '-' else input_path,
+            dtype=str, keep_default_na=False, chunksize=chunk_size
+        )
+        for number, chunk in enumerate(chunks):
+            location = pick_column(list(chunk.columns), column)
+            annotated = search_by_zip_batch(chunk[location], db).drop(columns=['input'])
+            annotated.index = chunk.index
+            chunk = pd.concat([chunk, annotated.add_prefix('cc_')], axis=1)
+            chunk.to_csv(output, header=number == 0, index=False)
+
+            rows += len(chunk)
+            matched += int(annotated['match'].isin(['zip', 'address']).sum())
+            invalid += int((annotated['match'] == 'invalid').sum())
+            print(f"  {rows:,} rows...", file=log)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed else 0
+    print(f"[OK] Annotated {rows:,} rows ({matched:,} matched, {invalid:,} invalid) in {elapsed:.1f}s "
+          f"({rate:,.0f} rows/sec)", file=log)
+    return rows, matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Annotate ZIP codes or addresses with their representatives")
+    parser.add_argument("input", help="CSV file with a ZIP or address column ('-' for stdin)")
+    parser.add_argument("--column", help="Column with ZIPs or addresses (default: detected)")
+    parser.add_argument("--output", help="Output CSV (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=200_000, help="Rows per chunk")
+    parser.add_argument("--db", default="data/congress.db", help="Database path")
+    args = parser.parse_args()
+
+    batch_lookup(args.input, args.output, args.column, args.chunk_size, args.db)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,244 @@
+"""
+Benchmark: server CPU time per user interaction
+Starts the app with `streamlit run` on a copy of the tree and drives it over
+the websocket protocol the browser uses: each interaction sends the same
+rerun request the frontend would (scoped to the widget's fragment when it
+sits in one). The server's CPU time (all threads, read from /proc) is
+sampled around every interaction.
+
+With --baseline REV the same interactions also run against the tree as of a
+git revision, e.g. the commit before lazy tabs and fragments.
+
+Usage: python benchmarks/bench_app_cpu.py [--baseline REV] [--repeat 8]
+Linux only (reads /proc/<pid>/task/*/schedstat).
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+REPO = Path(__file__).resolve().parent.parent
+
+ZIPS = ['33139', '32301', '33101', '32801']
+DISTRICTS = ['FL-27', 'FL-10', 'FL-02', 'FL-14']
+PARTIES = ['Democrat', 'Republican']
+
+BROWSE_TAB = "📋 Browse All"
+MANUAL_EXPANDER = "Or select your district manually"
+
+
+def cpu_seconds(pid: int) -> float:
+    """CPU time of a process, summed over its live threads (nanosecond resolution)"""
+    total = 0
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        try:
+            total += int((task / "schedstat").read_text().split()[0])
+        except (FileNotFoundError, ProcessLookupError):
+            pass  # thread exited
+    return total / 1e9
+
+
+class AppClient:
+    """
+    Minimal stand-in for the browser: keeps widget values, sends reruns and
+    reads the deltas until the script run finishes
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.ws = None
+        self.widgets: Dict[str, tuple] = {}  # label -> (widget id, fragment id)
+        self.states: Dict[str, WidgetState] = {}
+        self.errors = 0  # exceptions shown by the app
+
+    async def connect(self):
+        origin = self.url.replace('ws://', 'http://').split('/_stcore')[0]
+        self.ws = await websockets.connect(self.url, subprotocols=['streamlit'], origin=origin, max_size=None)
+
+    async def close(self):
+        await self.ws.close()
+
+    def has(self, label: str) -> bool:
+        return label in self.widgets
+
+    def set(self, label: str, **value) -> str:
+        """Change a widget's value; returns the fragment its rerun is scoped to"""
+        widget_id, fragment_id = self.widgets[label]
+        state = WidgetState(id=widget_id, **value)
+        self.states[widget_id] = state
+        return fragment_id
+
+    async def rerun(self, fragment_id: str = '') -> int:
+        """One script run; returns the number of deltas received"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        await self.ws.send(msg.SerializeToString())
+        # Buttons fire once
+        self.states = {key: state for key, state in self.states.items() if not state.HasField('trigger_value')}
+
+        deltas = 0
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.ws.recv())
+            kind = forward.WhichOneof('type')
+            if kind == 'delta':
+                deltas += 1
+                self._register(forward.delta)
+            elif kind == 'script_finished':
+                return deltas
+
+    def _register(self, delta):
+        kind = delta.WhichOneof('type')
+        if kind == 'new_element':
+            element_type = delta.new_element.WhichOneof('type')
+            element = getattr(delta.new_element, element_type)
+            if element_type == 'exception':
+                self.errors += 1
+            if getattr(element, 'id', '') and getattr(element, 'label', ''):
+                self.widgets.setdefault(element.label, (element.id, delta.fragment_id))
+        elif kind == 'add_block':
+            block = delta.add_block
+            if block.WhichOneof('type') == 'tab_container' and block.tab_container.id:
+                self.widgets.setdefault('tabs', (block.tab_container.id, delta.fragment_id))
+            elif block.WhichOneof('type') == 'expandable' and block.expandable.id:
+                self.widgets.setdefault(block.expandable.label, (block.expandable.id, delta.fragment_id))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def copy_tree(destination: Path, revision: Optional[str] = None):
+    """The working tree, or the tree at a git revision, without .git"""
+    if revision:
+        archive = subprocess.run(['git', 'archive', revision], cwd=REPO, check=True, capture_output=True).stdout
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(destination)
+    else:
+        shutil.copytree(REPO, destination, ignore=shutil.ignore_patterns('.git', '__pycache__', '*.db-wal', '*.db-shm'))
+
+
+async def measure(client: AppClient, pid: int, samples: Dict[str, List], step: str, fragment_id: str = ''):
+    cpu = cpu_seconds(pid)
+    deltas = await client.rerun(fragment_id)
+    await asyncio.sleep(0.05)  # let the server finish sending
+    samples.setdefault(step, []).append(((cpu_seconds(pid) - cpu) * 1000, deltas))
+
+
+async def interact(url: str, pid: int, repeat: int) -> Tuple[Dict[str, List], int]:
+    """Run the interaction script; returns ({step: [(cpu ms, deltas), ...]}, app errors)"""
+    samples: Dict[str, List] = {}
+    client = AppClient(url)
+    await client.connect()
+    try:
+        await measure(client, pid, samples, "Initial page load")
+
+        for number in range(repeat):
+            fragment = client.set("📍 Enter your ZIP code:", string_value=ZIPS[number % len(ZIPS)])
+            await measure(client, pid, samples, "Enter a ZIP", fragment)
+            fragment = client.set("Find My Rep", trigger_value=True)
+            await measure(client, pid, samples, "Click Find My Rep", fragment)
+
+        # Lazy expanders only show their widgets once opened
+        if client.has(MANUAL_EXPANDER):
+            await client.rerun(client.set(MANUAL_EXPANDER, bool_value=True))
+        for number in range(repeat):
+            fragment = client.set("Select District:", string_value=DISTRICTS[number % len(DISTRICTS)])
+            await measure(client, pid, samples, "Pick a district", fragment)
+
+        # Lazy tabs rerun on switch; eager tabs switch in the browser only
+        if client.has('tabs'):
+            await measure(client, pid, samples, "Switch to Browse", client.set('tabs', string_value=BROWSE_TAB))
+        for number in range(repeat):
+            fragment = client.set("Party:", string_value=PARTIES[number % len(PARTIES)])
+            await measure(client, pid, samples, "Change a browse filter", fragment)
+    finally:
+        await client.close()
+    return samples, client.errors
+
+
+def run_app(tree: Path, repeat: int) -> Tuple[Dict[str, List], int]:
+    """Start `streamlit run app.py` in tree and drive it"""
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'app.py', '--server.headless', 'true',
+         '--server.port', str(port), '--server.fileWatcherType', 'none',
+         '--browser.gatherUsageStats', 'false'],
+        cwd=tree, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(300):
+            try:
+                if requests.get(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).ok:
+                    break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        return asyncio.run(interact(f"ws://127.0.0.1:{port}/_stcore/stream", server.pid, repeat))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server CPU time per interaction")
+    parser.add_argument("--baseline", metavar="REV", help="Also measure the tree at this git revision")
+    parser.add_argument("--repeat", type=int, default=8, help="Samples per interaction")
+    args = parser.parse_args()
+
+    results, errors = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, revision in ([(args.baseline, args.baseline)] if args.baseline else []) + [('current', None)]:
+            tree = Path(tmp) / name.replace('/', '_')
+            copy_tree(tree, revision)
+            if revision is None:
+                # The app opens the database read-only; migrate the copy first
+                subprocess.run([sys.executable, 'utils/database.py', '--upgrade'], cwd=tree, check=True,
+                               env={**os.environ, 'PYTHONPATH': str(tree)}, stdout=subprocess.DEVNULL)
+            results[name], errors[name] = run_app(tree, args.repeat)
+
+    steps = list(dict.fromkeys(step for samples in results.values() for step in samples))
+    print(f"{'interaction':<24}" + ''.join(f"{name[:18]:>28}" for name in results))
+    print(f"{'':<24}" + f"{'cpu ms (median)   deltas':>28}" * len(results))
+    for step in steps:
+        row = f"{step:<24}"
+        for samples in results.values():
+            if step in samples:
+                cpu = statistics.median(ms for ms, _ in samples[step])
+                deltas = statistics.median(count for _, count in samples[step])
+                row += f"{cpu:>19.1f}{deltas:>9.0f}"
+            else:
+                row += f"{'-':>28}"
+        print(row)
+
+    print()
+    for name, count in errors.items():
+        if count:
+            print(f"[!] {name}: the app showed {count} exception(s) during the run")
+    current = results['current']
+    total = sum(statistics.median(ms for ms, _ in current[step]) for step in current)
+    print(f"[OK] {len(current)} interactions measured; current tree {total:.1f} ms server CPU for one of each")
+
+
+if __name__ == "__main__":
+    main()
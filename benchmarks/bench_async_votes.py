@@ -0,0 +1,137 @@
+"""
+Benchmark: recent votes for a whole delegation
+Serves a mock ProPublica votes endpoint on 127.0.0.1 with a fixed response
+latency, then compares calling get_recent_votes member by member with
+stream_recent_votes (bounded concurrency plus a token bucket). It also
+checks that the client never exceeds the configured request rate.
+
+Usage: python benchmarks/bench_async_votes.py [members] [latency_ms]
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.api_clients import HTTPClient, ProPublicaAPI, TokenBucket  # noqa: E402
+
+
+class VotesHandler(BaseHTTPRequestHandler):
+    """/members/<id>/votes.json after `latency` seconds"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.started.append(time.perf_counter())
+        time.sleep(self.server.latency)
+        member = self.path.split('/')[-2]
+        votes = [{"member_id": member, "roll_call": n, "position": "Yes"} for n in range(5)]
+        body = json.dumps({"results": [{"votes": votes}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_mock(latency: float):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), VotesHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.lock = threading.Lock()
+    server.started = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_api(base: str, rate: float) -> ProPublicaAPI:
+    api = ProPublicaAPI('key', http=HTTPClient('mock', retries=0), limiter=TokenBucket(rate))
+    api.base_url = base
+    return api
+
+
+async def stream(api: ProPublicaAPI, members, concurrency: int):
+    """Consume the stream; returns (results, seconds to first result)"""
+    start = time.perf_counter()
+    first = None
+    results = {}
+    async for bioguide_id, votes in api.stream_recent_votes(members, concurrency=concurrency):
+        if first is None:
+            first = time.perf_counter() - start
+        results[bioguide_id] = votes
+    return results, first
+
+
+def max_requests_per_window(started, window: float = 1.0) -> int:
+    """Most requests started within any `window` seconds"""
+    started = sorted(started)
+    best = low = 0
+    for high, moment in enumerate(started):
+        while moment - started[low] > window:
+            low += 1
+        best = max(best, high - low + 1)
+    return best
+
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    ids = [f"M{n:06d}" for n in range(members)]
+    server, base = start_mock(latency)
+    print(f"{members} members, mock latency {latency * 1000:.0f} ms\n")
+
+    api = make_api(base, rate=1000)
+    start = time.perf_counter()
+    sequential = {bioguide_id: api.get_recent_votes(bioguide_id) for bioguide_id in ids}
+    sequential_s = time.perf_counter() - start
+    print(f"{'sequential get_recent_votes':<34} {sequential_s:7.2f}s")
+
+    # One client for both runs: the second reuses the first one's worker threads
+    api = make_api(base, rate=1000)
+    for concurrency in (8, 16):
+        start = time.perf_counter()
+        results, first = asyncio.run(stream(api, ids, concurrency))
+        elapsed = time.perf_counter() - start
+        assert results == sequential, "async results differ from sequential results"
+        print(f"{f'stream_recent_votes x{concurrency}':<34} {elapsed:7.2f}s  "
+              f"({sequential_s / elapsed:.1f}x faster, first result after {first * 1000:.0f} ms)")
+    workers = sum(thread.name.startswith('propublica') for thread in threading.enumerate())
+    api.close()
+    left = sum(thread.name.startswith('propublica') for thread in threading.enumerate())
+    print(f"{'worker threads':<34} {workers} while open, {left} after close()")
+    if workers > api.MAX_CONCURRENCY or left:
+        print("[X] Worker threads not reused or not stopped")
+        sys.exit(1)
+
+    # Quota: 20 requests/second, burst 20, however much concurrency is allowed
+    rate = 20
+    api = make_api(base, rate=rate)
+    server.started.clear()
+    start = time.perf_counter()
+    asyncio.run(stream(api, ids, 16))
+    elapsed = time.perf_counter() - start
+    api.close()
+    peak = max_requests_per_window(server.started)
+    print(f"\nrate limit {rate}/s (burst {rate}): {elapsed:.2f}s, "
+          f"at most {peak} requests in any 1 s window")
+    server.shutdown()
+
+    # The bucket allows its burst plus rate per second; allow one token of timer slack
+    if peak > rate * 2 + 1:
+        print("[X] Rate limit exceeded")
+        sys.exit(1)
+    print("[OK] Rate limit respected")
+
+
+if __name__ == "__main__":
+    main()
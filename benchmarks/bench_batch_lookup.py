@@ -0,0 +1,59 @@
+"""
+Benchmark: batch constituent lookup
+search_by_zip once per row versus search_by_zip_batch (NumPy searchsorted
+over the ZIP intervals + positional join), on a synthetic nationwide
+roster and ZIP index.
+
+Usage: python benchmarks/bench_batch_lookup.py [rows]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from synthetic import build_synthetic_db, write_synthetic_zcta_file
+
+from utils.search import search_by_zip, search_by_zip_batch
+from utils import zip_index
+from utils.zip_index import DEFAULT_ZIP_INDEX, ZipDistrictIndex, build_zip_index
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    zips = np.char.zfill(np.random.default_rng(5).integers(501, 99951, rows).astype(str), 5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_synthetic_db(str(Path(tmp) / "batch.db"))
+        relationship = str(Path(tmp) / "zcta_cd.txt")
+        write_synthetic_zcta_file(relationship)
+        index_path = str(Path(tmp) / "zip_districts.bin")
+        build_zip_index(relationship, index_path)
+        index = ZipDistrictIndex.open(index_path)
+
+        # search_by_zip reads the shared default index; register the synthetic one there
+        zip_index._indexes[DEFAULT_ZIP_INDEX] = index
+
+        sample = zips[:min(rows, 20_000)]
+        start = time.perf_counter()
+        for zip_code in sample:
+            search_by_zip(zip_code, db)
+        per_row = (time.perf_counter() - start) / len(sample)
+        print(f"search_by_zip per row:  {per_row * 1e6:8.1f} us/row  "
+              f"(~{per_row * rows:.1f}s for {rows:,} rows)")
+
+        search_by_zip_batch(zips[:1000], db, index)  # build the district table
+        start = time.perf_counter()
+        result = search_by_zip_batch(zips, db, index)
+        elapsed = time.perf_counter() - start
+        print(f"search_by_zip_batch:    {elapsed / rows * 1e6:8.1f} us/row  "
+              f"({elapsed:.2f}s for {rows:,} rows, {(result['match'] == 'zip').mean():.1%} matched)")
+
+        db.close()
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
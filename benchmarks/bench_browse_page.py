@@ -0,0 +1,68 @@
+"""
+Benchmark: browse page rerun cost as the roster grows
+Times what one rerun of the browse page does: the data-version check, the
+page query (count + one keyset page) with its display table, and the
+selected member's record. Compares the cached loaders in app.py with
+calling them uncached, for synthetic rosters of 535 to 8,560 members.
+
+Usage: python benchmarks/bench_browse_page.py [reruns]
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import build_synthetic_db
+
+logging.getLogger('streamlit').setLevel(logging.ERROR)  # no "missing ScriptRunContext" noise
+import app  # noqa: E402
+
+from utils.snapshot import get_fingerprint  # noqa: E402
+
+FILTERS = [
+    {'state': 'FL', 'office': None, 'party': None, 'aipac_funded': 'All', 'war_industry_funded': 'All'},
+    {'state': 'FL', 'office': 'U.S. House', 'party': 'Democrat', 'aipac_funded': 'All', 'war_industry_funded': 'All'},
+    {'state': 'FL', 'office': None, 'party': 'Republican', 'aipac_funded': 'Yes', 'war_industry_funded': 'No'},
+]
+
+
+def rerun_ms(db, reruns: int, load_page, load_rep):
+    """(milliseconds, SQL statements) per rerun, cycling through the filter combinations"""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    start = time.perf_counter()
+    for number in range(reruns):
+        filters = FILTERS[number % len(FILTERS)]
+        data_version = get_fingerprint(db.db_path)
+        page = load_page(db, data_version, tuple(filters.items()), None)
+        if page['rows']:
+            load_rep(db, data_version, page['rows'][0]['bioguide_id'])
+    elapsed = time.perf_counter() - start
+    db.conn.set_trace_callback(None)
+    return elapsed / reruns * 1000, len(statements) / reruns
+
+
+def main():
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    print(f"{'members':>8} {'uncached':>24} {'cached':>24}")
+
+    for copies in (1, 4, 16):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = build_synthetic_db(str(Path(tmp) / "browse.db"), copies=copies)
+            members = db.count_representatives()
+
+            uncached, uncached_sql = rerun_ms(db, reruns, app.load_browse_page.__wrapped__, app.load_representative.__wrapped__)
+            app.load_browse_page.clear()
+            app.load_representative.clear()
+            rerun_ms(db, len(FILTERS), app.load_browse_page, app.load_representative)  # fill the cache
+            cached, cached_sql = rerun_ms(db, reruns, app.load_browse_page, app.load_representative)
+
+            print(f"{members:>8,} {uncached:>7.2f} ms, {uncached_sql:.0f} queries "
+                  f"{cached:>7.2f} ms, {cached_sql:.0f} queries")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: streaming CSV import (csv + executemany) versus the previous
+pandas read_csv + to_sql path, on synthetic nationwide rows
+
+Usage: python benchmarks/bench_csv_import.py [rows]   (default 100,000)
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+from synthetic import write_synthetic_csv
+
+from utils.database import CSV_COLUMNS, CongressDatabase, parse_amount_cents
+
+
+def import_with_pandas(db: CongressDatabase, csv_path: str) -> int:
+    """The pre-streaming import: whole file in a DataFrame, row-wise .apply"""
+    df = pd.read_csv(csv_path).rename(columns=CSV_COLUMNS)
+    df['state'] = df['district'].apply(
+        lambda x: 'FL' if pd.isna(x) or x == 'Statewide' else x.split('-')[0]
+    )
+    df['aipac_cents'] = df['aipac_cents'].map(parse_amount_cents)
+    df['war_industry_cents'] = df['war_industry_cents'].map(parse_amount_cents)
+    df['bioguide_id'] = df['Bioguide_ID']
+    df = df[['bioguide_id', 'state'] + list(CSV_COLUMNS.values())]
+    df.to_sql('representatives', db.conn, if_exists='append', index=False)
+    db.conn.commit()
+    return len(df)
+
+
+def run_import(csv_path: str, db_path: str, importer, trace_memory: bool):
+    """Import into a fresh database; return (rows, seconds, peak traced bytes)"""
+    Path(db_path).unlink(missing_ok=True)
+    db = CongressDatabase(db_path)
+    db.connect()
+    db.create_tables()
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    count = importer(db, csv_path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    if trace_memory:
+        tracemalloc.stop()
+    db.close()
+    return count, elapsed, peak
+
+
+def measure(label: str, csv_path: str, db_path: str, importer) -> None:
+    # tracemalloc slows allocation down, so time and memory are separate runs
+    count, elapsed, _ = run_import(csv_path, db_path, importer, trace_memory=False)
+    _, _, peak = run_import(csv_path, db_path, importer, trace_memory=True)
+
+    print(f"{label:<10} {count:>9,} rows {elapsed:>7.2f} s {count / elapsed:>10,.0f} rows/s "
+          f"peak {peak / 1e6:>7.1f} MB")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = str(Path(tmp) / "synthetic.csv")
+        write_synthetic_csv(csv_path, rows)
+
+        measure("pandas", csv_path, str(Path(tmp) / "pandas.db"), import_with_pandas)
+        measure("streaming", csv_path, str(Path(tmp) / "stream.db"),
+                lambda db, path: db.import_csv_data(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: static site export build time, full and incremental
+Exports a synthetic nationwide roster (535 members, 33,000 ZCTAs), then
+re-runs the export with no changes, after one House member's update and
+after one senator's update, and checks that only the affected pages were
+rewritten and that the ZIP index resolves ZIPs like search_by_zip.
+
+Usage: python benchmarks/bench_export_site.py
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+
+from synthetic import build_synthetic_db, write_synthetic_zcta_file
+
+import export_site
+from utils.database import CongressDatabase
+from utils.search import search_by_zip
+from utils.snapshot import get_snapshot
+from utils.zip_index import build_zip_index
+
+
+def timed_export(db_path: str, index_path: str, output: str):
+    start = time.perf_counter()
+    counts = export_site.export_site(db_path, output, index_path)
+    return time.perf_counter() - start, counts
+
+
+def touch_member(db_path: str, district: str):
+    """Simulate a data update of one member"""
+    db = CongressDatabase(db_path)
+    with db.writer() as conn:
+        conn.execute("""
+            UPDATE representatives SET last_updated = '2030-01-01 00:00:00', aipac_cents = aipac_cents + 100
+            WHERE district = ? AND office = 'U.S. House'
+        """, (district,))
+
+
+def client_lookup(zips: dict, zip_code: str):
+    """What the start page's script does with zips.json"""
+    starts = list(accumulate(zips['starts']))
+    position = bisect_right(starts, int(zip_code)) - 1
+    if position < 0 or int(zip_code) > starts[position] + zips['spans'][position]:
+        return None
+    return zips['pages'][zips['page'][position]]
+
+
+def main():
+    failures = []
+
+    def expect(condition, message):
+        print(f"[{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.mkdir("data")
+        db_path, index_path, output = "data/congress.db", "data/zip_districts.bin", "site"
+        build_synthetic_db(db_path).close()
+        write_synthetic_zcta_file("zcta.txt")
+        build_zip_index("zcta.txt", index_path)
+        CongressDatabase(db_path).ensure_schema()
+
+        full, counts = timed_export(db_path, index_path, output)
+        pages = counts['written']
+        noop, counts = timed_export(db_path, index_path, output)
+        expect(counts['written'] == 0, f"Unchanged data rewrites nothing ({noop:.2f}s vs {full:.2f}s full)")
+
+        # A House member appears on their district page and the ZIP pages of their district
+        touch_member(db_path, 'TX-07')
+        house, counts = timed_export(db_path, index_path, output)
+        zip_pages = [name for name in json.loads(Path(output, 'zips.json').read_text())['pages']
+                     if 'TX-07' in name.split('_')]
+        expected = 2 * (1 + len(zip_pages))
+        expect(counts['written'] == expected,
+               f"One House member update rewrites {counts['written']} of {pages} files "
+               f"(expected {expected}) in {house:.2f}s")
+
+        # A senator appears on every ZIP page of their state
+        senator = get_snapshot(db_path).senators('CA')[0]
+        db = CongressDatabase(db_path)
+        with db.writer() as conn:
+            conn.execute("UPDATE representatives SET last_updated = '2030-01-02 00:00:00' WHERE bioguide_id = ?",
+                         (senator['bioguide_id'],))
+        senate, counts = timed_export(db_path, index_path, output)
+        zips = json.loads(Path(output, 'zips.json').read_text())
+        ca_pages = [name for name in zips['pages'] if name.startswith('CA-')]
+        expected = 2 * (1 + len(ca_pages))
+        expect(counts['written'] == expected,
+               f"One senator update rewrites {counts['written']} of {pages} files "
+               f"(expected {expected}) in {senate:.2f}s")
+
+        # The client-side index resolves ZIPs to the page of search_by_zip's districts
+        rng = random.Random(7)
+        db.connect()
+        mismatches = 0
+        for zip_code in (f"{rng.randint(501, 99950):05d}" for _ in range(2000)):
+            result = search_by_zip(zip_code, db)
+            expected_page = '_'.join(result['districts']) if result['success'] else None
+            mismatches += client_lookup(zips, zip_code) != expected_page
+        expect(mismatches == 0, f"zips.json agrees with search_by_zip on 2,000 random ZIPs "
+                                f"({mismatches} mismatches)")
+
+        size = sum(path.stat().st_size for path in Path(output).rglob('*') if path.is_file())
+        print(f"\n     {pages} files, {size / 1024 / 1024:.1f} MB; zips.json "
+              f"{Path(output, 'zips.json').stat().st_size / 1024:.0f} KB for {len(zips['starts'])} intervals")
+
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
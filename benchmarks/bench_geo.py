@@ -0,0 +1,126 @@
+"""
+Benchmark: offline address -> district resolution
+Builds synthetic nationwide data (435 districts as jagged polygons of about
+1,000 vertices each on a grid, and a street grid of TIGER-style address
+ranges), then times geocoding plus the STR-tree point-in-polygon lookup
+against a linear point-in-polygon scan over every district.
+
+Usage: python benchmarks/bench_geo.py [addresses]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.geo import AddressGeocoder, DistrictBoundaries, DistrictResolver, point_in_ring  # noqa: E402
+
+COLUMNS = 29  # 29 x 15 grid = 435 districts
+ROWS = 15
+VERTICES_PER_EDGE = 250
+
+
+def jagged_edge(a, b):
+    """
+    Points from a up to (not including) b with small perpendicular noise.
+    Noise is generated in canonical edge order, so neighbouring cells share
+    exactly the same edge.
+    """
+    low, high = min(a, b), max(a, b)
+    noise = random.Random(hash((low, high)))
+    points = []
+    for i in range(VERTICES_PER_EDGE + 1):
+        t = i / VERTICES_PER_EDGE
+        jitter = noise.uniform(-0.02, 0.02) if 0 < i < VERTICES_PER_EDGE else 0.0
+        x = low[0] + (high[0] - low[0]) * t
+        y = low[1] + (high[1] - low[1]) * t
+        points.append([x + jitter, y] if low[0] == high[0] else [x, y + jitter])
+    if (a, b) != (low, high):
+        points.reverse()
+    return points[:-1]
+
+
+def synthetic_boundaries():
+    """(district, rings) for a grid of jagged cells over the continental US box"""
+    polygons = []
+    width, height = 58.0 / COLUMNS, 24.0 / ROWS
+    for row in range(ROWS):
+        for column in range(COLUMNS):
+            x0, y0 = -125.0 + column * width, 25.0 + row * height
+            corners = [(x0, y0), (x0 + width, y0), (x0 + width, y0 + height), (x0, y0 + height)]
+            ring = []
+            for a, b in zip(corners, corners[1:] + corners[:1]):
+                ring.extend(jagged_edge(a, b))
+            ring.append(ring[0])
+            number = row * COLUMNS + column + 1
+            polygons.append((f"D{number // 100:02d}-{number % 100:02d}", [ring]))
+    return polygons
+
+
+def synthetic_streets(rng, count):
+    """TIGER-style address range features on random short street segments"""
+    features = []
+    for i in range(count):
+        x, y = rng.uniform(-124.5, -67.5), rng.uniform(25.5, 48.5)
+        start = rng.randrange(100, 9000, 100)
+        features.append({
+            'properties': {
+                'FULLNAME': f"{i} St", 'ZIPL': f"{i % 90000 + 10000:05d}", 'ZIPR': f"{i % 90000 + 10000:05d}",
+                'LFROMHN': str(start), 'LTOHN': str(start + 98),
+                'RFROMHN': str(start + 1), 'RTOHN': str(start + 99),
+            },
+            'geometry': {'type': 'LineString', 'coordinates': [[x, y], [x + 0.002, y + 0.001], [x + 0.004, y]]},
+        })
+    return features
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(3)
+
+    start = time.perf_counter()
+    polygons = synthetic_boundaries()
+    boundaries = DistrictBoundaries(polygons)
+    geocoder = AddressGeocoder()
+    features = synthetic_streets(rng, 200_000)
+    for feature in features:
+        geocoder.add_feature(feature)
+    resolver = DistrictResolver(boundaries, geocoder)
+    vertices = sum(len(rings[0]) for _, rings in polygons)
+    print(f"Loaded {len(polygons)} districts ({vertices:,} vertices) and {len(features):,} "
+          f"street segments in {time.perf_counter() - start:.1f}s\n")
+
+    addresses = []
+    for _ in range(count):
+        feature = rng.choice(features)['properties']
+        number = int(feature['LFROMHN']) + rng.randrange(0, 98)
+        addresses.append(f"{number} {feature['FULLNAME']}, Anytown, ST {feature['ZIPL']}")
+
+    timings = []
+    resolved = 0
+    for address in addresses:
+        t = time.perf_counter()
+        resolved += resolver.resolve_address(address) is not None
+        timings.append(time.perf_counter() - t)
+    timings.sort()
+    print(f"STR-tree resolver:   p50 {timings[len(timings) // 2] * 1000:.3f} ms   "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1000:.3f} ms   ({resolved}/{count} resolved)")
+
+    def linear(lon, lat):
+        for district, rings in polygons:
+            if point_in_ring(lon, lat, rings[0]):
+                return district
+        return None
+
+    points = [(rng.uniform(-124.5, -67.5), rng.uniform(25.5, 48.5)) for _ in range(max(count // 50, 20))]
+    start = time.perf_counter()
+    for lon, lat in points:
+        linear(lon, lat)
+    linear_ms = (time.perf_counter() - start) / len(points) * 1000
+    print(f"Linear polygon scan: mean {linear_ms:.3f} ms per point")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: ZIP-search query throughput with a single shared connection
+versus the pooled read-only connections, at 1, 8 and 32 concurrent readers
+
+Usage: python benchmarks/bench_read_pool.py [seconds_per_run]
+"""
+
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from synthetic import HOUSE_SEATS, build_synthetic_db
+
+from utils.database import CongressDatabase
+
+READERS = [1, 8, 32]
+
+
+def run(db: CongressDatabase, readers: int, seconds: float) -> float:
+    """Run `readers` threads doing ZIP-search lookups; return queries/sec"""
+    districts = [f"{s}-{n:02d}" for s, seats in HOUSE_SEATS.items() for n in range(1, seats + 1)]
+    counts = [0] * readers
+    start_gate = threading.Barrier(readers + 1)
+    deadline = 0.0
+
+    def worker(i):
+        rng = random.Random(i)
+        start_gate.wait()
+        while time.perf_counter() < deadline:
+            district = rng.choice(districts)
+            db.get_representative_by_district(district)
+            db.get_senators_by_state(district[:2])
+            counts[i] += 2
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    deadline = time.perf_counter() + seconds
+    start_gate.wait()
+    for t in threads:
+        t.join()
+
+    return sum(counts) / seconds
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        build_synthetic_db(db_path).close()
+
+        print(f"{'readers':>8} {'shared QPS':>12} {'pooled QPS':>12} {'speedup':>8}")
+        for readers in READERS:
+            shared = CongressDatabase(db_path)
+            shared.connect()
+            shared_qps = run(shared, readers, seconds)
+            shared.close()
+
+            pooled = CongressDatabase(db_path, pool_size=readers)
+            pooled_qps = run(pooled, readers, seconds)
+            pooled.close()
+
+            print(f"{readers:>8} {shared_qps:>12,.0f} {pooled_qps:>12,.0f} {pooled_qps / shared_qps:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Benchmark: rerun cost of a ZIP result page (one House member + two senators)
+Runs the page in Streamlit's AppTest harness with the pre-rendered cards
+(app.display_representative) and with the previous element-by-element
+renderer (legacy_display_representative below, kept here as the baseline),
+and reports per rerun: script time, delta messages sent to the browser and
+their serialized size.
+
+Usage: python benchmarks/bench_rep_cards.py [reruns]
+"""
+
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import build_synthetic_db
+
+logging.getLogger('streamlit').setLevel(logging.ERROR)
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+
+import app  # noqa: E402
+
+from utils.cards import card_stats  # noqa: E402
+from utils.database import format_cents, vote_key  # noqa: E402
+
+PAGE = """
+import app
+import bench_rep_cards as bench
+for rep in bench.page_members(app.get_database()):
+    {renderer}(rep)
+"""
+
+RENDERERS = {
+    'element-by-element': 'bench.legacy_display_representative',
+    'pre-rendered cards': 'app.display_representative',
+}
+
+
+def page_members(db):
+    """What a FL-27 ZIP search shows: the House member, then both senators"""
+    house = db.get_representative_by_district('FL-27')
+    return [house] + db.get_senators_by_state('FL')
+
+
+def add_votes(db, members):
+    """Three recent roll calls with a position for each member, so cards show votes"""
+    votes, positions = [], []
+    for roll_call in range(1, 4):
+        vote_id = vote_key(119, 'house', 1, roll_call)
+        votes.append({
+            'vote_id': vote_id, 'congress': 119, 'chamber': 'house', 'session': 1,
+            'roll_call': roll_call, 'vote_date': f"2025-01-{roll_call + 10:02d}", 'vote_time': '12:00:00',
+            'question': 'On Passage', 'description': f"Synthetic measure {roll_call}", 'result': 'Passed',
+            'bill_id': f"hr{roll_call}-119", 'bill_title': f"Synthetic Act of 2025, part {roll_call}",
+            'total_yes': 218, 'total_no': 210, 'total_not_voting': 7,
+        })
+        positions += [(member['bioguide_id'], vote_id, 'Yes') for member in members]
+    db.store_votes(votes, positions)
+
+
+def capture_messages():
+    """Keep each AppTest run's forward messages (AppTest itself only keeps the element tree)"""
+    runs = []
+    run = LocalScriptRunner.run
+
+    def recording_run(self, *args, **kwargs):
+        tree = run(self, *args, **kwargs)
+        runs.append(list(self.forward_msgs()))
+        return tree
+
+    LocalScriptRunner.run = recording_run
+    return runs
+
+
+def measure(renderer: str, reruns: int, runs: list):
+    """(median ms per rerun, delta messages per rerun, delta bytes per rerun)"""
+    at = AppTest.from_string(PAGE.format(renderer=renderer), default_timeout=60)
+    at.run()  # first run fills the caches
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    times = []
+    del runs[:]
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - start) * 1000)
+
+    deltas = [[msg for msg in messages if msg.HasField('delta')] for messages in runs]
+    return (
+        statistics.median(times),
+        statistics.mean(len(run) for run in deltas),
+        statistics.mean(sum(msg.ByteSize() for msg in run) for run in deltas),
+    )
+
+
+def legacy_display_representative(rep: dict):
+    """app.display_representative before the pre-rendered cards (baseline)"""
+    with st.container():
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            st.markdown(f"## {rep['first_name']} {rep['last_name']}")
+            party_color = "#DC143C" if rep['party'] == "Republican" else "#0015BC"
+            st.markdown(f"""
+            <div style="display: inline-block; background-color: {party_color}; color: white;
+                        padding: 0.25rem 0.75rem; border-radius: 12px; font-weight: bold;">
+                {rep['party']}
+            </div>
+            <span style="margin-left: 1rem;">
+                {rep['office']} • {rep['district'] if rep['district'] != 'Statewide' else 'Statewide'}
+            </span>
+            """, unsafe_allow_html=True)
+
+            if rep['region']:
+                st.caption(f"📍 {rep['region']}")
+
+            if rep.get('next_general_election'):
+                if '2026' in rep['next_general_election']:
+                    st.info(f"🗳️ **Up for election:** {rep['next_general_election']}")
+                else:
+                    st.caption(f"🗳️ Next election: {rep['next_general_election']}")
+
+        st.markdown("---")
+        st.markdown("### 💰 Campaign Funding Transparency")
+
+        funding_col1, funding_col2 = st.columns(2)
+
+        with funding_col1:
+            aipac = format_cents(rep.get('aipac_cents', 0))
+            aipac_class = "funding-value-no" if aipac == "No" else "funding-value-yes"
+            st.markdown(f"""
+            <div class="funding-info">
+                <span class="funding-label">AIPAC Funded:</span>
+                <span class="{aipac_class}">{aipac}</span>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with funding_col2:
+            war_industry = format_cents(rep.get('war_industry_cents', 0))
+            war_class = "funding-value-no" if war_industry == "No" else "funding-value-yes"
+            st.markdown(f"""
+            <div class="funding-info">
+                <span class="funding-label">War Industry Funded:</span>
+                <span class="{war_class}">{war_industry}</span>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with st.expander("ℹ️ What does this mean?"):
+            st.write("""
+            **Campaign Funding Transparency:**
+            - **AIPAC**: American Israel Public Affairs Committee funding
+            - **War Industrial Complex**: Defense contractor campaign contributions
+
+            This information helps you understand potential influences on your representative's policy positions.
+            """)
+
+        st.markdown("---")
+        st.markdown("### 📞 Contact Information")
+
+        contact_col1, contact_col2 = st.columns(2)
+
+        with contact_col1:
+            if rep['dc_phone']:
+                st.markdown(f"""
+                <a href="tel:{rep['dc_phone']}" class="contact-btn">
+                    📞 Call: {rep['dc_phone']}
+                </a>
+                """, unsafe_allow_html=True)
+
+            if rep['website']:
+                st.markdown(f"""
+                <a href="{rep['website']}" target="_blank" class="contact-btn">
+                    🌐 Official Website
+                </a>
+                """, unsafe_allow_html=True)
+
+        with contact_col2:
+            if rep['contact_form']:
+                st.markdown(f"""
+                <a href="{rep['contact_form']}" target="_blank" class="contact-btn">
+                    ✉️ Contact Form
+                </a>
+                """, unsafe_allow_html=True)
+
+            if rep['email'] and rep['email'] != "Use web form":
+                st.markdown(f"""
+                <a href="mailto:{rep['email']}" class="contact-btn">
+                    📧 Email
+                </a>
+                """, unsafe_allow_html=True)
+
+        if rep['dc_office_address']:
+            st.markdown("**DC Office:**")
+            st.write(f"{rep['dc_office_address']}, Washington, DC {rep['dc_zip']}")
+
+        st.markdown("---")
+        st.markdown("### 📱 Social Media")
+
+        social_links = []
+        if rep['facebook']:
+            social_links.append(f"[Facebook]({rep['facebook']})")
+        if rep['twitter']:
+            social_links.append(f"[Twitter/X]({rep['twitter']})")
+        if rep['instagram']:
+            social_links.append(f"[Instagram]({rep['instagram']})")
+        if rep['tiktok']:
+            social_links.append(f"[TikTok]({rep['tiktok']})")
+
+        if social_links:
+            st.markdown(" • ".join(social_links))
+
+        recent_votes = app.get_database().get_recent_votes(rep.get('bioguide_id'), limit=3)
+        if recent_votes:
+            st.markdown("---")
+            st.markdown("### 🗳️ Recent Votes")
+            for vote in recent_votes:
+                subject = vote['bill_title'] or vote['description'] or vote['question']
+                st.markdown(f"**{vote['position'] or 'No record'}** on {subject} "
+                            f"({vote['question']}, {vote['result']}) · {vote['vote_date']}")
+
+        st.markdown("---")
+        with st.expander("💬 Need help contacting? Get a call script"):
+            rep_key = f"{rep['last_name']}_{rep['first_name']}_{rep.get('district', 'senate')}"
+            topic = st.selectbox(
+                "What are you calling about?",
+                ["Healthcare", "Education", "Climate Change", "Immigration",
+                 "Economy/Jobs", "Gun Policy", "Other"],
+                key=f"topic_{rep_key}"
+            )
+
+            if st.button("Generate Call Script", key=f"script_btn_{rep_key}"):
+                script = app.generate_call_script(rep, topic)
+                st.text_area("Your Call Script:", script, height=200, key=f"script_area_{rep_key}")
+                st.info("Tip: Feel free to personalize this script with your own story!")
+
+        st.markdown("---")
+
+
+def main():
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    runs = capture_messages()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.get_database() opens data/congress.db relative to the working directory
+        os.chdir(tmp)
+        os.mkdir("data")
+        db = build_synthetic_db(str(Path("data") / "congress.db"))
+        db.ensure_schema()
+        add_votes(db, page_members(db))
+        db.close()
+
+        results = {name: measure(renderer, reruns, runs) for name, renderer in RENDERERS.items()}
+        app.get_database().close()
+
+    print(f"{'renderer':<20} {'ms/rerun':>9} {'deltas/rerun':>13} {'bytes/rerun':>12}")
+    for name, (ms, deltas, size) in results.items():
+        print(f"{name:<20} {ms:>9.2f} {deltas:>13.0f} {size:>12,.0f}")
+
+    before, after = results['element-by-element'], results['pre-rendered cards']
+    stats = card_stats()
+    print(f"\n[OK] {before[1] / after[1]:.1f}x fewer deltas, {before[2] / after[2]:.1f}x fewer bytes, "
+          f"{before[0] / after[0]:.1f}x faster reruns; card cache hit rate {stats['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
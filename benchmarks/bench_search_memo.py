@@ -0,0 +1,77 @@
+"""
+Benchmark: memoized search functions under Streamlit-style reruns
+Simulates sessions that search a ZIP and then rerun the page on every
+widget interaction (each rerun repeats search_by_zip, search_by_district
+and get_all_florida_reps), with and without the memo cache. It then
+updates a member the way update_funding_data.py does and checks that the
+next call returns the new data.
+
+Usage: python benchmarks/bench_search_memo.py [sessions] [reruns]
+Exit code 1 when invalidation fails.
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import build_synthetic_db
+
+from utils import search
+from utils.cache import MemoCache
+
+
+def simulate(db, sessions: int, reruns: int, seed: int = 3) -> float:
+    """Run every session's reruns; returns microseconds per rerun"""
+    rng = random.Random(seed)
+    # Popular ZIPs repeat across sessions (a shared link), the rest are spread out
+    zips = [f"{rng.randint(0, 99999):05d}" if rng.random() < 0.5 else "33139" for _ in range(sessions)]
+    start = time.perf_counter()
+    for zip_code in zips:
+        for _ in range(reruns):
+            result = search.search_by_zip(zip_code, db)
+            if result['district']:
+                search.search_by_district(result['district'], db)
+            search.get_all_florida_reps(db)
+    return (time.perf_counter() - start) / (sessions * reruns) * 1e6
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_synthetic_db(str(Path(tmp) / "memo.db"))
+
+        search._memo = MemoCache(max_entries=0)
+        uncached = simulate(db, sessions, reruns)
+        search._memo = MemoCache()
+        cached = simulate(db, sessions, reruns)
+
+        print(f"{sessions} sessions x {reruns} reruns")
+        print(f"{'without memo':<14} {uncached:8.1f} us/rerun")
+        print(f"{'with memo':<14} {cached:8.1f} us/rerun  ({uncached / cached:.1f}x)\n")
+        stats = search.search_stats()['memo']
+        print(f"hit rate {stats['hit_rate']:.1%}, {stats['entries']} entries, {stats['evictions']} evictions")
+        for name, counts in stats['by_function'].items():
+            print(f"  {name:<22} hit rate {counts['hit_rate']:.1%} ({counts['hits']} hits, {counts['misses']} misses)")
+
+        # A data update (as update_funding_data.py does) must be visible on the next call
+        rep = search.search_by_district('FL-27', db)
+        with db.writer() as conn:
+            conn.execute("""
+                UPDATE representatives
+                SET aipac_cents = aipac_cents + 100, last_updated = '2099-01-01 00:00:00'
+                WHERE district = 'FL-27'
+            """)
+        updated = search.search_by_district('FL-27', db)
+        ok = updated['aipac_cents'] == rep['aipac_cents'] + 100
+        print(f"\n[{'OK' if ok else 'X'}] Entries from before a data update are not returned after it")
+        db.close()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
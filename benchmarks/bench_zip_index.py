@@ -0,0 +1,72 @@
+"""
+Benchmark: offline ZIP -> district lookups
+Compiles a synthetic nationwide ZCTA relationship file (33,000 ZCTAs) into
+the binary interval index, then compares bisect over the memory-mapped
+arrays with a linear scan over range objects (the previous approach).
+
+Usage: python benchmarks/bench_zip_index.py [lookups]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_synthetic_zcta_file
+
+from utils.zip_index import ZipDistrictIndex, build_zip_index, compile_intervals, read_relationship_file
+
+
+def timed(label: str, lookup, zips) -> float:
+    """Run lookup over every ZIP; print and return microseconds per lookup"""
+    start = time.perf_counter()
+    for zip_code in zips:
+        lookup(zip_code)
+    per_lookup = (time.perf_counter() - start) / len(zips) * 1e6
+    print(f"{label:<34} {per_lookup:10.2f} us/lookup")
+    return per_lookup
+
+
+def main():
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(7)
+    zips = [f"{rng.randint(0, 99999):05d}" for _ in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        relationship = str(Path(tmp) / "zcta_cd.txt")
+        index_path = str(Path(tmp) / "zip_districts.bin")
+        write_synthetic_zcta_file(relationship)
+
+        start = time.perf_counter()
+        build_zip_index(relationship, index_path)
+        print(f"Build time: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        index = ZipDistrictIndex.open(index_path)
+        print(f"Open (mmap) time: {(time.perf_counter() - start) * 1000:.2f} ms\n")
+
+        # Previous approach: dict of range objects scanned in order
+        ranges = {
+            range(start, end + 1): districts[0]
+            for start, end, districts in compile_intervals(read_relationship_file(relationship))
+        }
+
+        def range_scan(zip_code):
+            zip_int = int(zip_code)
+            for zip_range, district in ranges.items():
+                if zip_int in zip_range:
+                    return district
+            return None
+
+        scan = timed("Linear scan over ranges", range_scan, zips[:lookups // 100])
+        bisect = timed("Bisect over mmap interval arrays", index.lookup, zips)
+        print(f"\nSpeedup: {scan / bisect:,.0f}x")
+
+        covered = sum(1 for zip_code in zips if index.lookup(zip_code))
+        print(f"Covered: {covered / len(zips):.1%} of random 5-digit ZIPs")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
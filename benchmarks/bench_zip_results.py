@@ -0,0 +1,120 @@
+"""
+Benchmark: precomputed ZIP results versus the live search_by_zip path
+Builds a synthetic nationwide roster, ZIP index and results file, then
+compares (1) time to the first answer in a fresh process and (2) per-lookup
+latency, and checks that both paths return the same results.
+
+Usage: python benchmarks/bench_zip_results.py [lookups]
+"""
+
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import build_synthetic_db, write_synthetic_zcta_file
+
+from utils import search
+from utils.cache import MemoCache
+from utils.database import CongressDatabase
+from utils.zip_index import DEFAULT_ZIP_INDEX, build_zip_index
+from utils.zip_results import DEFAULT_ZIP_RESULTS
+
+REPO = Path(__file__).resolve().parent.parent
+
+# Runs in a fresh process: imports are excluded, the first search is timed
+FIRST_ANSWER = """
+import time
+from utils.database import CongressDatabase
+from utils.search import search_by_zip
+start = time.perf_counter()
+result = search_by_zip('33139', CongressDatabase('data/congress.db'))
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def first_answer_ms(cwd: str, runs: int = 5) -> float:
+    """Median time to the first search_by_zip answer in a new process"""
+    env = dict(os.environ, PYTHONPATH=str(REPO))
+    times = [
+        float(subprocess.run([sys.executable, '-c', FIRST_ANSWER], cwd=cwd, env=env,
+                             capture_output=True, text=True, check=True).stdout)
+        for _ in range(runs)
+    ]
+    return statistics.median(times)
+
+
+def latencies_us(db: CongressDatabase, zips) -> list:
+    """Per-call search_by_zip latency in microseconds"""
+    times = []
+    for zip_code in zips:
+        start = time.perf_counter()
+        search.search_by_zip(zip_code, db)
+        times.append((time.perf_counter() - start) * 1e6)
+    return sorted(times)
+
+
+def plain(result: dict) -> dict:
+    """A live result with snapshot rows turned into plain dicts"""
+    result = dict(result)
+    result['house_rep'] = dict(result['house_rep']) if result['house_rep'] else None
+    result['house_reps'] = [dict(rep) for rep in result['house_reps']]
+    result['senators'] = [dict(rep) for rep in result['senators']]
+    return result
+
+
+def main():
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(9)
+    zips = [f"{rng.randint(0, 99999):05d}" for _ in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.mkdir("data")
+        db = build_synthetic_db("data/congress.db")
+        write_synthetic_zcta_file("zcta_cd.txt")
+        build_zip_index("zcta_cd.txt", DEFAULT_ZIP_INDEX)
+
+        start = time.perf_counter()
+        search.build_zip_results(db)
+        print(f"build: {time.perf_counter() - start:.2f}s, "
+              f"{Path(DEFAULT_ZIP_RESULTS).stat().st_size / 1024:.0f} KB\n")
+
+        precomputed_start = first_answer_ms(tmp)
+        os.rename(DEFAULT_ZIP_RESULTS, "results.off")
+        live_start = first_answer_ms(tmp)
+        os.rename("results.off", DEFAULT_ZIP_RESULTS)
+        print(f"{'first answer in a new process':<32} live {live_start:8.2f} ms   "
+              f"precomputed {precomputed_start:8.2f} ms")
+
+        # Live path: results file moved away, freshness state reset
+        os.rename(DEFAULT_ZIP_RESULTS, "results.off")
+        search._fresh_results = (None, None, False, 0.0)
+        search._memo = MemoCache(max_entries=0)  # measure lookups, not memo hits
+        live_results = {zip_code: plain(search.search_by_zip(zip_code, db)) for zip_code in zips[:2000]}
+        live = latencies_us(db, zips)
+
+        os.rename("results.off", DEFAULT_ZIP_RESULTS)
+        search._fresh_results = (None, None, False, 0.0)
+        stored = {zip_code: search.search_by_zip(zip_code, db) for zip_code in zips[:2000]}
+        precomputed = latencies_us(db, zips)
+
+        for label, percentile in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            print(f"{f'search_by_zip {label}':<32} live {live[int(len(live) * percentile)]:8.2f} us   "
+                  f"precomputed {precomputed[int(len(precomputed) * percentile)]:8.2f} us")
+
+        same = stored == live_results
+        print(f"\n[{'OK' if same else 'X'}] Precomputed results match the live path "
+              f"for {len(stored)} ZIPs ({sum(r['success'] for r in stored.values())} with members)")
+
+        os.chdir(REPO)
+        db.close()
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
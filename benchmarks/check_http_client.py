@@ -0,0 +1,158 @@
+"""
+Resilience check for the API HTTP layer against a local stub server
+Verifies keep-alive reuse, retries with backoff, the circuit breaker's
+fast fallback to local data, and prints latency metrics. No network access
+beyond 127.0.0.1.
+
+Usage: python benchmarks/check_http_client.py
+Exit code 1 when any expectation fails.
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.api_clients import CircuitBreaker, GoogleCivicAPI, HTTPClient, TTLCache  # noqa: E402
+
+CIVIC_BODY = b'{"offices": [{"name": "U.S. House", "divisionId": "ocd-division/country:us/cd:fl27"}]}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """/ok, /flaky (503 on two of every three hits), /down (always 503), /slow (sleeps 2 s)"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # no 40 ms delayed-ACK stalls on reused connections
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        with self.server.lock:
+            self.server.hits[path] = self.server.hits.get(path, 0) + 1
+            hits = self.server.hits[path]
+
+        if path == '/slow':
+            time.sleep(2)
+        status = 200
+        if path == '/down' or (path == '/flaky' and hits % 3 != 0):
+            status = 503
+
+        body = CIVIC_BODY if status == 200 else b'{}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.hits = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    server, base = start_stub()
+    failures = []
+
+    def expect(condition, message):
+        print(f"[{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            failures.append(message)
+
+    # 1. Keep-alive: one pooled connection versus one per bare requests.get
+    client = HTTPClient('stub', backoff=0.01)
+    before = server.connections
+    start = time.perf_counter()
+    for _ in range(200):
+        client.get(f"{base}/ok")
+    pooled_ms = (time.perf_counter() - start) / 200 * 1000
+    pooled_connections = server.connections - before
+
+    before = server.connections
+    start = time.perf_counter()
+    for _ in range(200):
+        requests.get(f"{base}/ok", timeout=5)
+    bare_ms = (time.perf_counter() - start) / 200 * 1000
+    bare_connections = server.connections - before
+    print(f"     pooled: {pooled_ms:.2f} ms/request over {pooled_connections} connection(s); "
+          f"bare requests.get: {bare_ms:.2f} ms/request over {bare_connections} connections")
+    expect(pooled_connections == 1, "Session reuses one keep-alive connection")
+
+    # 2. Retries: /flaky fails twice, then succeeds within the retry budget
+    response = client.get(f"{base}/flaky")
+    expect(response.status_code == 200 and client.stats()['retries'] == 2,
+           "Two 503s are retried with backoff and the third attempt succeeds")
+
+    # 3. Circuit breaker: a failing upstream opens the circuit, then calls
+    #    fall back to the offline ZIP index without touching the network
+    down = HTTPClient('down', retries=1, backoff=0.01, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+    api = GoogleCivicAPI('key', cache=TTLCache(None), http=down)
+    api.base_url = f"{base}/down"
+    for zip_code in ('33101', '33102', '33103'):
+        api.get_district_from_zip(zip_code)
+    expect(down.breaker.state == 'open', "Circuit opens after 3 failed requests")
+
+    hits_before = server.hits.get('/down', 0)
+    start = time.perf_counter()
+    result = api.get_district_from_zip('33139')
+    open_ms = (time.perf_counter() - start) * 1000
+    expect(server.hits.get('/down', 0) == hits_before and result and result['district'] == 'FL-27',
+           f"Open circuit answers from local data without a request ({open_ms:.3f} ms)")
+
+    # 4. Slow upstream: short timeouts, then the open circuit stops the waiting
+    slow = HTTPClient('slow', timeout=(0.5, 0.2), retries=0,
+                      breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    api = GoogleCivicAPI('key', cache=TTLCache(None), http=slow)
+    api.base_url = f"{base}/slow"
+    start = time.perf_counter()
+    for zip_code in ('33101', '33102', '33103', '33104', '33105'):
+        api.get_district_from_zip(zip_code)
+    elapsed = time.perf_counter() - start
+    expect(slow.stats()['short_circuits'] == 3 and elapsed < 1.0,
+           f"Slow upstream costs two timeouts, then fails fast ({elapsed:.2f}s for 5 lookups, not 25s)")
+
+    # 5. Half-open: after reset_timeout one trial call closes the circuit again
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+    recovering = HTTPClient('recovering', retries=0, breaker=breaker)
+    try:
+        recovering.get(f"{base}/down")
+    except Exception:
+        pass
+    expect(breaker.state == 'open', "Circuit opens on failure")
+    time.sleep(0.15)
+    recovering.get(f"{base}/ok")
+    expect(breaker.state == 'closed', "Successful trial call after reset_timeout closes the circuit")
+
+    print("\nLatency metrics:")
+    for http in (client, down, slow, recovering):
+        stats = http.stats()
+        latency = (f"p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms"
+                   if 'p50_ms' in stats else "no completed requests")
+        print(f"  {http.name:<11} circuit={stats['circuit']:<9} requests={stats['requests']:<4} "
+              f"retries={stats['retries']:<3} failures={stats['failures']:<3} "
+              f"short_circuits={stats['short_circuits']:<3} {latency}")
+
+    server.shutdown()
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Query-plan regression check for CongressDatabase
+Runs every query method against a synthetic 50-state database, captures the
+SQL it executes and fails if EXPLAIN QUERY PLAN shows a full table scan
+(SCAN without an index, or a virtual table scan without constraints) or a
+temp B-tree sort.
+
+Usage: python benchmarks/check_query_plans.py [copies]
+Exit code 1 when any plan regresses or a query method has no case below.
+"""
+
+import inspect
+import sys
+import tempfile
+from pathlib import Path
+
+from synthetic import build_synthetic_db
+
+from utils.database import CongressDatabase, encode_cursor
+
+# Methods that do not serve read queries
+NON_QUERY_METHODS = {
+    'connect', 'close', 'writer', 'ensure_schema', 'create_tables', 'import_csv_data',
+    'refresh_stats', 'rebuild_search_index', 'import_id_crosswalk', 'store_votes',
+    'schema_problems', 'require_current_schema',
+}
+
+# Materialized tables that stay small (one row per state and party), so
+# reading them whole is expected
+SMALL_TABLES = {'representative_stats'}
+
+# Cursor for a page boundary in the middle of the list
+MID_CURSOR = encode_cursor({'state': 'FL', 'office': 'U.S. House', 'district': 'FL-10', 'id': 100})
+
+# (method name, kwargs) for every query shape the app and scripts use
+CASES = [
+    ('get_representative', {'bioguide_id': 'X000001'}),
+    ('get_representative_by_district', {'district': 'CA-12'}),
+    ('get_senators_by_state', {'state': 'TX'}),
+    ('get_all_representatives', {}),
+    ('get_all_representatives', {'state': 'FL'}),
+    ('get_all_representatives', {'party': 'Democrat'}),
+    ('get_all_representatives', {'state': 'FL', 'party': 'Republican'}),
+    ('get_all_representatives', {'state': 'FL', 'columns': ['last_name', 'district']}),
+    ('search_representatives', {'state': 'NY'}),
+    ('search_representatives', {'state': 'FL', 'office': 'U.S. House', 'war_industry_funded': 'No'}),
+    ('search_representatives', {'aipac_funded': 'Yes'}),
+    ('search_representatives', {'war_industry_min_cents': 10_000_000}),
+    ('search_representatives', {'party': 'Democrat', 'aipac_funded': 'Yes'}),
+    ('search_representatives', {'state': 'FL', 'aipac_funded': 'No', 'war_industry_funded': 'Yes'}),
+    ('search_representatives', {'state': 'FL', 'party': 'Republican', 'aipac_min_cents': 5_000_000}),
+    ('list_representatives', {'limit': 50}),
+    ('list_representatives', {'columns': ['last_name', 'district'], 'cursor': MID_CURSOR}),
+    ('list_representatives', {'state': 'FL', 'office': 'U.S. House', 'cursor': MID_CURSOR}),
+    ('list_representatives', {'party': 'Democrat', 'aipac_funded': 'Yes', 'cursor': MID_CURSOR}),
+    ('iter_representatives', {'columns': ['bioguide_id'], 'page_size': 100}),
+    ('count_representatives', {'state': 'FL', 'party': 'Republican'}),
+    ('count_representatives', {'state': 'FL', 'aipac_funded': 'Yes'}),
+    ('top_funded', {'source': 'aipac'}),
+    ('top_funded', {'source': 'war_industry', 'limit': 10}),
+    ('top_funded', {'source': 'aipac', 'state': 'FL'}),
+    ('search_text', {'query': 'jordan'}),
+    ('search_text', {'query': 'sam mem', 'state': 'FL'}),
+    ('search_text', {'query': 'jordna'}),
+    ('autocomplete', {'query': 'ca-1'}),
+    ('get_stats', {}),
+    ('get_id_map', {'id_type': 'fec'}),
+    ('get_bioguide_id', {'id_type': 'fec', 'external_id': 'H8FL27095'}),
+    ('get_external_ids', {'bioguide_id': 'X000001'}),
+    ('get_recent_votes', {'bioguide_id': 'X000001'}),
+    ('latest_vote_date', {'chamber': 'house'}),
+    ('get_vote_ids', {'chamber': 'senate', 'since': '2025-01-01'}),
+    ('get_stats_breakdown', {'group_by': 'party'}),
+    ('get_stats_breakdown', {'group_by': 'state_party', 'state': 'FL'}),
+]
+
+
+def plan_problems(conn, sql: str):
+    """Return the plan lines of `sql` that are full scans or temp sorts"""
+    problems = []
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        detail = row[3]
+        if ' VIRTUAL TABLE INDEX ' in detail:
+            # FTS5 / fts5vocab: index 0 means no MATCH or term constraint
+            full_scan = ' VIRTUAL TABLE INDEX 0:' in detail
+        else:
+            full_scan = (
+                detail.startswith('SCAN ')
+                and ' USING ' not in detail
+                and detail.split()[1] not in SMALL_TABLES
+            )
+        if full_scan or 'USE TEMP B-TREE' in detail:
+            problems.append(detail)
+    return problems
+
+
+def check(db: CongressDatabase) -> int:
+    """Run every case, print its plans, return the number of failures"""
+    failures = 0
+
+    query_methods = {
+        name for name, _ in inspect.getmembers(CongressDatabase, inspect.isfunction)
+        if not name.startswith('_') and name not in NON_QUERY_METHODS
+    }
+    missing = query_methods - {name for name, _ in CASES}
+    for name in sorted(missing):
+        print(f"[X] No query-plan case for CongressDatabase.{name}")
+        failures += 1
+
+    for name, kwargs in CASES:
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+        result = getattr(db, name)(**kwargs)
+        if inspect.isgenerator(result):
+            list(result)
+        db.conn.set_trace_callback(None)
+
+        for sql in statements:
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            problems = plan_problems(db.conn, sql)
+            label = f"{name}({', '.join(f'{k}={v!r}' for k, v in kwargs.items())})"
+            if problems:
+                failures += 1
+                print(f"[X] {label}")
+                for detail in problems:
+                    print(f"      {detail}")
+                print(f"      SQL: {' '.join(sql.split())}")
+            else:
+                print(f"[OK] {label}")
+
+    return failures
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_synthetic_db(str(Path(tmp) / "plans.db"), copies=copies)
+        failures = check(db)
+        db.close()
+
+    print(f"\n{failures} query plan problem(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
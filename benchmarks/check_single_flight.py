@@ -0,0 +1,113 @@
+"""
+Check: single-flight coalescing of concurrent identical searches
+200 threads search the same ZIP at once through a GoogleCivicAPI pointed
+at a slow local stub server (synthetic database, in-memory API cache).
+With single-flight the stub should see one request; calling the uncoalesced
+lookup the same way shows what each burst used to cost.
+
+Usage: python benchmarks/check_single_flight.py [threads]
+Exit code 1 when any expectation fails.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from check_http_client import start_stub
+from synthetic import build_synthetic_db
+
+from utils import search
+from utils.api_clients import GoogleCivicAPI, HTTPClient, TTLCache
+from utils.cache import SingleFlight
+
+
+def burst(threads: int, lookup, *args) -> list:
+    """Run lookup(*args) from `threads` threads released together"""
+    barrier = threading.Barrier(threads)
+    results = [None] * threads
+
+    def worker(slot: int):
+        barrier.wait()
+        results[slot] = lookup(*args)
+
+    workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return results
+
+
+def civic_api(base: str) -> GoogleCivicAPI:
+    """Fresh client (empty cache) whose lookups take 2 s on the stub's /slow path"""
+    api = GoogleCivicAPI('key', cache=TTLCache(None), http=HTTPClient('stub', timeout=(1, 5), pool_size=256))
+    api.base_url = f"{base}/slow"
+    return api
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    server, base = start_stub()
+    failures = []
+
+    def expect(condition, message):
+        print(f"[{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_synthetic_db(str(Path(tmp) / "flight.db"))
+        search.get_snapshot(db.db_path)  # load outside the timed bursts
+
+        start = time.perf_counter()
+        results = burst(threads, search._search_by_zip, '33139', db, civic_api(base))
+        elapsed = time.perf_counter() - start
+        uncoalesced_hits = server.hits.pop('/slow', 0)
+        print(f"     without single-flight: {uncoalesced_hits} API requests, {elapsed:.2f}s")
+
+        start = time.perf_counter()
+        results = burst(threads, search.search_by_zip, '33139', db, civic_api(base))
+        elapsed = time.perf_counter() - start
+        hits = server.hits.pop('/slow', 0)
+        stats = search.search_stats()['single_flight']
+        print(f"     with single-flight:    {hits} API request(s), {elapsed:.2f}s")
+
+        expect(hits == 1, f"{threads} concurrent searches send one API request")
+        expect(stats['deduplicated'] == threads - 1 and stats['executions'] == 1,
+               f"Metrics count {stats['deduplicated']} deduplicated calls "
+               f"(dedup rate {stats['dedup_rate']:.1%})")
+        expect(all(result == results[0] for result in results) and results[0]['district'] == 'FL-27',
+               "Every caller gets the same result")
+        expect(len({id(result) for result in results}) == threads,
+               "Each caller gets its own result dict")
+
+        # Exceptions reach every waiting caller, and nothing stays in flight
+        flight = SingleFlight()
+
+        def failing():
+            time.sleep(0.2)
+            raise ValueError("upstream broke")
+
+        def call():
+            try:
+                return flight.do('key', failing)
+            except ValueError as e:
+                return e
+
+        errors = burst(20, call)
+        stats = flight.stats()
+        expect(all(error is errors[0] for error in errors) and stats['errors'] == 1
+               and stats['in_flight'] == 0,
+               "One failure is shared by all 20 waiting callers and then forgotten")
+
+        db.close()
+
+    server.shutdown()
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Check: incremental roll-call vote sync replayed from recorded fixtures
+Runs sync_votes.py's sync against benchmarks/fixtures/propublica (no
+network, synthetic database): a first sync, an incremental one that must
+fetch only the new roll call, and a no-op re-run. Then times the local
+recent-votes query that replaces the live API call.
+
+Usage: python benchmarks/check_vote_sync.py
+Exit code 1 when any expectation fails.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import build_synthetic_db
+
+from sync_votes import make_api, sync_chamber
+
+FIXTURES = Path(__file__).parent / "fixtures" / "propublica"
+
+
+def main():
+    failures = []
+
+    def expect(condition, message):
+        print(f"[{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_synthetic_db(str(Path(tmp) / "votes.db"))
+
+        api = make_api(replay=str(FIXTURES))
+        stored = sync_chamber(db, api, 'house', since='2025-01-06', until='2025-01-10')
+        expect(stored == (3, 15), "First sync stores 3 votes and 15 positions")
+        expect(db.latest_vote_date('house') == '2025-01-09', "Newest stored vote is from 2025-01-09")
+
+        # Restarts at 2025-01-09: lists that day again but skips the two stored roll calls
+        api = make_api(replay=str(FIXTURES))
+        stored = sync_chamber(db, api, 'house', until='2025-01-15')
+        requests = api.http.stats()
+        expect(stored == (1, 5) and requests['requests'] == 2,
+               f"Incremental sync fetches only the new roll call ({requests['requests']} requests)")
+
+        api = make_api(replay=str(FIXTURES))
+        stored = sync_chamber(db, api, 'house', until='2025-01-15')
+        expect(stored == (0, 0), "Re-running stores nothing")
+
+        votes = db.get_recent_votes('G000578', limit=3)
+        expect([vote['roll_call'] for vote in votes] == [8, 7, 6],
+               "Recent votes come newest first, same-day votes by roll call")
+        expect(votes[0]['position'] == 'Yes' and votes[0]['bill_id'] == 'hr375-119',
+               "Votes carry the member's position and the bill")
+
+        db.connect()
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT v.*, mv.position FROM member_votes mv "
+            "JOIN votes v ON v.vote_id = mv.vote_id WHERE mv.bioguide_id = ? "
+            "ORDER BY mv.vote_date DESC, mv.vote_id DESC LIMIT ?",
+            ('G000578', 3)
+        ).fetchall()
+        print("     " + "\n     ".join(row[3] for row in plan))
+        expect(not any('TEMP B-TREE' in row[3] for row in plan), "Recent votes are read in index order")
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            db.get_recent_votes('G000578')
+        per_query = (time.perf_counter() - start)
+        print(f"     local get_recent_votes: {per_query:.3f} ms/query")
+        expect(per_query < 1.0, "Local recent-votes query takes under a millisecond")
+        db.close()
+
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
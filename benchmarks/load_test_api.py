@@ -0,0 +1,279 @@
+"""
+Load test: sustained requests per second of the JSON API
+Starts `uvicorn api:app` on a synthetic nationwide roster (535 members,
+33,000 ZCTAs) and keeps N keep-alive connections busy for a fixed time with
+a mix of ZIP (70%), district (20%) and representatives (10%) requests, half
+of them revalidating with If-None-Match like a caching client. Reports
+requests per second, latency percentiles and status codes, then checks
+304s, gzip and per-client rate limiting against a second instance with the
+default limits.
+
+With --url the load runs against an already running instance instead
+(the synthetic data's ZIPs and districts are still used for requests).
+
+Usage: python benchmarks/load_test_api.py [--seconds 10] [--connections 32] [--url http://127.0.0.1:8000]
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from synthetic import build_synthetic_db, write_synthetic_zcta_file
+
+from utils.database import CongressDatabase
+from utils.zip_index import build_zip_index
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection (just enough of the protocol for the API)"""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def get(self, path: str, headers: Dict[str, str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+        status_line = await self.reader.readline()
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = (await self.reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            response_headers[name.lower()] = value.strip()
+        length = int(response_headers.get('content-length', 0))
+        body = await self.reader.readexactly(length) if length else b''
+        return status, response_headers, body
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def request_paths(db_path: str, zcta_path: str, rng: random.Random, count: int = 5000) -> List[str]:
+    """A shuffled request mix drawn from the synthetic data"""
+    zips = sorted({line.split('|')[2] for line in Path(zcta_path).read_text().splitlines()[1:] if line})
+    db = CongressDatabase(db_path)
+    db.connect()
+    districts = [rep['district'] for rep in db.search_representatives(office='U.S. House', columns=['district'])]
+    states = sorted({district.split('-')[0] for district in districts})
+    db.close()
+
+    paths = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.7:
+            paths.append(f"/v1/zip/{rng.choice(zips)}")
+        elif kind < 0.9:
+            paths.append(f"/v1/district/{rng.choice(districts)}")
+        else:
+            party = rng.choice(['', '&party=Democrat', '&party=Republican'])
+            paths.append(f"/v1/representatives?state={rng.choice(states)}{party}")
+    return paths
+
+
+async def load(host: str, port: int, paths: List[str], seconds: float, connections: int) -> Dict:
+    """Keep every connection busy until the time is up"""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    received = [0]
+    etags: Dict[str, str] = {}
+    deadline = time.perf_counter() + seconds
+
+    async def worker(number: int):
+        rng = random.Random(number)
+        revalidates = number % 2 == 0  # half the clients keep ETags
+        connection = Connection(host, port)
+        await connection.open()
+        try:
+            while time.perf_counter() < deadline:
+                path = rng.choice(paths)
+                headers = {'Accept-Encoding': 'gzip'}
+                if revalidates and path in etags:
+                    headers['If-None-Match'] = etags[path]
+                start = time.perf_counter()
+                status, response_headers, body = await connection.get(path, headers)
+                latencies.append(time.perf_counter() - start)
+                statuses[status] += 1
+                received[0] += len(body)
+                if revalidates and 'etag' in response_headers:
+                    etags[path] = response_headers['etag']
+        finally:
+            await connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(number) for number in range(connections)))
+    elapsed = time.perf_counter() - start
+    return {'elapsed': elapsed, 'latencies': latencies, 'statuses': statuses, 'bytes': received[0]}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir: str, **env) -> Tuple[subprocess.Popen, int]:
+    """uvicorn api:app on a free port, reading data/ in workdir"""
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'api:app', '--port', str(port),
+         '--no-access-log', '--log-level', 'warning'],
+        cwd=workdir, env={**os.environ, 'PYTHONPATH': str(REPO), **env},
+    )
+    for _ in range(300):
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).ok:
+                return server, port
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("API server did not start")
+
+
+def check_protocol(base: str, paths: List[str], expect):
+    """Conditional requests and gzip on one ZIP lookup"""
+    path = next(path for path in paths if path.startswith('/v1/zip/'))
+    first = requests.get(base + path, headers={'Accept-Encoding': 'identity'})
+    expect(first.status_code == 200 and 'ETag' in first.headers and 'Last-Modified' in first.headers,
+           f"200 with ETag {first.headers.get('ETag')} and Last-Modified {first.headers.get('Last-Modified')}")
+
+    revalidated = requests.get(base + path, headers={'If-None-Match': first.headers.get('ETag', '')})
+    expect(revalidated.status_code == 304 and not revalidated.content, "If-None-Match answers 304 without a body")
+    since = requests.get(base + path, headers={'If-Modified-Since': first.headers.get('Last-Modified', '')})
+    expect(since.status_code == 304, "If-Modified-Since answers 304")
+
+    listing = f"{base}/v1/representatives?state=CA"
+    raw = requests.get(listing, headers={'Accept-Encoding': 'identity'}, stream=True).raw.read()
+    compressed = requests.get(listing, headers={'Accept-Encoding': 'gzip'}, stream=True)
+    body = compressed.raw.read()
+    expect(compressed.headers.get('Content-Encoding') == 'gzip' and gzip.decompress(body) == raw,
+           f"gzip body decodes to the same JSON ({len(raw):,} -> {len(body):,} bytes)")
+    expect(json.loads(raw)['count'] > 0, "Representatives filter returns members")
+
+    members, cursor, pages = [], None, 0
+    while True:
+        page = requests.get(f"{base}/v1/representatives", params={'limit': 100, 'cursor': cursor}).json()
+        members += [rep['bioguide_id'] for rep in page['representatives']]
+        pages += 1
+        cursor = page['next_cursor']
+        if cursor is None or pages > 20:
+            break
+    expect(len(members) == len(set(members)) == 535 and pages == 6,
+           f"Cursor paging walks {len(set(members))} members once each in {pages} pages of 100")
+    expect(requests.get(f"{base}/v1/representatives?cursor=nonsense").status_code == 400,
+           "Invalid cursor answers 400")
+    expect(requests.get(f"{base}/v1/representatives?limit=0").status_code == 400, "limit=0 answers 400")
+    expect(all(requests.get(f"{base}/v1/representatives?aipac_funded={value}").status_code == 400
+               for value in ('yes', 'true', '1')), "Funded filter other than Yes/No/All answers 400")
+
+    expect(requests.get(f"{base}/v1/zip/1234").status_code == 400, "Invalid ZIP answers 400")
+    expect(requests.get(f"{base}/v1/representatives?color=red").status_code == 400, "Unknown parameter answers 400")
+    expect(requests.get(f"{base}/v1/district/ZZ-99").status_code == 404, "Unknown district answers 404")
+
+
+def check_rate_limit(workdir: str, expect):
+    """A client over its burst gets 429s with Retry-After"""
+    server, port = start_server(workdir, API_RATE_LIMIT='10', API_RATE_BURST='20')
+    try:
+        with requests.Session() as session:
+            responses = [session.get(f"http://127.0.0.1:{port}/v1/district/CA-01") for _ in range(40)]
+        statuses = Counter(response.status_code for response in responses)
+        limited = [response for response in responses if response.status_code == 429]
+        expect(statuses[200] in range(20, 24) and limited and 'Retry-After' in limited[0].headers,
+               f"Burst of 40 requests at 10/s (burst 20): {statuses[200]} served, {statuses[429]} rejected "
+               f"with Retry-After {limited[0].headers.get('Retry-After') if limited else None}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def report(result: Dict):
+    latencies = sorted(result['latencies'])
+    total = len(latencies)
+    percentile = lambda share: latencies[min(total - 1, int(total * share))] * 1000
+    print(f"\n     {total:,} requests in {result['elapsed']:.1f}s: {total / result['elapsed']:,.0f} requests/s")
+    print(f"     latency p50 {percentile(0.5):.2f} ms, p95 {percentile(0.95):.2f} ms, "
+          f"p99 {percentile(0.99):.2f} ms, mean {statistics.mean(latencies) * 1000:.2f} ms")
+    print(f"     status {dict(sorted(result['statuses'].items()))}, "
+          f"{result['bytes'] / total:,.0f} body bytes per request\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sustained load against the JSON API")
+    parser.add_argument("--seconds", type=float, default=10, help="Duration of the load")
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent keep-alive connections")
+    parser.add_argument("--url", help="Load an already running instance instead of starting one")
+    args = parser.parse_args()
+
+    failures = []
+
+    def expect(condition, message):
+        print(f"[{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.mkdir(f"{tmp}/data")
+        db_path = f"{tmp}/data/congress.db"
+        build_synthetic_db(db_path).close()
+        write_synthetic_zcta_file(f"{tmp}/zcta.txt")
+        build_zip_index(f"{tmp}/zcta.txt", f"{tmp}/data/zip_districts.bin")
+        CongressDatabase(db_path).ensure_schema()
+        paths = request_paths(db_path, f"{tmp}/zcta.txt", random.Random(7))
+
+        server: Optional[subprocess.Popen] = None
+        if args.url:
+            base = args.url.rstrip('/')
+        else:
+            # High limit: every load connection shares the client address 127.0.0.1
+            server, port = start_server(tmp, API_RATE_LIMIT='1000000', API_RATE_BURST='1000000')
+            base = f"http://127.0.0.1:{port}"
+        try:
+            url = urlsplit(base)
+            print(f"Loading {base} with {args.connections} connections for {args.seconds:g}s")
+            result = asyncio.run(load(url.hostname, url.port or 80, paths, args.seconds, args.connections))
+            report(result)
+            expect(set(result['statuses']) <= {200, 304}, "Every request answered 200 or 304")
+            if not args.url:
+                check_protocol(base, paths, expect)
+                health = requests.get(f"{base}/health").json()
+                print(f"     server: {health['requests']:,} requests, {health['not_modified']:,} not modified, "
+                      f"response cache hit rate {health['cache']['hit_rate']:.1%}")
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+        if not args.url:
+            check_rate_limit(tmp, expect)
+
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
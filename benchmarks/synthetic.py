@@ -0,0 +1,144 @@
+"""
+Synthetic nationwide roster used by the benchmarks
+Builds a full 50-state Congress (435 House seats + 100 senators) so
+performance numbers and query plans reflect national scale
+"""
+
+import csv
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.database import CSV_COLUMNS, CongressDatabase, format_cents
+from utils.zip_index import STATE_FIPS
+
+# House seats per state (2020 apportionment)
+HOUSE_SEATS = {
+    'AL': 7, 'AK': 1, 'AZ': 9, 'AR': 4, 'CA': 52, 'CO': 8, 'CT': 5, 'DE': 1,
+    'FL': 28, 'GA': 14, 'HI': 2, 'ID': 2, 'IL': 17, 'IN': 9, 'IA': 4, 'KS': 4,
+    'KY': 6, 'LA': 6, 'ME': 2, 'MD': 8, 'MA': 9, 'MI': 13, 'MN': 8, 'MS': 4,
+    'MO': 8, 'MT': 2, 'NE': 3, 'NV': 4, 'NH': 2, 'NJ': 12, 'NM': 3, 'NY': 26,
+    'NC': 14, 'ND': 1, 'OH': 15, 'OK': 5, 'OR': 6, 'PA': 17, 'RI': 2, 'SC': 7,
+    'SD': 1, 'TN': 9, 'TX': 38, 'UT': 4, 'VT': 1, 'VA': 11, 'WA': 10, 'WV': 2,
+    'WI': 8, 'WY': 1,
+}
+
+PARTIES = ['Republican', 'Democrat', 'Independent']
+
+
+def synthetic_rows(copies: int = 1, seed: int = 42):
+    """
+    Yield representative rows (database column names) for every seat.
+    copies > 1 repeats the roster as extra "historical" members so the
+    dataset can be scaled past 535 rows.
+    """
+    rng = random.Random(seed)
+    serial = 0
+
+    for copy in range(copies):
+        for state, seats in HOUSE_SEATS.items():
+            members = [('U.S. Senate', 'Statewide')] * 2
+            members += [('U.S. House', f"{state}-{n:02d}") for n in range(1, seats + 1)]
+
+            for office, district in members:
+                serial += 1
+                last_name = f"Member{serial:06d}"
+                funded = rng.random() < 0.4
+                yield {
+                    'bioguide_id': f"X{serial:06d}",
+                    'first_name': rng.choice(['Alex', 'Jordan', 'Sam', 'Taylor', 'Morgan']),
+                    'middle_name': None,
+                    'last_name': last_name,
+                    'office': office,
+                    'state': state,
+                    'district': district if copy == 0 else f"{district}/{copy}",
+                    'party': rng.choices(PARTIES, weights=[48, 48, 4])[0],
+                    'region': f"{state} Region {rng.randint(1, 9)}",
+                    'dc_office_address': f"{rng.randint(100, 2500)} Rayburn House Office Building",
+                    'dc_zip': '20515',
+                    'dc_phone': f"202-225-{rng.randint(0, 9999):04d}",
+                    'website': f"https://{last_name.lower()}.house.gov",
+                    'contact_form': f"https://{last_name.lower()}.house.gov/contact",
+                    'email': 'Use web form',
+                    'facebook': f"https://www.facebook.com/{last_name}",
+                    'twitter': f"https://twitter.com/{last_name}",
+                    'instagram': None,
+                    'tiktok': None,
+                    'aipac_cents': rng.randint(1000, 900000) * 100 if funded else 0,
+                    'war_industry_cents': rng.randint(1000, 500000) * 100 if rng.random() < 0.5 else 0,
+                }
+
+
+def build_synthetic_db(db_path: str, copies: int = 1) -> CongressDatabase:
+    """Create a fresh database at db_path filled with synthetic rows"""
+    db = CongressDatabase(db_path)
+    db.connect()
+    db.create_tables()
+
+    rows = list(synthetic_rows(copies))
+    columns = list(rows[0].keys())
+    db.conn.executemany(
+        f"INSERT INTO representatives ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})",
+        [tuple(row[c] for c in columns) for row in rows]
+    )
+    db.conn.commit()
+    return db
+
+
+def write_synthetic_csv(csv_path: str, row_count: int) -> int:
+    """Write row_count synthetic members in the state CSV import format (with Bioguide_ID)"""
+    copies = row_count // sum(2 + seats for seats in HOUSE_SEATS.values()) + 1
+    db_to_csv = {column: header for header, column in CSV_COLUMNS.items()}
+
+    written = 0
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Bioguide_ID'] + list(CSV_COLUMNS))
+        writer.writeheader()
+        for row in synthetic_rows(copies):
+            if written == row_count:
+                break
+            row['aipac_cents'] = format_cents(row['aipac_cents'])
+            row['war_industry_cents'] = format_cents(row['war_industry_cents'])
+            writer.writerow({
+                'Bioguide_ID': row['bioguide_id'],
+                **{header: row.get(column) for column, header in db_to_csv.items()},
+            })
+            written += 1
+    return written
+
+
+def write_synthetic_zcta_file(path: str, zcta_count: int = 33000, seed: int = 42) -> int:
+    """
+    Write a Census-style ZCTA / congressional district relationship file
+    (pipe-delimited, GEOID_CD119_20 and GEOID_ZCTA5_20 columns) covering
+    every House seat, with ZIP ranges handed to states in order and about
+    8% of ZCTAs split between two neighbouring districts.
+    Returns the number of ZCTAs written.
+    """
+    rng = random.Random(seed)
+    fips = {usps: code for code, usps in STATE_FIPS.items()}
+    seats = [(state, n) for state, count in HOUSE_SEATS.items() for n in range(1, count + 1)]
+    zips = sorted(rng.sample(range(501, 99951), zcta_count))
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter='|')
+        writer.writerow(['GEOID_CD119_20', 'NAMELSAD_CD119_20', 'GEOID_ZCTA5_20', 'AREALAND_PART'])
+        for position, zcta in enumerate(zips):
+            seat = position * len(seats) // zcta_count
+            state, district = seats[seat]
+            at_large = HOUSE_SEATS[state] == 1
+            parts = [(state, district)]
+            if not at_large and rng.random() < 0.08:
+                neighbour = seats[min(seat + 1, len(seats) - 1)]
+                if neighbour[0] == state:
+                    parts.append(neighbour)
+            for part_state, part_district in parts:
+                code = '00' if at_large else f"{part_district:02d}"
+                writer.writerow([
+                    f"{fips[part_state]}{code}", f"Congressional District {code}",
+                    f"{zcta:05d}", rng.randint(10_000, 50_000_000),
+                ])
+    return zcta_count
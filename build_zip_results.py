@@ -0,0 +1,41 @@
+"""
+Precompute the search_by_zip result of every ZIP code into
+data/zip_results.bin, so the app answers ZIP searches with one read
+
+Run after every data refresh (import, funding update, new ZIP index). Until
+it is re-run the app notices the file is stale and uses the live lookup.
+
+Usage:
+    python build_zip_results.py [--db data/congress.db] [--index data/zip_districts.bin]
+                                [--output data/zip_results.bin]
+"""
+
+import argparse
+import sys
+
+from utils.database import CongressDatabase
+from utils.search import build_zip_results
+from utils.zip_index import DEFAULT_ZIP_INDEX
+from utils.zip_results import DEFAULT_ZIP_RESULTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute ZIP search results")
+    parser.add_argument("--db", default="data/congress.db", help="Database path")
+    parser.add_argument("--index", default=DEFAULT_ZIP_INDEX, help="Compiled ZIP index")
+    parser.add_argument("--output", default=DEFAULT_ZIP_RESULTS, help="Results file to write")
+    args = parser.parse_args()
+
+    db = CongressDatabase(args.db)
+    # Upgrade the schema first, so the fingerprint the results are stamped
+    # with is the one the (read-only) app sees
+    db.ensure_schema()
+    build_zip_results(db, args.index, args.output)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,310 @@
+"""
+Export a static copy of the lookup site: one page per House district,
+senator and distinct ZIP result, as HTML (the app's representative cards)
+plus JSON, and a compact ZIP index that the start page searches in the
+browser. The output can be served from any static file server or CDN.
+
+Incremental: <output>/manifest.json records a hash of what each file was
+built from (every column of its members' rows, their recent vote IDs and
+the template version; see member_key). A run only rewrites files whose
+inputs changed and removes files that no longer exist.
+
+Usage:
+    python export_site.py [--output site] [--db data/congress.db]
+                          [--index data/zip_districts.bin] [--force]
+
+Preview with: python -m http.server --directory site
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from html import escape
+from pathlib import Path
+from string import Template
+from typing import Callable, Dict, Iterator, List, Mapping, Tuple
+
+import utils.cards
+from utils.cards import CARD_CSS, card_html
+from utils.database import CongressDatabase
+from utils.search import district_set_result
+from utils.snapshot import get_snapshot
+from utils.zip_index import DEFAULT_ZIP_INDEX, ZipDistrictIndex, get_zip_index
+
+DEFAULT_SITE_DIR = "site"
+MANIFEST = "manifest.json"
+
+# Any change to the page code or card templates rebuilds every page
+TEMPLATE_VERSION = hashlib.sha256(
+    Path(__file__).read_bytes() + utils.cards.TEMPLATE_VERSION.encode('ascii')
+).hexdigest()[:16]
+
+SITE_CSS = """\
+body {
+    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+    margin: 0;
+    color: #212529;
+}
+
+main {
+    max-width: 960px;
+    margin: 0 auto;
+    padding: 1rem;
+}
+
+.notice {
+    background: #E3F2FD;
+    padding: 0.75rem 1rem;
+    border-radius: 6px;
+}
+
+""" + CARD_CSS
+
+PAGE = Template("""\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$title · Congress Connect</title>
+<link rel="stylesheet" href="${root}style.css">
+</head>
+<body>
+<main>
+<p><a href="${root}index.html">🏛️ Congress Connect</a></p>
+$body
+</main>
+</body>
+</html>
+""")
+
+# Start page search: fetch zips.json once, binary-search the ZIP's interval
+SEARCH_SCRIPT = """\
+<script>
+let zipIndex = null;
+async function findZip(event) {
+  event.preventDefault();
+  const zip = document.getElementById('zip').value.trim();
+  const status = document.getElementById('status');
+  if (!/^[0-9]{5}$/.test(zip)) { status.textContent = 'Please enter a 5-digit ZIP code.'; return; }
+  if (!zipIndex) {
+    const data = await (await fetch('zips.json')).json();
+    let start = 0;
+    data.starts = data.starts.map(delta => (start += delta));
+    zipIndex = data;
+  }
+  const number = parseInt(zip, 10);
+  let low = 0, high = zipIndex.starts.length - 1, found = -1;
+  while (low <= high) {
+    const middle = (low + high) >> 1;
+    if (zipIndex.starts[middle] <= number) { found = middle; low = middle + 1; } else { high = middle - 1; }
+  }
+  if (found >= 0 && number <= zipIndex.starts[found] + zipIndex.spans[found]) {
+    window.location.href = 'zip/' + zipIndex.pages[zipIndex.page[found]] + '.html';
+  } else {
+    status.textContent = 'Could not determine district. Please select it from the list below.';
+  }
+}
+</script>
+"""
+
+
+def page_key(*inputs) -> str:
+    """Short hash of everything a file is built from"""
+    return hashlib.sha256(repr((TEMPLATE_VERSION,) + inputs).encode('utf-8')).hexdigest()[:16]
+
+
+def member_key(rep: Mapping, votes: List[Dict]) -> tuple:
+    """
+    What a member's pages depend on: every column of the row and the recent
+    vote IDs (last_updated alone misses edits that do not bump it). Kept per
+    member, so an update rebuilds only the pages that show that member.
+    """
+    return tuple(sorted(rep.items())), tuple(vote['vote_id'] for vote in votes)
+
+
+def render_page(title: str, body: str, root: str = '../') -> str:
+    return PAGE.substitute(title=escape(title), body=body, root=root)
+
+
+def to_json(data) -> str:
+    return json.dumps(data, ensure_ascii=False, indent=1, default=str)
+
+
+def member_name(rep: Mapping) -> str:
+    return f"{rep['first_name']} {rep['last_name']}"
+
+
+def result_slug(districts: Tuple[str, ...]) -> str:
+    """Page name of a ZIP result: its districts, primary first"""
+    return '_'.join(districts)
+
+
+def zip_result_body(result: Dict, votes: Dict[str, List[Dict]], db_path: str = None) -> str:
+    """The app's ZIP search output (success message, House member(s), senators)"""
+    parts = [f"<h1>✅ {escape(result['message'])}</h1>"]
+    if len(result['house_reps']) > 1:
+        parts.append(f"<p class=\"notice\">This ZIP spans {escape(', '.join(result['districts']))}. "
+                     "Your representative depends on your street address.</p>")
+        parts.append("<h2>Your Possible U.S. House Representatives</h2>")
+        parts.extend(card_html(rep, votes[rep['bioguide_id']], db_path) for rep in result['house_reps'])
+    elif result['house_rep']:
+        parts.append("<h2>Your U.S. House Representative</h2>")
+        parts.append(card_html(result['house_rep'], votes[result['house_rep']['bioguide_id']], db_path))
+    if result['senators']:
+        parts.append("<h2>Your U.S. Senators</h2>")
+        parts.extend(card_html(rep, votes[rep['bioguide_id']], db_path) for rep in result['senators'])
+    return '\n'.join(parts)
+
+
+def zip_intervals(index: ZipDistrictIndex) -> Iterator[Tuple[int, int, Tuple[str, ...]]]:
+    """(first ZIP, last ZIP, districts) for every interval of the index"""
+    for position in range(len(index)):
+        start, end = index.starts[position], index.ends[position]
+        yield start, end, tuple(index.districts(start))
+
+
+def zip_index_json(intervals: List[Tuple[int, int, int]], pages: List[str]) -> str:
+    """
+    Client-side ZIP index: interval starts (delta-encoded), spans and page
+    numbers, plus the page names. Adjacent intervals with the same page are merged.
+    """
+    merged: List[List[int]] = []
+    for start, end, page in intervals:
+        if merged and merged[-1][2] == page and merged[-1][1] + 1 == start:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end, page])
+
+    starts, previous = [], 0
+    for start, _, _ in merged:
+        starts.append(start - previous)
+        previous = start
+    return json.dumps({
+        'pages': pages,
+        'starts': starts,
+        'spans': [end - start for start, end, _ in merged],
+        'page': [page for _, _, page in merged],
+    }, separators=(',', ':'))
+
+
+def site_files(db: CongressDatabase, index: ZipDistrictIndex) -> Iterator[Tuple[str, str, Callable[[], str]]]:
+    """Every file of the site as (relative path, input key, render function)"""
+    snapshot = get_snapshot(db.db_path)
+    votes = {rep['bioguide_id']: db.get_recent_votes(rep['bioguide_id'], limit=3) for rep in snapshot.rows}
+    keys = {rep['bioguide_id']: member_key(rep, votes[rep['bioguide_id']]) for rep in snapshot.rows}
+    links = []
+
+    # One page per House district and senator
+    for rep in snapshot.rows:
+        member_votes = votes[rep['bioguide_id']]
+        if rep['office'] == 'U.S. House':
+            path, title = f"district/{rep['district']}", f"{rep['district']}: {member_name(rep)}"
+        else:
+            path, title = f"senator/{rep['bioguide_id']}", f"Senator {member_name(rep)} ({rep['state']})"
+        links.append((path, title))
+        key = page_key(path, keys[rep['bioguide_id']])
+
+        yield f"{path}.html", key, lambda rep=rep, title=title, member_votes=member_votes: render_page(
+            title, f"<h1>{escape(title)}</h1>\n{card_html(rep, member_votes, db.db_path)}")
+        yield f"{path}.json", key, lambda rep=rep, member_votes=member_votes: to_json(
+            {'member': dict(rep), 'recent_votes': member_votes})
+
+    # One page per distinct ZIP result (ZIPs with the same districts share it)
+    pages: Dict[Tuple[str, ...], int] = {}
+    intervals = []
+    for start, end, districts in zip_intervals(index):
+        if districts not in pages:
+            result = district_set_result(districts, db)
+            if not result['success']:
+                continue
+            pages[districts] = len(pages)
+
+            path = f"zip/{result_slug(districts)}"
+            members = result['house_reps'] + result['senators']
+            key = page_key(path, [keys[rep['bioguide_id']] for rep in members])
+            yield f"{path}.html", key, lambda result=result: render_page(
+                f"Representatives for {result['district']}", zip_result_body(result, votes, db.db_path))
+            yield f"{path}.json", key, lambda result=result: to_json(result)
+        intervals.append((start, end, pages[districts]))
+
+    zips = zip_index_json(intervals, [result_slug(districts) for districts in pages])
+    yield "zips.json", page_key(zips), lambda: zips
+
+    # Start page: ZIP search plus links to every member page
+    items = ''.join(f'<li><a href="{path}.html">{escape(title)}</a></li>' for path, title in links)
+    yield "index.html", page_key(links), lambda: render_page("Find Your Representatives", (
+        "<h1>Find and Contact Your Federal Representatives</h1>\n"
+        "<form onsubmit=\"findZip(event)\"><label>📍 Enter your ZIP code: "
+        "<input id=\"zip\" inputmode=\"numeric\" maxlength=\"5\" placeholder=\"33139\"></label> "
+        "<button type=\"submit\">Find My Rep</button></form>\n"
+        "<p id=\"status\"></p>\n"
+        f"<h2>All Representatives</h2>\n<ul>{items}</ul>\n{SEARCH_SCRIPT}"
+    ), root='')
+    yield "style.css", page_key(SITE_CSS), lambda: SITE_CSS
+
+
+def write_file(path: Path, content: str):
+    """Write then rename, so a server never sees a half-written file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(content, encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def export_site(db_path: str = "data/congress.db", output_dir: str = DEFAULT_SITE_DIR,
+                index_path: str = DEFAULT_ZIP_INDEX, force: bool = False) -> Dict[str, int]:
+    """Build or update the static site; returns counts of written, unchanged and removed files"""
+    start = time.perf_counter()
+    output = Path(output_dir)
+    manifest_path = output / MANIFEST
+    old_manifest: Dict[str, str] = {}
+    if manifest_path.exists() and not force:
+        old_manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+
+    db = CongressDatabase(db_path)
+    db.ensure_schema()
+    db.connect()
+    manifest: Dict[str, str] = {}
+    counts = {'written': 0, 'unchanged': 0, 'removed': 0}
+    for path, key, render in site_files(db, get_zip_index(index_path)):
+        manifest[path] = key
+        if old_manifest.get(path) == key and (output / path).exists():
+            counts['unchanged'] += 1
+            continue
+        write_file(output / path, render())
+        counts['written'] += 1
+
+    for path in set(old_manifest) - set(manifest):
+        (output / path).unlink(missing_ok=True)
+        counts['removed'] += 1
+
+    write_file(manifest_path, json.dumps(manifest, indent=1, sort_keys=True))
+    db.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"[OK] Exported {len(manifest)} files to {output_dir}: {counts['written']} written, "
+          f"{counts['unchanged']} unchanged, {counts['removed']} removed ({elapsed:.2f}s)")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the lookup site as static HTML and JSON")
+    parser.add_argument("--output", default=DEFAULT_SITE_DIR, help="Output directory")
+    parser.add_argument("--db", default="data/congress.db", help="Database path")
+    parser.add_argument("--index", default=DEFAULT_ZIP_INDEX, help="Compiled ZIP index")
+    parser.add_argument("--force", action="store_true", help="Rebuild every file")
+    args = parser.parse_args()
+
+    export_site(args.db, args.output, args.index, args.force)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
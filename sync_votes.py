@@ -0,0 +1,167 @@
+"""
+Sync roll-call votes from the ProPublica Congress API into the local
+votes / member_votes tables
+
+Incremental: each chamber restarts from the date of its newest stored vote
+(that day is listed again, but roll calls already stored are skipped), so a
+run only downloads votes it does not have yet.
+
+Usage:
+    python sync_votes.py [--chamber house senate] [--since 2025-01-03] [--until 2025-01-31]
+                         [--db data/congress.db] [--replay DIR | --record DIR]
+
+--replay DIR answers every request from recorded JSON files (no network,
+no API key needed); --record DIR saves the live responses there first.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+from utils.api_clients import FixtureHTTPClient, HTTPClient, ProPublicaAPI
+from utils.database import CongressDatabase, vote_key
+
+CHAMBERS = ['house', 'senate']
+
+# First sync of a chamber (nothing stored, no --since) goes back this far
+DEFAULT_LOOKBACK_DAYS = 30
+
+# Days per date-range request
+WINDOW_DAYS = 30
+
+
+def date_windows(start: date, end: date, days: int = WINDOW_DAYS) -> Iterator[Tuple[date, date]]:
+    """Consecutive inclusive (first, last) date ranges covering start..end"""
+    while start <= end:
+        last = min(start + timedelta(days=days - 1), end)
+        yield start, last
+        start = last + timedelta(days=1)
+
+
+def parse_vote(vote: Dict, chamber: str) -> Dict:
+    """A votes-table row from a ProPublica vote (listing or roll call)"""
+    bill = vote.get('bill') or {}
+    total = vote.get('total') or {}
+    return {
+        'vote_id': vote_key(vote['congress'], chamber, vote['session'], vote['roll_call']),
+        'congress': int(vote['congress']),
+        'chamber': chamber,
+        'session': int(vote['session']),
+        'roll_call': int(vote['roll_call']),
+        'vote_date': vote['date'],
+        'vote_time': vote.get('time'),
+        'question': vote.get('question'),
+        'description': vote.get('description'),
+        'result': vote.get('result'),
+        'bill_id': bill.get('bill_id'),
+        'bill_title': bill.get('title'),
+        'total_yes': total.get('yes'),
+        'total_no': total.get('no'),
+        'total_not_voting': total.get('not_voting'),
+    }
+
+
+def sync_chamber(db: CongressDatabase, api: ProPublicaAPI, chamber: str,
+                 since: str = None, until: str = None) -> Tuple[int, int]:
+    """
+    Fetch and store the chamber's votes not yet in the database.
+    Each date window is stored in one transaction, so an interrupted sync
+    resumes cleanly. Returns (votes stored, member positions stored).
+    """
+    end = date.fromisoformat(until) if until else date.today()
+    start = since or db.latest_vote_date(chamber)
+    start = date.fromisoformat(start) if start else end - timedelta(days=DEFAULT_LOOKBACK_DAYS)
+
+    known = db.get_vote_ids(chamber, start.isoformat())
+    # ProPublica member IDs are bioguide IDs; map them in case this
+    # database uses its own (see import_id_crosswalk)
+    member_ids = db.get_id_map('propublica')
+
+    stored_votes = stored_positions = 0
+    for first, last in date_windows(start, end):
+        listed = api.get_votes_by_date(chamber, first.isoformat(), last.isoformat())
+        if listed is None:
+            raise RuntimeError(f"Could not fetch {chamber} votes for {first} to {last}")
+
+        votes: List[Dict] = []
+        positions: List[tuple] = []
+        for vote in listed:
+            vote_id = vote_key(vote['congress'], chamber, vote['session'], vote['roll_call'])
+            if vote_id in known:
+                continue
+
+            roll_call = api.get_roll_call(vote['congress'], chamber, vote['session'], vote['roll_call'])
+            if roll_call is None:
+                raise RuntimeError(f"Could not fetch roll call {vote_id}")
+
+            votes.append(parse_vote({**vote, **roll_call}, chamber))
+            for position in roll_call.get('positions', []):
+                member_id = position.get('member_id')
+                if member_id:
+                    positions.append((member_ids.get(member_id, member_id), vote_id, position.get('vote_position')))
+            known.add(vote_id)
+
+        if votes:
+            db.store_votes(votes, positions)
+            stored_votes += len(votes)
+            stored_positions += len(positions)
+
+    print(f"[OK] {chamber.title()}: {stored_votes} new votes, {stored_positions} member positions "
+          f"({start} to {end})")
+    return stored_votes, stored_positions
+
+
+def make_api(replay: str = None, record: str = None) -> ProPublicaAPI:
+    """Live API client, or one answering from (or recording to) fixture files"""
+    api_key = os.environ.get('PROPUBLICA_API_KEY', '')
+    api = ProPublicaAPI(api_key)
+    if replay:
+        api.api_key = api_key or 'replay'
+        api.http = FixtureHTTPClient(replay, api.base_url)
+    elif record:
+        if not api_key:
+            raise ValueError("PROPUBLICA_API_KEY is required to record fixtures")
+        api.http = FixtureHTTPClient(record, api.base_url, record=HTTPClient('propublica-record'))
+    elif not api_key:
+        raise ValueError("Set PROPUBLICA_API_KEY (or use --replay DIR)")
+    return api
+
+
+def sync_votes(db_path: str = "data/congress.db", chambers: List[str] = None, since: str = None,
+               until: str = None, replay: str = None, record: str = None) -> Tuple[int, int]:
+    """Sync every chamber; returns total (votes, positions) stored"""
+    db = CongressDatabase(db_path)
+    db.ensure_schema()
+    api = make_api(replay, record)
+
+    totals = [0, 0]
+    for chamber in chambers or CHAMBERS:
+        votes, positions = sync_chamber(db, api, chamber, since, until)
+        totals[0] += votes
+        totals[1] += positions
+    return totals[0], totals[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync roll-call votes into the local database")
+    parser.add_argument("--chamber", nargs="+", choices=CHAMBERS, help="Chambers to sync (default: both)")
+    parser.add_argument("--since", help="Start date YYYY-MM-DD (default: newest stored vote)")
+    parser.add_argument("--until", help="End date YYYY-MM-DD (default: today)")
+    parser.add_argument("--db", default="data/congress.db", help="Database path")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--replay", metavar="DIR", help="Answer requests from recorded fixtures")
+    source.add_argument("--record", metavar="DIR", help="Save live responses as fixtures")
+    args = parser.parse_args()
+
+    votes, positions = sync_votes(args.db, args.chamber, args.since, args.until, args.replay, args.record)
+    print(f"\n[OK] Stored {votes} votes and {positions} member positions")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
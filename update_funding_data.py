@@ -3,187 +3,120 @@ Update funding data in database and CSV from BOTH_ProIsrael_and_MIC_funded.csv
 """
 
 import pandas as pd
-import sqlite3
 import sys
+from utils.database import CongressDatabase, format_cents, lenient_amount_cents, report_problems, seat_key
 
-def format_amount(amount):
-    """Format amount as currency or return 'No'"""
-    if pd.isna(amount) or amount == 0:
-        return "No"
-    return f"${int(amount):,}"
+CSV_PATH = 'data/FLORIDA_FEDERAL_OFFICIALS_COMPLETE.csv'
 
-def match_representative(funding_row, our_data):
+def csv_bioguide_ids(our_df, seat_ids):
     """
-    Match a row from funding data with our representatives
-    Returns: matched row from our_data or None
+    bioguide_id of every CSV row: its Bioguide_ID column when set, else the
+    crosswalk seat the importer uses (see csv_record_builder)
     """
-    cand_name = funding_row['CAND_NAME']
-    office = funding_row['CAND_OFFICE']
-    district_num = funding_row['CAND_OFFICE_DISTRICT']
-
-    # Parse candidate name (format: "LAST, FIRST MIDDLE" or variations)
-    parts = cand_name.split(',')
-    if len(parts) < 2:
-        return None
-
-    last_name = parts[0].strip()
-    first_parts = parts[1].strip().split()
-    first_name = first_parts[0] if first_parts else ""
-
-    # Special handling for known variations
-    if last_name == "PAULINA LUNA":
-        last_name = "LUNA"
-        first_name = "ANNA"
-    elif "SEN" in cand_name or "MR" in cand_name or "MD" in cand_name:
-        # Remove titles
-        first_name = first_parts[0] if first_parts else ""
-
-    # Match by office type
-    if office == 'S':  # Senate
-        # Match senators by last name (only 2 per state)
-        matches = our_data[
-            (our_data['Office'] == 'U.S. Senate') &
-            (our_data['Last_Name'].str.upper() == last_name.upper())
-        ]
-    else:  # House
-        # Convert district number to our format (FL-01, FL-02, etc.)
-        district = f"FL-{int(district_num):02d}"
-
-        # Match by district and last name
-        matches = our_data[
-            (our_data['District'] == district) &
-            (our_data['Last_Name'].str.upper() == last_name.upper())
-        ]
-
-    if len(matches) == 1:
-        return matches.iloc[0]
-    elif len(matches) > 1:
-        # Multiple matches - try to narrow by first name
-        first_matches = matches[
-            matches['First_Name'].str.upper().str.startswith(first_name.upper()[:3])
-        ]
-        if len(first_matches) == 1:
-            return first_matches.iloc[0]
-
-    return None
+    derived = pd.Series([
+        seat_ids.get(seat_key(row['Office'], 'FL', row['District'], row['Last_Name']))
+        for _, row in our_df.iterrows()
+    ], index=our_df.index, dtype=object)
+    if 'Bioguide_ID' in our_df.columns:
+        return our_df['Bioguide_ID'].where(our_df['Bioguide_ID'].notna(), derived)
+    return derived
 
 def update_funding_data():
     """Main function to update funding data"""
 
     print("Loading funding data...")
     funding_df = pd.read_csv('BOTH_ProIsrael_and_MIC_funded.csv')
+    if 'CAND_ID' not in funding_df.columns:
+        raise ValueError("Funding file has no CAND_ID column; members are matched on FEC candidate IDs only")
 
     # Filter for Florida only
     fl_funding = funding_df[funding_df['CAND_OFFICE_ST'] == 'FL'].copy()
     print(f"Found {len(fl_funding)} Florida representatives with funding data")
 
     print("\nLoading our representative data...")
-    our_df = pd.read_csv('data/FLORIDA_FEDERAL_OFFICIALS_COMPLETE.csv')
+    our_df = pd.read_csv(CSV_PATH)
     print(f"Found {len(our_df)} representatives in our database")
 
+    db = CongressDatabase()
+    db.ensure_schema()
+    db.connect()
+
+    fec_ids = db.get_id_map('fec')
+    if not fec_ids:
+        raise RuntimeError("The ID crosswalk is empty; run python utils/database.py to load it")
+
+    # Join FEC candidate IDs to bioguide IDs through the crosswalk (hash lookups)
+    members = {m['bioguide_id']: m for m in db.get_all_representatives(state='FL')}
+    fl_funding['bioguide_id'] = fl_funding['CAND_ID'].map(fec_ids)
+
     # Create update tracking
     updates = []
-    matched = 0
+    problems = []
     unmatched = []
 
     print("\nMatching representatives...")
     print("="*80)
 
     for idx, funding_row in fl_funding.iterrows():
-        match = match_representative(funding_row, our_df)
-
-        if match is not None:
-            aipac_amount = format_amount(funding_row['total_amount'])
-            mic_amount = format_amount(funding_row['mic_total_amount'])
-
-            updates.append({
-                'Last_Name': match['Last_Name'],
-                'First_Name': match['First_Name'],
-                'District': match['District'],
-                'AIPAC_Funded': aipac_amount,
-                'War_Industrial_Complex_Funded': mic_amount
-            })
-
-            print(f"[OK] Matched: {match['First_Name']} {match['Last_Name']} ({match['District']})")
-            print(f"  AIPAC: {aipac_amount}, War Industry: {mic_amount}")
-            matched += 1
-        else:
-            unmatched.append(funding_row['CAND_NAME'])
-            print(f"[X] No match: {funding_row['CAND_NAME']} ({funding_row['CAND_OFFICE']}-{funding_row['CAND_OFFICE_DISTRICT']})")
+        member = members.get(funding_row['bioguide_id'])
+        if member is None:
+            unmatched.append(f"{funding_row['CAND_NAME']} ({funding_row['CAND_ID']})")
+            print(f"[X] No match: {funding_row['CAND_NAME']} ({funding_row['CAND_ID']})")
+            continue
+
+        # An unparseable amount is stored as unknown and reported below
+        aipac_cents = lenient_amount_cents(
+            funding_row['total_amount'], problems, f"{funding_row['CAND_NAME']} total_amount")
+        mic_cents = lenient_amount_cents(
+            funding_row['mic_total_amount'], problems, f"{funding_row['CAND_NAME']} mic_total_amount")
+
+        updates.append({
+            'Bioguide_ID': member['bioguide_id'],
+            'AIPAC_Funded': format_cents(aipac_cents),
+            'War_Industrial_Complex_Funded': format_cents(mic_cents),
+        })
+
+        print(f"[OK] Matched: {member['first_name']} {member['last_name']} ({member['district']})")
+        print(f"  AIPAC: {format_cents(aipac_cents)}, War Industry: {format_cents(mic_cents)}")
 
     print("\n" + "="*80)
     print(f"\nMatching Summary:")
-    print(f"  Matched: {matched}")
-    print(f"  Unmatched: {len(unmatched)}")
+    print(f"  Matched: {len(updates)}")
+    print(f"  Unmatched (FEC ID not in the crosswalk or not a current Florida member): {len(unmatched)}")
+    report_problems(problems)
 
     if unmatched:
         print(f"\nUnmatched candidates:")
         for name in unmatched:
             print(f"  - {name}")
 
-    if matched == 0:
+    if not updates:
         print("\nNo matches found. Exiting without changes.")
+        db.close()
         return False
 
-    # Apply updates to DataFrame
+    # Apply updates to DataFrame, keyed on bioguide_id (saved as a Bioguide_ID
+    # column so the importer and later updates use the same key)
     print("\nApplying updates to CSV data...")
+    bioguide_ids = csv_bioguide_ids(our_df, db.get_id_map('seat'))
+    for _, row in our_df[bioguide_ids.isna()].iterrows():
+        print(f"[!] No bioguide_id for {row['First_Name']} {row['Last_Name']} ({row['District']}); CSV row not updated")
+    our_df['Bioguide_ID'] = bioguide_ids
     for update in updates:
-        mask = (
-            (our_df['Last_Name'] == update['Last_Name']) &
-            (our_df['First_Name'] == update['First_Name']) &
-            (our_df['District'] == update['District'])
-        )
+        mask = our_df['Bioguide_ID'] == update['Bioguide_ID']
         our_df.loc[mask, 'AIPAC_Funded'] = update['AIPAC_Funded']
         our_df.loc[mask, 'War_Industrial_Complex_Funded'] = update['War_Industrial_Complex_Funded']
 
     # Save updated CSV
     print("Saving updated CSV...")
-    our_df.to_csv('data/FLORIDA_FEDERAL_OFFICIALS_COMPLETE.csv', index=False)
-    print("[OK] CSV updated: data/FLORIDA_FEDERAL_OFFICIALS_COMPLETE.csv")
+    our_df.to_csv(CSV_PATH, index=False)
+    print(f"[OK] CSV updated: {CSV_PATH}")
 
-    # Update SQLite database
+    # Update SQLite database through the importer's upsert, so each changed
+    # row gets the content hash of the CSV row just written and the next
+    # import_csv_data sees it as unchanged
     print("\nUpdating SQLite database...")
-    conn = sqlite3.connect('data/congress.db')
-    cursor = conn.cursor()
-
-    db_updates = 0
-    for update in updates:
-        # Determine if Senate or House
-        if update['District'] == 'Statewide':
-            cursor.execute("""
-                UPDATE representatives
-                SET aipac_funded = ?,
-                    war_industrial_complex_funded = ?,
-                    last_updated = CURRENT_TIMESTAMP
-                WHERE last_name = ? AND first_name = ? AND office = 'U.S. Senate'
-            """, (
-                update['AIPAC_Funded'],
-                update['War_Industrial_Complex_Funded'],
-                update['Last_Name'],
-                update['First_Name']
-            ))
-        else:
-            cursor.execute("""
-                UPDATE representatives
-                SET aipac_funded = ?,
-                    war_industrial_complex_funded = ?,
-                    last_updated = CURRENT_TIMESTAMP
-                WHERE last_name = ? AND first_name = ? AND district = ?
-            """, (
-                update['AIPAC_Funded'],
-                update['War_Industrial_Complex_Funded'],
-                update['Last_Name'],
-                update['First_Name'],
-                update['District']
-            ))
-
-        if cursor.rowcount > 0:
-            db_updates += 1
-
-    conn.commit()
-    conn.close()
-
-    print(f"[OK] Database updated: {db_updates} representatives")
+    db.import_csv_data(CSV_PATH, delete_missing=False)
 
     # Show summary statistics
     print("\n" + "="*80)
@@ -199,20 +132,20 @@ def update_funding_data():
     print(f"Representatives with BOTH: {len(both_funded)}")
     print(f"Representatives with NO funding from these sources: {len(our_df) - len(both_funded)}")
 
-    # Show top funded
+    # Show top funded (ranked in SQL on the integer-cents columns)
     print("\n" + "-"*80)
     print("Top 5 AIPAC Funded (Florida):")
     print("-"*80)
-    aipac_top = aipac_funded.nlargest(5, 'AIPAC_Funded', keep='all')[['First_Name', 'Last_Name', 'District', 'AIPAC_Funded']]
-    for _, row in aipac_top.iterrows():
-        print(f"  {row['First_Name']} {row['Last_Name']} ({row['District']}): {row['AIPAC_Funded']}")
+    for row in db.top_funded('aipac', limit=5, state='FL'):
+        print(f"  {row['first_name']} {row['last_name']} ({row['district']}): {format_cents(row['aipac_cents'])}")
 
     print("\n" + "-"*80)
     print("Top 5 War Industry Funded (Florida):")
     print("-"*80)
-    war_top = war_funded.nlargest(5, 'War_Industrial_Complex_Funded', keep='all')[['First_Name', 'Last_Name', 'District', 'War_Industrial_Complex_Funded']]
-    for _, row in war_top.iterrows():
-        print(f"  {row['First_Name']} {row['Last_Name']} ({row['District']}): {row['War_Industrial_Complex_Funded']}")
+    for row in db.top_funded('war_industry', limit=5, state='FL'):
+        print(f"  {row['first_name']} {row['last_name']} ({row['district']}): {format_cents(row['war_industry_cents'])}")
+
+    db.close()
 
     print("\n" + "="*80)
     print("[OK] UPDATE COMPLETE!")
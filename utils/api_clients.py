@@ -1,24 +1,489 @@
 """API clients for Congress Connect"""
 
+import asyncio
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+from utils.zip_index import lookup_zip
+
+DEFAULT_CACHE_DB = "data/api_cache.db"
+
+# Returned by TTLCache.get when a key is not cached (None is a cached miss)
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Two-tier cache for API responses: an in-process LRU in front of a
+    SQLite table, so entries survive restarts and are shared by processes
+    using the same file. Every entry has its own expiry; None values are
+    negative entries ("the API had no answer") kept for negative_ttl.
+    db_path=None keeps the cache in memory only.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = DEFAULT_CACHE_DB,
+        namespace: str = "default",
+        max_entries: int = 4096,
+        ttl: float = 30 * 24 * 3600,
+        negative_ttl: float = 24 * 3600
+    ):
+        self.db_path = db_path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.counters = {
+            'memory_hits': 0, 'disk_hits': 0, 'negative_hits': 0,
+            'misses': 0, 'expired': 0, 'stores': 0,
+        }
+        self._memory = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID
+            """)
+            self._conn.commit()
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """Cached value (None for a negative entry), or `default` when absent or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self._count_hit('memory_hits', entry[0])
+                    return entry[0]
+                del self._memory[key]
+                self.counters['expired'] += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM api_cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        value = json.loads(row[0])
+                        self._remember(key, value, row[1])
+                        self._count_hit('disk_hits', value)
+                        return value
+                    self.counters['expired'] += 1
+
+            self.counters['misses'] += 1
+            return default
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        """Cache a JSON-serializable value; None is stored as a negative entry"""
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self.counters['stores'] += 1
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO api_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, json.dumps(value), expires_at)
+                )
+                self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from both tiers; returns the number removed from disk"""
+        now = time.time()
+        with self._lock:
+            for key in [key for key, (_, expires_at) in self._memory.items() if expires_at <= now]:
+                del self._memory[key]
+            if self._conn is None:
+                return 0
+            cursor = self._conn.execute(
+                "DELETE FROM api_cache WHERE namespace = ? AND expires_at <= ?", (self.namespace, now)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        """Drop every entry of this namespace"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM api_cache WHERE namespace = ?", (self.namespace,))
+                self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Counters plus hit rate and current in-memory size"""
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        """Close the disk tier"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: str, value: Any, expires_at: float):
+        """Put an entry in the LRU tier, evicting the least recently used"""
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _count_hit(self, counter: str, value: Any):
+        self.counters[counter] += 1
+        if value is None:
+            self.counters['negative_hits'] += 1
+
+
+_caches: Dict[tuple, TTLCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_api_cache(namespace: str, db_path: str = DEFAULT_CACHE_DB) -> TTLCache:
+    """Shared cache for one namespace and file (one per process)"""
+    key = (namespace, str(Path(db_path).resolve()))
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = TTLCache(db_path, namespace)
+        return _caches[key]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream after `failure_threshold` consecutive
+    failures. After `reset_timeout` seconds one trial call is let through
+    (half-open); its success closes the circuit, its failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class TokenBucket:
+    """
+    Rate limiter for asyncio callers: `rate` requests per second on average,
+    bursts of up to `capacity`. Each acquire() reserves a token (the balance
+    may go negative) and sleeps until its token is due, so waiting callers
+    are served in arrival order. Not tied to an event loop.
+    """
+
+    def __init__(self, rate: float, capacity: int = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_acquire(self) -> float:
+        """
+        Take a token only if one is available: returns 0, or the seconds
+        until the next token (nothing is reserved, for callers that reject)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class HTTPClient:
+    """
+    Shared keep-alive session for one upstream API, with bounded retries
+    (exponential backoff with full jitter) on connection errors, timeouts,
+    429 and 5xx, a circuit breaker, and latency metrics.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        name: str,
+        timeout: tuple = (3.05, 5),
+        retries: int = 2,
+        backoff: float = 0.2,
+        pool_size: int = 16,
+        breaker: CircuitBreaker = None
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.counters = {'requests': 0, 'attempts': 0, 'retries': 0, 'failures': 0, 'short_circuits': 0}
+        self._latencies = deque(maxlen=1000)  # seconds per request, retries included
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET with retries. Returns the last response (which may still be an
+        error status); raises CircuitOpenError when the circuit is open,
+        the last requests exception once retries are exhausted, or any
+        other exception at once (recorded as a failure).
+        """
+        if not self.breaker.allow():
+            self._count('short_circuits')
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        kwargs.setdefault('timeout', self.timeout)
+        self._count('requests')
+        start = time.perf_counter()
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self._count('retries')
+                    time.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+                self._count('attempts')
+                try:
+                    response = self.session.get(url, **kwargs)
+                except requests.RequestException:
+                    if attempt == self.retries:
+                        raise
+                    continue
+                if response.status_code not in self.RETRY_STATUSES or attempt == self.retries:
+                    break
+        except BaseException:
+            # Any exception (not only requests errors: bad arguments, adapter
+            # bugs, KeyboardInterrupt) settles the call as a failure, so a
+            # half-open trial is never left claimed forever
+            self._failed(start)
+            raise
+
+        if response.status_code in self.RETRY_STATUSES:
+            self._failed(start)
+        else:
+            self.breaker.record_success()
+            self._record_latency(start)
+        return response
+
+    def stats(self) -> Dict:
+        """Counters, circuit state and latency percentiles (ms) over recent requests"""
+        with self._lock:
+            stats = dict(self.counters)
+            latencies = sorted(self._latencies)
+        stats['circuit'] = self.breaker.state
+        if latencies:
+            stats['p50_ms'] = latencies[len(latencies) // 2] * 1000
+            stats['p95_ms'] = latencies[int(len(latencies) * 0.95)] * 1000
+            stats['max_ms'] = latencies[-1] * 1000
+        return stats
+
+    def close(self):
+        self.session.close()
+
+    def _failed(self, start: float):
+        self.breaker.record_failure()
+        self._count('failures')
+        self._record_latency(start)
+
+    def _record_latency(self, start: float):
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.counters[counter] += 1
+
+
+_http_clients: Dict[str, HTTPClient] = {}
+_http_clients_lock = threading.Lock()
+
+
+def get_http_client(name: str) -> HTTPClient:
+    """Shared HTTP client (session, breaker, metrics) for one upstream, per process"""
+    with _http_clients_lock:
+        if name not in _http_clients:
+            _http_clients[name] = HTTPClient(name)
+        return _http_clients[name]
+
+
+class FixtureHTTPClient:
+    """
+    Stand-in for HTTPClient that replays recorded JSON responses, so API
+    syncs run offline and reproducibly. A URL maps to a file under
+    `directory` by its path below `base_url` (query strings are ignored),
+    e.g. .../congress/v1/house/votes/recent.json -> house/votes/recent.json.
+    With `record` set to a live HTTPClient, missing fixtures are fetched and
+    saved first; otherwise they answer 404.
+    """
+
+    def __init__(self, directory: str, base_url: str, record: HTTPClient = None):
+        self.name = f"fixtures:{directory}"
+        self.directory = Path(directory)
+        self.base_url = base_url.rstrip('/')
+        self.record = record
+        self.counters = {'requests': 0, 'replayed': 0, 'recorded': 0, 'missing': 0}
+
+    def fixture_path(self, url: str) -> Path:
+        relative = url.split('?')[0][len(self.base_url):].lstrip('/')
+        return self.directory / relative
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.counters['requests'] += 1
+        path = self.fixture_path(url)
+        if path.exists():
+            self.counters['replayed'] += 1
+            return self._response(url, 200, path.read_bytes())
+
+        if self.record:
+            live = self.record.get(url, **kwargs)
+            if live.status_code == 200:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(live.content)
+                self.counters['recorded'] += 1
+            return live
+
+        self.counters['missing'] += 1
+        return self._response(url, 404, b'{"status": "ERROR", "errors": [{"error": "No fixture"}]}')
+
+    def stats(self) -> Dict:
+        return dict(self.counters)
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _response(url: str, status: int, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response._content = body
+        response.headers['Content-Type'] = 'application/json'
+        response.encoding = 'utf-8'
+        return response
+
+
+_rate_limiters: Dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(name: str, rate: float) -> TokenBucket:
+    """Shared token bucket for one upstream's quota, per process"""
+    with _http_clients_lock:
+        if name not in _rate_limiters:
+            _rate_limiters[name] = TokenBucket(rate)
+        return _rate_limiters[name]
+
 
 class GoogleCivicAPI:
     """Client for Google Civic Information API"""
 
-    def __init__(self, api_key: str = ""):
+    def __init__(self, api_key: str = "", cache: TTLCache = None, http: HTTPClient = None):
+        """
+        With an API key, district lookups are cached (see TTLCache) in the
+        shared 'civic_district' cache unless another cache is given.
+        Requests go through the shared 'google_civic' HTTPClient.
+        """
         self.api_key = api_key
         self.base_url = "https://www.googleapis.com/civicinfo/v2/representatives"
+        self.http = http or get_http_client('google_civic')
+        if cache is None and api_key:
+            cache = get_api_cache('civic_district')
+        self.cache = cache
 
     def get_district_from_zip(self, zip_code: str) -> Optional[Dict]:
         """
         Get congressional district from ZIP code
         Returns: {"district": "FL-27", "state": "FL"} or None
+        Answers (including "no district") are cached; network errors are not.
         """
         if not self.api_key:
-            # Fallback: basic ZIP to district mapping for Florida
+            # Offline ZIP index; no network involved, so nothing to cache
             return self._fallback_zip_lookup(zip_code)
 
+        cached = self.cache.get(zip_code)
+        if cached is not MISSING:
+            return cached
+
         try:
             params = {
                 "address": zip_code,
@@ -27,14 +492,26 @@ class GoogleCivicAPI:
                 "roles": ["legislatorLowerBody", "legislatorUpperBody"]
             }
 
-            response = requests.get(self.base_url, params=params, timeout=5)
+            response = self.http.get(self.base_url, params=params)
 
             if response.status_code == 200:
                 data = response.json()
                 # Parse response to extract district
                 # Implementation would parse the actual response
-                return self._parse_civic_response(data)
+                result = self._parse_civic_response(data)
+                self.cache.set(zip_code, result)
+                return result
 
+            # Rate limiting and server errors (after retries) fall back to
+            # local data; client errors (unknown address) are stable answers
+            if response.status_code in HTTPClient.RETRY_STATUSES:
+                return self._fallback_zip_lookup(zip_code)
+            if 400 <= response.status_code < 500:
+                self.cache.set(zip_code, None)
+
+        except CircuitOpenError:
+            # Upstream known to be down: answer from local data right away
+            return self._fallback_zip_lookup(zip_code)
         except Exception as e:
             print(f"API Error: {e}")
             return self._fallback_zip_lookup(zip_code)
@@ -65,49 +542,130 @@ class GoogleCivicAPI:
 
     def _fallback_zip_lookup(self, zip_code: str) -> Optional[Dict]:
         """
-        Simple fallback ZIP to district mapping for Florida
-        NOTE: This is a simplified version. Full implementation would use comprehensive database
+        Offline ZIP to district lookup from the compiled ZIP index
+        (see utils/zip_index.py), used without an API key or when the API fails
         """
-        # Basic Florida ZIP ranges (simplified)
-        zip_int = int(zip_code)
-
-        # This is just sample data - would need complete mapping
-        if 32004 <= zip_int <= 32099:
-            return {"district": "FL-04", "state": "FL"}
-        elif 33101 <= zip_int <= 33299:
-            return {"district": "FL-27", "state": "FL"}
-        elif 33301 <= zip_int <= 33499:
-            return {"district": "FL-23", "state": "FL"}
-        # Add more mappings...
-
-        # Default to asking user to select district
-        return None
+        return lookup_zip(zip_code)
 
 
 class ProPublicaAPI:
     """Client for ProPublica Congress API"""
 
-    def __init__(self, api_key: str = ""):
+    # Client-side quota: requests per second (and burst) across all callers
+    RATE_LIMIT = 10
+    CONCURRENCY = 8
+    # Worker threads for stream_recent_votes (started on demand, reused across calls)
+    MAX_CONCURRENCY = 32
+
+    def __init__(self, api_key: str = "", http: HTTPClient = None, limiter: TokenBucket = None):
         self.api_key = api_key
         self.base_url = "https://api.propublica.org/congress/v1"
+        self.http = http or get_http_client('propublica')
+        self.limiter = limiter or get_rate_limiter('propublica', self.RATE_LIMIT)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def close(self):
+        """Stop the worker threads of stream_recent_votes (the HTTP client is shared and stays open)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # requests is blocking: calls run on worker threads that share the pooled session
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.MAX_CONCURRENCY,
+                                                    thread_name_prefix='propublica')
+            return self._executor
 
     def get_recent_votes(self, bioguide_id: str, limit: int = 3) -> list:
-        """Get recent votes for a representative"""
-        if not self.api_key:
+        """
+        Get recent votes for a representative from the live API.
+        Pages that can use the local copy should call
+        CongressDatabase.get_recent_votes (kept current by sync_votes.py).
+        """
+        data = self.get_json(f"members/{bioguide_id}/votes.json")
+        if not data:
             return []
+        votes = (data.get('results') or [{}])[0].get('votes', [])
+        return votes[:limit]
 
-        try:
-            url = f"{self.base_url}/members/{bioguide_id}/votes.json"
-            headers = {"X-API-Key": self.api_key}
-
-            response = requests.get(url, headers=headers, timeout=5)
+    def get_json(self, path: str) -> Optional[Dict]:
+        """
+        GET base_url/path and return the decoded body, or None when there is
+        no API key, the request fails, or the upstream circuit is open
+        """
+        if not self.api_key:
+            return None
 
+        try:
+            response = self.http.get(f"{self.base_url}/{path}", headers={"X-API-Key": self.api_key})
             if response.status_code == 200:
-                data = response.json()
-                votes = data.get('results', [{}])[0].get('votes', [])
-                return votes[:limit]
-
+                return response.json()
+        except CircuitOpenError:
+            pass
         except Exception as e:
             print(f"ProPublica API Error: {e}")
 
-        return []
+        return None
+
+    def get_votes_by_date(self, chamber: str, start_date: str, end_date: str) -> Optional[list]:
+        """Roll-call votes of a chamber between two dates (YYYY-MM-DD, inclusive), without positions"""
+        data = self.get_json(f"{chamber.lower()}/votes/{start_date}/{end_date}.json")
+        if data is None:
+            return None
+        return data.get('results', {}).get('votes', [])
+
+    def get_roll_call(self, congress: int, chamber: str, session: int, roll_call: int) -> Optional[Dict]:
+        """One roll-call vote including every member's position"""
+        data = self.get_json(f"{congress}/{chamber.lower()}/sessions/{session}/votes/{roll_call}.json")
+        if data is None:
+            return None
+        return data.get('results', {}).get('votes', {}).get('vote')
+
+    async def stream_recent_votes(
+        self,
+        bioguide_ids: Iterable[str],
+        limit: int = 3,
+        concurrency: int = None
+    ) -> AsyncIterator[Tuple[str, list]]:
+        """
+        Fetch recent votes for many members at once and yield
+        (bioguide_id, votes) in completion order. At most `concurrency`
+        requests are in flight (capped at MAX_CONCURRENCY), and each one
+        waits for a token from the shared rate limiter. Failures yield an
+        empty list, as in get_recent_votes. Call close() when done with
+        the client to stop its worker threads.
+        """
+        bioguide_ids = list(dict.fromkeys(bioguide_ids))
+        if not bioguide_ids:
+            return
+        concurrency = min(concurrency or self.CONCURRENCY, self.MAX_CONCURRENCY, len(bioguide_ids))
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        executor = self._get_executor()
+
+        async def fetch(bioguide_id: str) -> Tuple[str, list]:
+            async with semaphore:
+                if self.api_key:
+                    await self.limiter.acquire()
+                votes = await loop.run_in_executor(executor, self.get_recent_votes, bioguide_id, limit)
+                return bioguide_id, votes
+
+        tasks = [asyncio.ensure_future(fetch(bioguide_id)) for bioguide_id in bioguide_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def get_recent_votes_many(self, bioguide_ids: Iterable[str], limit: int = 3,
+                              concurrency: int = None) -> Dict[str, list]:
+        """Blocking wrapper around stream_recent_votes: {bioguide_id: votes}"""
+        async def collect() -> Dict[str, list]:
+            return {bioguide_id: votes async for bioguide_id, votes in
+                    self.stream_recent_votes(bioguide_ids, limit, concurrency)}
+        return asyncio.run(collect())
@@ -0,0 +1,122 @@
+"""
+In-process caches shared by every session
+SingleFlight coalesces concurrent identical calls; MemoCache keeps results
+keyed on the data version they were computed from.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in
+    flight, other callers with the same key wait for it and share its
+    result (or exception) instead of running it again. Nothing is kept
+    once the call finishes.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls: Dict[Hashable, SingleFlight._Call] = {}
+        self._lock = threading.Lock()
+        self.counters = {'calls': 0, 'executions': 0, 'deduplicated': 0, 'errors': 0}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """fn(*args, **kwargs), run at most once at a time per key"""
+        with self._lock:
+            self.counters['calls'] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+                self.counters['executions'] += 1
+            else:
+                self.counters['deduplicated'] += 1
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self.counters['errors'] += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> Dict:
+        """Counters plus the share of calls that were deduplicated"""
+        with self._lock:
+            stats = dict(self.counters)
+            stats['in_flight'] = len(self._calls)
+        stats['dedup_rate'] = stats['deduplicated'] / stats['calls'] if stats['calls'] else 0.0
+        return stats
+
+
+class MemoCache:
+    """
+    Bounded LRU cache of computed results. Callers put the database's table
+    fingerprint in every key, so entries computed before a data update are
+    never returned again and simply age out. Values are shared between
+    callers and must be treated as read-only.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._by_function: Dict[str, Dict[str, int]] = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: tuple, fn: Callable, *args) -> Any:
+        """Cached value for key (whose first item names the function), else fn(*args)"""
+        with self._lock:
+            value = self._entries.get(key, self._MISSING)
+            counter = 'hits' if value is not self._MISSING else 'misses'
+            self.counters[counter] += 1
+            function = self._by_function.setdefault(key[0], {'hits': 0, 'misses': 0})
+            function[counter] += 1
+            if value is not self._MISSING:
+                self._entries.move_to_end(key)
+                return value
+
+        value = fn(*args)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Counters, size and hit rate, overall and per function"""
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._entries)
+            by_function = {name: dict(counts) for name, counts in self._by_function.items()}
+        for counts in [stats] + list(by_function.values()):
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_rate'] = counts['hits'] / lookups if lookups else 0.0
+        stats['by_function'] = by_function
+        return stats
@@ -0,0 +1,259 @@
+"""
+Pre-rendered HTML cards for representatives
+A member's static profile (header, funding, contact, social links, recent
+votes) is rendered from templates compiled once at import into a single
+HTML blob, cached per (template version, database generation, member,
+recent votes). The page then sends one element per card instead of dozens;
+interactive parts (the call script generator) stay Streamlit widgets.
+"""
+
+import hashlib
+from html import escape
+from pathlib import Path
+from string import Template
+from typing import Dict, Optional, Sequence
+
+from utils.cache import MemoCache
+from utils.database import format_cents
+from utils.snapshot import get_fingerprint
+
+# Any change to the templates or rendering code gives every card a new key
+TEMPLATE_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+PARTY_COLORS = {'Republican': '#DC143C'}
+DEFAULT_PARTY_COLOR = '#0015BC'
+
+FUNDING_NOTE = (
+    "<strong>AIPAC</strong>: American Israel Public Affairs Committee funding. "
+    "<strong>War Industrial Complex</strong>: Defense contractor campaign contributions. "
+    "This information helps you understand potential influences on your representative's policy positions."
+)
+
+# Card styles, injected by the app and written to the static site
+CARD_CSS = """\
+/* Representative card */
+.rep-card {
+    background: white;
+    border-radius: 8px;
+    padding: 1.5rem;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+    margin-bottom: 1rem;
+}
+
+/* Funding transparency highlight */
+.funding-info {
+    background: #FFF3CD;
+    border-left: 4px solid #FFC107;
+    padding: 1rem;
+    margin: 1rem 0;
+    border-radius: 4px;
+}
+
+.funding-label {
+    font-weight: bold;
+    color: #856404;
+    margin-right: 0.5rem;
+}
+
+.funding-value-no {
+    color: #28a745;
+    font-weight: bold;
+}
+
+.funding-value-yes {
+    color: #dc3545;
+    font-weight: bold;
+}
+
+/* Contact buttons */
+.contact-btn {
+    display: block;
+    width: 100%;
+    padding: 1rem;
+    margin: 0.5rem 0;
+    background: #003366;
+    color: white;
+    text-align: center;
+    border-radius: 6px;
+    text-decoration: none;
+    font-size: 16px;
+}
+
+.contact-btn:hover {
+    background: #004080;
+}
+
+/* Card header and layout */
+.party-badge {
+    display: inline-block;
+    color: white;
+    padding: 0.25rem 0.75rem;
+    border-radius: 12px;
+    font-weight: bold;
+    margin-right: 1rem;
+}
+
+.card-caption {
+    color: #6c757d;
+    font-size: 0.875rem;
+    margin: 0.5rem 0;
+}
+
+.election-banner {
+    background: #E3F2FD;
+    color: #0D47A1;
+    padding: 0.75rem 1rem;
+    border-radius: 6px;
+    margin: 0.5rem 0;
+}
+
+.card-grid {
+    display: grid;
+    grid-template-columns: 1fr;
+    column-gap: 1rem;
+}
+
+.card-note summary {
+    cursor: pointer;
+}
+
+@media (min-width: 640px) {
+    .card-grid {
+        grid-template-columns: 1fr 1fr;
+    }
+}
+"""
+
+# Card templates. Kept free of blank lines and indentation: Streamlit's
+# markdown renderer would otherwise end the HTML block or start a code block.
+CARD = Template(
+    '<div class="rep-card-static">'
+    '<h2>$name</h2>'
+    '<div class="party-badge" style="background-color: $party_color;">$party</div>'
+    '<span class="rep-seat">$office • $district</span>'
+    '$region$election'
+    '<hr><h3>💰 Campaign Funding Transparency</h3>'
+    '<div class="card-grid">$aipac$war_industry</div>'
+    '<details class="card-note"><summary>ℹ️ What does this mean?</summary><p>$note</p></details>'
+    '<hr><h3>📞 Contact Information</h3>'
+    '<div class="card-grid"><div>$contact_left</div><div>$contact_right</div></div>'
+    '$address'
+    '<hr><h3>📱 Social Media</h3>'
+    '<p>$social</p>'
+    '$votes'
+    '</div>'
+)
+REGION = Template('<p class="card-caption">📍 $region</p>')
+ELECTION_SOON = Template('<div class="election-banner">🗳️ <strong>Up for election:</strong> $date</div>')
+ELECTION_LATER = Template('<p class="card-caption">🗳️ Next election: $date</p>')
+FUNDING = Template(
+    '<div class="funding-info"><span class="funding-label">$label:</span>'
+    '<span class="$value_class">$value</span></div>'
+)
+CONTACT = Template('<a href="$href" class="contact-btn"$target>$label</a>')
+ADDRESS = Template('<p><strong>DC Office:</strong><br>$address, Washington, DC $zip</p>')
+LINK = Template('<a href="$href" target="_blank">$label</a>')
+VOTES = Template('<hr><h3>🗳️ Recent Votes</h3><ul class="card-votes">$items</ul>')
+VOTE = Template('<li><strong>$position</strong> on $subject ($question, $result) · $date</li>')
+
+# Shared by every session; keys carry the data version, so cards rendered
+# before an update are never returned again and age out
+_cards = MemoCache(max_entries=2048)
+
+
+def card_stats() -> Dict:
+    """Hit rate and size of the card cache"""
+    return _cards.stats()
+
+
+def card_html(rep: Dict, votes: Sequence[Dict] = (), db_path: str = None) -> str:
+    """
+    One member's static card as a single HTML blob. Cached when db_path
+    (the database the row came from) is given, keyed on its generation
+    counter; otherwise rendered every time.
+    """
+    if db_path is None:
+        return render_card(rep, votes)
+    key = (
+        'card',
+        TEMPLATE_VERSION,
+        db_path,
+        get_fingerprint(db_path),
+        rep.get('bioguide_id') or (rep.get('last_name'), rep.get('district')),
+        tuple(vote['vote_id'] for vote in votes),
+    )
+    return _cards.get_or_compute(key, render_card, rep, tuple(votes))
+
+
+def render_card(rep: Dict, votes: Sequence[Dict] = ()) -> str:
+    """Render a card (uncached); every value from the row is HTML-escaped"""
+    text = {key: escape(str(value)) if value is not None else '' for key, value in rep.items()}
+    election = rep.get('next_general_election')
+
+    contact_left = []
+    if rep.get('dc_phone'):
+        contact_left.append(CONTACT.substitute(href=f"tel:{text['dc_phone']}", target='',
+                                               label=f"📞 Call: {text['dc_phone']}"))
+    if rep.get('website'):
+        contact_left.append(CONTACT.substitute(href=text['website'], target=' target="_blank"',
+                                               label='🌐 Official Website'))
+    contact_right = []
+    if rep.get('contact_form'):
+        contact_right.append(CONTACT.substitute(href=text['contact_form'], target=' target="_blank"',
+                                                label='✉️ Contact Form'))
+    if rep.get('email') and rep['email'] != "Use web form":
+        contact_right.append(CONTACT.substitute(href=f"mailto:{text['email']}", target='', label='📧 Email'))
+
+    social = [
+        LINK.substitute(href=text[column], label=label)
+        for column, label in (('facebook', 'Facebook'), ('twitter', 'Twitter/X'),
+                              ('instagram', 'Instagram'), ('tiktok', 'TikTok'))
+        if rep.get(column)
+    ]
+
+    return CARD.substitute(
+        name=f"{text['first_name']} {text['last_name']}",
+        party=text['party'],
+        party_color=PARTY_COLORS.get(rep['party'], DEFAULT_PARTY_COLOR),
+        office=text['office'],
+        district=text['district'],
+        region=REGION.substitute(region=text['region']) if rep.get('region') else '',
+        election=(
+            '' if not election
+            else ELECTION_SOON.substitute(date=text['next_general_election']) if '2026' in election
+            else ELECTION_LATER.substitute(date=text['next_general_election'])
+        ),
+        aipac=_funding('AIPAC Funded', rep.get('aipac_cents', 0)),
+        war_industry=_funding('War Industry Funded', rep.get('war_industry_cents', 0)),
+        note=FUNDING_NOTE,
+        contact_left=''.join(contact_left),
+        contact_right=''.join(contact_right),
+        address=(ADDRESS.substitute(address=text['dc_office_address'], zip=text['dc_zip'])
+                 if rep.get('dc_office_address') else ''),
+        social=' • '.join(social),
+        votes=_votes(votes),
+    )
+
+
+def _funding(label: str, cents: Optional[int]) -> str:
+    value = format_cents(cents)
+    return FUNDING.substitute(
+        label=label, value=escape(value),
+        value_class="funding-value-no" if value == "No" else "funding-value-yes"
+    )
+
+
+def _votes(votes: Sequence[Dict]) -> str:
+    if not votes:
+        return ''
+    items = ''.join(
+        VOTE.substitute(
+            position=escape(vote['position'] or 'No record'),
+            subject=escape(vote['bill_title'] or vote['description'] or vote['question'] or ''),
+            question=escape(str(vote['question'])),
+            result=escape(str(vote['result'])),
+            date=escape(str(vote['vote_date'])),
+        )
+        for vote in votes
+    )
+    return VOTES.substitute(items=items)
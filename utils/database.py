@@ -3,18 +3,602 @@ Database operations for Congress Connect
 Handles SQLite database creation, data import, and queries
 """
 
+import argparse
+import base64
+import csv
+import hashlib
+import json
+import queue
+import re
 import sqlite3
-import pandas as pd
+import sys
+import threading
+import time
+import unicodedata
+import urllib.request
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+# Memory-map up to 256 MB of the database file for readers
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Generated flags and partial indexes over the integer-cents funding columns.
+# A NULL amount means "funded, amount not recorded" (CSV value "Yes").
+FUNDING_FLAG_COLUMNS = [
+    "is_aipac_funded INTEGER GENERATED ALWAYS AS (aipac_cents IS NOT 0) VIRTUAL",
+    "is_war_industry_funded INTEGER GENERATED ALWAYS AS (war_industry_cents IS NOT 0) VIRTUAL",
+]
+
+FUNDING_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_aipac_funded ON representatives(aipac_cents) WHERE is_aipac_funded",
+    "CREATE INDEX IF NOT EXISTS idx_war_industry_funded ON representatives(war_industry_cents) WHERE is_war_industry_funded",
+]
+
+# Composite indexes shaped after the queries below:
+#   district lookup         WHERE district = ? AND office = 'U.S. House'
+#   senators                WHERE state = ? AND office = 'U.S. Senate' ORDER BY last_name
+#   list/search             [state = ?] [party = ?] ORDER BY state, office DESC, district
+QUERY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_district_office ON representatives(district, office)",
+    "CREATE INDEX IF NOT EXISTS idx_state_office_last_name ON representatives(state, office, last_name)",
+    "CREATE INDEX IF NOT EXISTS idx_state_office_district ON representatives(state, office DESC, district)",
+    "CREATE INDEX IF NOT EXISTS idx_party_state_office_district ON representatives(party, state, office DESC, district)",
+    "CREATE INDEX IF NOT EXISTS idx_last_updated ON representatives(last_updated)",
+]
+
+# Single-column indexes superseded by QUERY_INDEXES
+LEGACY_INDEXES = ['idx_state', 'idx_district', 'idx_party']
+
+# Materialized counts per (state, party), kept current by triggers so
+# get_stats() never aggregates the representatives table at read time.
+# NULL state/party are stored as '' because they are part of the key.
+STATS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS representative_stats (
+        state TEXT NOT NULL,
+        party TEXT NOT NULL,
+        total INTEGER NOT NULL DEFAULT 0,
+        aipac_funded INTEGER NOT NULL DEFAULT 0,
+        war_industry_funded INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (state, party)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_stats_insert AFTER INSERT ON representatives
+    BEGIN
+        INSERT INTO representative_stats (state, party, total, aipac_funded, war_industry_funded)
+        VALUES (COALESCE(NEW.state, ''), COALESCE(NEW.party, ''), 1,
+                NEW.is_aipac_funded, NEW.is_war_industry_funded)
+        ON CONFLICT (state, party) DO UPDATE SET
+            total = total + 1,
+            aipac_funded = aipac_funded + excluded.aipac_funded,
+            war_industry_funded = war_industry_funded + excluded.war_industry_funded;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_stats_delete AFTER DELETE ON representatives
+    BEGIN
+        UPDATE representative_stats SET
+            total = total - 1,
+            aipac_funded = aipac_funded - OLD.is_aipac_funded,
+            war_industry_funded = war_industry_funded - OLD.is_war_industry_funded
+        WHERE state = COALESCE(OLD.state, '') AND party = COALESCE(OLD.party, '');
+        DELETE FROM representative_stats
+        WHERE state = COALESCE(OLD.state, '') AND party = COALESCE(OLD.party, '') AND total <= 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_stats_update
+    AFTER UPDATE OF state, party, aipac_cents, war_industry_cents ON representatives
+    WHEN OLD.state IS NOT NEW.state OR OLD.party IS NOT NEW.party
+        OR OLD.is_aipac_funded IS NOT NEW.is_aipac_funded
+        OR OLD.is_war_industry_funded IS NOT NEW.is_war_industry_funded
+    BEGIN
+        UPDATE representative_stats SET
+            total = total - 1,
+            aipac_funded = aipac_funded - OLD.is_aipac_funded,
+            war_industry_funded = war_industry_funded - OLD.is_war_industry_funded
+        WHERE state = COALESCE(OLD.state, '') AND party = COALESCE(OLD.party, '');
+        DELETE FROM representative_stats
+        WHERE state = COALESCE(OLD.state, '') AND party = COALESCE(OLD.party, '') AND total <= 0;
+        INSERT INTO representative_stats (state, party, total, aipac_funded, war_industry_funded)
+        VALUES (COALESCE(NEW.state, ''), COALESCE(NEW.party, ''), 1,
+                NEW.is_aipac_funded, NEW.is_war_industry_funded)
+        ON CONFLICT (state, party) DO UPDATE SET
+            total = total + 1,
+            aipac_funded = aipac_funded + excluded.aipac_funded,
+            war_industry_funded = war_industry_funded + excluded.war_industry_funded;
+    END
+    """,
+]
+
+# Generation counter of the representatives table, bumped by a trigger on
+# every row written. Snapshots, memoized searches, precomputed results and
+# API ETags are keyed on it; last_updated (CURRENT_TIMESTAMP) only has
+# one-second resolution, so two writes within a second would look alike.
+GENERATION_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS representative_generation (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        generation INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO representative_generation (id, generation) VALUES (1, 0)",
+] + [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_generation_{event.lower()} AFTER {event} ON representatives
+    BEGIN
+        UPDATE representative_generation SET generation = generation + 1 WHERE id = 1;
+    END
+    """
+    for event in ('INSERT', 'UPDATE', 'DELETE')
+]
+
+# Crosswalk from external IDs (FEC, GovTrack, OpenSecrets, ...) to bioguide IDs.
+# The (id_type, external_id) key serves every ID type; the second index
+# serves lookups from a member to their external IDs.
+CROSSWALK_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS member_ids (
+        id_type TEXT NOT NULL,
+        external_id TEXT NOT NULL,
+        bioguide_id TEXT NOT NULL,
+        PRIMARY KEY (id_type, external_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_member_ids_bioguide ON member_ids(bioguide_id, id_type)",
+]
+
+# Roll-call votes synced from the ProPublica Congress API (sync_votes.py).
+# member_votes repeats the vote date so a member's recent votes are one
+# backwards range scan of its primary key, with no sort and no join to
+# order by.
+VOTES_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS votes (
+        vote_id TEXT PRIMARY KEY,
+        congress INTEGER NOT NULL,
+        chamber TEXT NOT NULL,
+        session INTEGER NOT NULL,
+        roll_call INTEGER NOT NULL,
+        vote_date DATE NOT NULL,
+        vote_time TEXT,
+        question TEXT,
+        description TEXT,
+        result TEXT,
+        bill_id TEXT,
+        bill_title TEXT,
+        total_yes INTEGER,
+        total_no INTEGER,
+        total_not_voting INTEGER
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_votes_chamber_date ON votes(chamber, vote_date)",
+    """
+    CREATE TABLE IF NOT EXISTS member_votes (
+        bioguide_id TEXT NOT NULL,
+        vote_date DATE NOT NULL,
+        vote_id TEXT NOT NULL,
+        position TEXT,
+        PRIMARY KEY (bioguide_id, vote_date, vote_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_member_votes_vote ON member_votes(vote_id)",
+]
+
+VOTE_COLUMNS = [
+    'vote_id', 'congress', 'chamber', 'session', 'roll_call', 'vote_date', 'vote_time',
+    'question', 'description', 'result', 'bill_id', 'bill_title',
+    'total_yes', 'total_no', 'total_not_voting',
+]
+
+
+def vote_key(congress: int, chamber: str, session: int, roll_call: int) -> str:
+    """
+    Stable vote ID, e.g. '118-house-2-00527'. The padded roll call makes IDs
+    of one session sort in voting order, which orders same-day votes.
+    """
+    return f"{int(congress)}-{chamber.lower()}-{int(session)}-{int(roll_call):05d}"
+
+
+# Full-text search over names, seat, region, office address and social
+# handles. External-content FTS5 table (the text lives only in
+# representatives), kept in sync by triggers; the vocab table lists indexed
+# terms for typo-tolerant matching.
+FTS_COLUMNS = [
+    'first_name', 'middle_name', 'last_name', 'district', 'state', 'region',
+    'dc_office_address', 'twitter', 'facebook', 'instagram', 'tiktok',
+]
+
+# bm25 weight per FTS column: names rank above seat, region and address
+FTS_WEIGHTS = [10.0, 4.0, 10.0, 5.0, 2.0, 3.0, 1.0, 2.0, 2.0, 2.0, 2.0]
+
+FTS_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS representatives_fts USING fts5(
+        {', '.join(FTS_COLUMNS)},
+        content='representatives', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+    )
+    """,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS representatives_fts_vocab USING fts5vocab(representatives_fts, 'row')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_fts_insert AFTER INSERT ON representatives
+    BEGIN
+        INSERT INTO representatives_fts (rowid, {', '.join(FTS_COLUMNS)})
+        VALUES (NEW.id, {', '.join(f'NEW.{c}' for c in FTS_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_fts_delete AFTER DELETE ON representatives
+    BEGIN
+        INSERT INTO representatives_fts (representatives_fts, rowid, {', '.join(FTS_COLUMNS)})
+        VALUES ('delete', OLD.id, {', '.join(f'OLD.{c}' for c in FTS_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_fts_update AFTER UPDATE OF {', '.join(FTS_COLUMNS)} ON representatives
+    BEGIN
+        INSERT INTO representatives_fts (representatives_fts, rowid, {', '.join(FTS_COLUMNS)})
+        VALUES ('delete', OLD.id, {', '.join(f'OLD.{c}' for c in FTS_COLUMNS)});
+        INSERT INTO representatives_fts (rowid, {', '.join(FTS_COLUMNS)})
+        VALUES (NEW.id, {', '.join(f'NEW.{c}' for c in FTS_COLUMNS)});
+    END
+    """,
+]
+
+# Per-row triggers dropped during a first bulk load and rebuilt in one pass
+BULK_LOAD_TRIGGERS = ['trg_stats_insert', 'trg_fts_insert', 'trg_generation_insert']
+
+# ID columns of the congress-legislators CSV files
+# (https://github.com/unitedstates/congress-legislators) -> crosswalk id_type
+LEGISLATOR_ID_COLUMNS = {
+    'fec_ids': 'fec',
+    'govtrack_id': 'govtrack',
+    'opensecrets_id': 'opensecrets',
+    'thomas_id': 'thomas',
+    'lis_id': 'lis',
+    'cspan_id': 'cspan',
+    'votesmart_id': 'votesmart',
+    'icpsr_id': 'icpsr',
+    'ballotpedia_id': 'ballotpedia',
+    'wikipedia_id': 'wikipedia',
+}
+
+DEFAULT_LEGISLATORS_CSV = "data/legislators-current.csv"
+LEGISLATORS_URL = "https://unitedstates.github.io/congress-legislators/legislators-current.csv"
+
+# Table, index and trigger names in the schema statements, for schema_problems()
+SCHEMA_OBJECT = re.compile(r'CREATE\s+(?:VIRTUAL\s+)?(TABLE|INDEX|TRIGGER)\s+IF NOT EXISTS\s+(\w+)')
+
+# Plain columns added after the original schema, for ensure_schema()
+ADDED_COLUMNS = [
+    "end_current_term TEXT",
+    "next_primary_election TEXT",
+    "next_general_election TEXT",
+    "content_hash TEXT",
+]
+
+FUNDING_COLUMNS = {
+    'aipac': 'aipac_cents',
+    'war_industry': 'war_industry_cents',
+}
+
+
+DEFAULT_CSV = "data/FLORIDA_FEDERAL_OFFICIALS_COMPLETE.csv"
+
+# Map CSV columns to database columns
+CSV_COLUMNS = {
+    'Office': 'office',
+    'Last_Name': 'last_name',
+    'First_Name': 'first_name',
+    'Middle_Name': 'middle_name',
+    'District': 'district',
+    'Party': 'party',
+    'DC_Office_Address': 'dc_office_address',
+    'DC_Zip': 'dc_zip',
+    'DC_Phone': 'dc_phone',
+    'Website': 'website',
+    'Contact_Form': 'contact_form',
+    'Email': 'email',
+    'Facebook': 'facebook',
+    'Twitter_X': 'twitter',
+    'Instagram': 'instagram',
+    'TikTok': 'tiktok',
+    'Geographic_Region': 'region',
+    'AIPAC_Funded': 'aipac_cents',
+    'War_Industrial_Complex_Funded': 'war_industry_cents',
+    'End_Current_Term': 'end_current_term',
+    'Next_Primary_Election': 'next_primary_election',
+    'Next_General_Election': 'next_general_election',
+}
+
+# Accepted values of the aipac_funded / war_industry_funded filters
+FUNDED_FILTERS = ('All', 'Yes', 'No')
+
+# Keyset order of list queries; id breaks ties (senators share 'Statewide')
+# and is the rowid that every index already ends with
+LIST_ORDER_COLUMNS = ['state', 'office', 'district', 'id']
+LIST_ORDER = "state, office DESC, district, id"
+LIST_KEYSET = """
+    AND state >= ? AND (state > ? OR (office <= ? AND (office < ?
+        OR (district >= ? AND (district > ? OR id > ?)))))
+"""
+
+# Columns written by import_csv_data, in INSERT order
+# (bioguide_id and state first, content_hash of the other values last)
+IMPORT_COLUMNS = ['bioguide_id', 'state'] + list(CSV_COLUMNS.values()) + ['content_hash']
+
+
+def seat_key(office: str, state: str, district: str, last_name: str) -> str:
+    """
+    Crosswalk key for a seat: the district code for House members
+    ("FL-27"), state + last name for senators ("FL-SEN-SCOTT")
+    """
+    if office == 'U.S. House':
+        return district
+    return f"{state}-SEN-{(last_name or '').upper()}"
+
+
+def csv_record_builder(header: List[str], default_state: str = 'FL', seat_ids: Dict[str, str] = None,
+                       problems: List[str] = None):
+    """
+    Return a function converting one csv.reader row (list of strings, laid
+    out as `header`) into an IMPORT_COLUMNS tuple. Column positions are
+    resolved once per file instead of once per row.
+    bioguide_id comes from a Bioguide_ID column, else from seat_ids
+    (seat_key -> bioguide_id from the crosswalk), else a provisional
+    "LASTF-district" ID.
+    Unrecognized funding amounts are stored as NULL (funded, amount unknown)
+    and described in problems (see lenient_amount_cents), as are provisional IDs.
+    """
+    seat_ids = seat_ids or {}
+    problems = problems if problems is not None else []
+    positions = {column: header.index(h) if h in header else None for h, column in CSV_COLUMNS.items()}
+    state_position = header.index('State') if 'State' in header else None
+    bioguide_position = header.index('Bioguide_ID') if 'Bioguide_ID' in header else None
+    office_at = positions['office']
+    plain = [(IMPORT_COLUMNS.index(column), position) for column, position in positions.items()
+             if position is not None and column not in ('aipac_cents', 'war_industry_cents')]
+    aipac_at, war_at = positions['aipac_cents'], positions['war_industry_cents']
+    district_at, last_at, first_at = positions['district'], positions['last_name'], positions['first_name']
+    aipac_slot = IMPORT_COLUMNS.index('aipac_cents')
+    war_slot = IMPORT_COLUMNS.index('war_industry_cents')
+
+    def build(row: List[str]) -> tuple:
+        record = [None] * len(IMPORT_COLUMNS)
+        for slot, position in plain:
+            record[slot] = row[position] or None
+
+        # State comes from a State column when present, else from the district
+        # ("FL-01" -> "FL"); statewide senators fall back to default_state
+        district = row[district_at] if district_at is not None else ''
+        if state_position is not None and row[state_position]:
+            record[1] = row[state_position]
+        elif district and district != 'Statewide':
+            record[1] = district.split('-')[0]
+        else:
+            record[1] = default_state
+
+        last_name = row[last_at] if last_at is not None else ''
+        first_name = row[first_at] if first_at is not None else ''
+        if bioguide_position is not None and row[bioguide_position]:
+            record[0] = row[bioguide_position]
+        else:
+            office = row[office_at] if office_at is not None else ''
+            record[0] = seat_ids.get(seat_key(office, record[1], district, last_name))
+        if not record[0]:
+            # Provisional ID until the crosswalk knows this member
+            seat = district if district and district != 'Statewide' else record[1]
+            record[0] = f"{last_name.upper()}{first_name[:1].upper()}-{seat}"
+            problems.append(f"{record[0]}: not in the ID crosswalk, provisional bioguide_id")
+
+        # Funding display strings ("$12,345", "No") are stored as integer cents
+        for slot, position in ((aipac_slot, aipac_at), (war_slot, war_at)):
+            record[slot] = lenient_amount_cents(
+                row[position], problems, f"{record[0]} {header[position]}"
+            ) if position is not None else 0
+
+        record[-1] = hashlib.blake2b(repr(record[:-1]).encode(), digest_size=16).hexdigest()
+        return tuple(record)
+
+    return build
+
+
+def parse_amount_cents(value) -> Optional[int]:
+    """
+    Convert a CSV funding value to integer cents.
+    "No"/blank -> 0, "Yes" -> None (amount unknown), "$12,345" -> 1234500
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return 0
+    if isinstance(value, (int, float)):
+        return int(round(value * 100))
+
+    text = str(value).strip()
+    if not text or text.lower() == 'no':
+        return 0
+    if text.lower() == 'yes':
+        return None
+    return int(round(float(text.replace('$', '').replace(',', '')) * 100))
+
+
+def lenient_amount_cents(value, problems: List[str], label: str) -> Optional[int]:
+    """
+    parse_amount_cents for bulk updates: an unrecognized amount becomes
+    None (funded, amount unknown) and is described in problems instead of
+    aborting the whole import
+    """
+    try:
+        return parse_amount_cents(value)
+    except ValueError:
+        problems.append(f"{label}: unrecognized amount {value!r}, stored as unknown")
+        return None
+
+
+def report_problems(problems: List[str], limit: int = 20):
+    """Print the problems an import or update collected (the first `limit` of them)"""
+    if not problems:
+        return
+    print(f"[!] {len(problems)} problem(s) to review:")
+    for problem in problems[:limit]:
+        print(f"    {problem}")
+    if len(problems) > limit:
+        print(f"    ... and {len(problems) - limit} more")
+
+
+def format_cents(cents: Optional[int]) -> str:
+    """Render integer cents for display: 0 -> "No", None -> "Yes", else "$12,345" """
+    if cents is None or (isinstance(cents, float) and cents != cents):
+        return "Yes"
+    if cents == 0:
+        return "No"
+    return f"${int(cents) // 100:,}"
+
+
+def member_label(rep: Dict) -> str:
+    """Short display label, e.g. 'Maria Elvira Salazar (R) - FL-27'"""
+    name = ' '.join(part for part in (rep['first_name'], rep['middle_name'], rep['last_name']) if part)
+    party = f" ({rep['party'][0]})" if rep['party'] else ''
+    return f"{name}{party} - {rep['district']}"
+
+
+def search_terms(query: str) -> List[str]:
+    """Lowercase, accent-folded word tokens of a search query"""
+    folded = unicodedata.normalize('NFKD', query.lower())
+    folded = ''.join(ch for ch in folded if not unicodedata.combining(ch))
+    return re.findall(r'\w+', folded)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between a and b, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ch_a in enumerate(a, 1):
+        current = [i]
+        for j, ch_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ch_a != ch_b),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def connect_read_only(db_path: str, mmap_size: int = MMAP_SIZE) -> sqlite3.Connection:
+    """Open a read-only connection that may be handed between threads"""
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def encode_cursor(row: Dict) -> str:
+    """Opaque keyset cursor token for the row a page ended on"""
+    key = [row[column] for column in LIST_ORDER_COLUMNS]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> List:
+    """(state, office, district, id) from a cursor token"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if not isinstance(key, list) or len(key) != len(LIST_ORDER_COLUMNS):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return key
+
+
+class RepresentativePage:
+    """One page of a list query and the cursor for the page after it"""
+
+    def __init__(self, rows: List[Dict], next_cursor: Optional[str]):
+        self.rows = rows
+        self.next_cursor = next_cursor
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class ReadConnectionPool:
+    """
+    Checkout/return pool of read-only SQLite connections.
+    Each connection is used by one thread at a time, so Streamlit session
+    threads never share cursors on a single connection.
+    """
+
+    def __init__(self, db_path: str, size: int = 8, mmap_size: int = MMAP_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self.mmap_size = mmap_size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a new read-only connection"""
+        conn = connect_read_only(self.db_path, self.mmap_size)
+        with self._lock:
+            self._all.append(conn)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection, blocking while all `size` are in use"""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Close every connection opened by the pool"""
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            conn.close()
+        self._idle = queue.LifoQueue()
 
 
 class CongressDatabase:
     """Manages the SQLite database for congressional representatives"""
 
-    def __init__(self, db_path: str = "data/congress.db"):
+    def __init__(self, db_path: str = "data/congress.db", pool_size: int = 0):
+        """
+        pool_size=0 keeps the classic single connection opened by connect().
+        pool_size>0 serves queries from a pool of read-only connections;
+        writes then go through writer().
+        """
         self.db_path = db_path
         self.conn = None
+        self.pool = ReadConnectionPool(db_path, pool_size) if pool_size else None
+        self._columns = None
 
     def connect(self):
         """Establish database connection"""
@@ -26,17 +610,196 @@ class CongressDatabase:
         """Close database connection"""
         if self.conn:
             self.conn.close()
+        if self.pool:
+            self.pool.close()
+
+    @contextmanager
+    def _read(self):
+        """Yield a connection for read queries (pooled or the shared one)"""
+        if self.pool:
+            with self.pool.connection() as conn:
+                yield conn
+        else:
+            yield self.conn
+
+    @contextmanager
+    def writer(self):
+        """
+        Short-lived read/write connection for update scripts.
+        Commits on success, rolls back on error.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def ensure_schema(self):
+        """
+        Upgrade an existing database in place (safe to run repeatedly).
+        Also switches the file to WAL so readers never block on writers.
+        """
+        with self.writer() as conn:
+            columns = {row['name'] for row in conn.execute("PRAGMA table_xinfo(representatives)")}
+            if not columns:
+                return
+
+            # Display strings ("$12,345"/"No") -> integer cents + generated flags
+            if 'aipac_cents' not in columns:
+                conn.execute("ALTER TABLE representatives ADD COLUMN aipac_cents INTEGER DEFAULT 0")
+                conn.execute("ALTER TABLE representatives ADD COLUMN war_industry_cents INTEGER DEFAULT 0")
+                for column in FUNDING_FLAG_COLUMNS:
+                    conn.execute(f"ALTER TABLE representatives ADD COLUMN {column}")
+
+                if 'aipac_funded' in columns:
+                    rows = conn.execute("""
+                        SELECT id, aipac_funded, war_industrial_complex_funded
+                        FROM representatives
+                    """).fetchall()
+                    problems = []
+                    conn.executemany(
+                        "UPDATE representatives SET aipac_cents = ?, war_industry_cents = ? WHERE id = ?",
+                        [(lenient_amount_cents(r[1], problems, f"id {r[0]} aipac_funded"),
+                          lenient_amount_cents(r[2], problems, f"id {r[0]} war_industrial_complex_funded"), r[0])
+                         for r in rows]
+                    )
+                    report_problems(problems)
+                    conn.execute("DROP INDEX IF EXISTS idx_aipac")
+                    conn.execute("DROP INDEX IF EXISTS idx_war_industry")
+                    conn.execute("ALTER TABLE representatives DROP COLUMN aipac_funded")
+                    conn.execute("ALTER TABLE representatives DROP COLUMN war_industrial_complex_funded")
+                print("[OK] Migrated funding columns to integer cents")
+
+            for column in ADDED_COLUMNS:
+                if column.split()[0] not in columns:
+                    conn.execute(f"ALTER TABLE representatives ADD COLUMN {column}")
+
+            for index in LEGACY_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {index}")
+            for statement in QUERY_INDEXES + FUNDING_INDEXES:
+                conn.execute(statement)
+
+            for statement in CROSSWALK_SCHEMA + VOTES_SCHEMA:
+                conn.execute(statement)
+
+            for statement in GENERATION_SCHEMA:
+                conn.execute(statement)
+
+            # Materialized stats table + triggers
+            has_stats = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'representative_stats'"
+            ).fetchone()
+            for statement in STATS_SCHEMA:
+                conn.execute(statement)
+            if not has_stats:
+                self.refresh_stats(conn)
+
+            # Full-text index + sync triggers
+            has_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'representatives_fts'"
+            ).fetchone()
+            for statement in FTS_SCHEMA:
+                conn.execute(statement)
+            if not has_fts:
+                self.rebuild_search_index(conn)
+
+    def schema_problems(self) -> List[str]:
+        """
+        What ensure_schema() would still have to change, checked over a
+        read-only connection (empty when the database is current)
+        """
+        if not Path(self.db_path).exists():
+            return [f"no database at {self.db_path}"]
+
+        conn = connect_read_only(self.db_path)
+        try:
+            columns = {row['name'] for row in conn.execute("PRAGMA table_xinfo(representatives)")}
+            if not columns:
+                return ["no representatives table"]
+            present = {tuple(row) for row in conn.execute("SELECT type, name FROM sqlite_master")}
+        finally:
+            conn.close()
+
+        problems = []
+        if 'aipac_funded' in columns or 'aipac_cents' not in columns:
+            problems.append("funding stored as text, not integer cents")
+        for column in FUNDING_FLAG_COLUMNS + ADDED_COLUMNS:
+            if column.split()[0] not in columns:
+                problems.append(f"column {column.split()[0]} missing")
+        statements = (QUERY_INDEXES + FUNDING_INDEXES + CROSSWALK_SCHEMA + VOTES_SCHEMA
+                      + GENERATION_SCHEMA + STATS_SCHEMA + FTS_SCHEMA)
+        for statement in statements:
+            created = SCHEMA_OBJECT.search(statement)
+            if created and (created[1].lower(), created[2]) not in present:
+                problems.append(f"{created[1].lower()} {created[2]} missing")
+        return problems
+
+    def require_current_schema(self):
+        """
+        Raise RuntimeError unless the database exists with the current schema.
+        For read-only callers (app, API), which must not migrate the file.
+        """
+        problems = self.schema_problems()
+        if not problems:
+            return
+        if not Path(self.db_path).exists():
+            raise RuntimeError(f"No database at {self.db_path}; create it with: python utils/database.py")
+        shown = ', '.join(problems[:3]) + (f" and {len(problems) - 3} more" if len(problems) > 3 else '')
+        raise RuntimeError(f"{self.db_path} needs a schema upgrade ({shown}); "
+                           f"run: python utils/database.py --upgrade")
+
+    def refresh_stats(self, conn: sqlite3.Connection = None):
+        """
+        Rebuild representative_stats with one aggregate pass.
+        Triggers keep it current afterwards; this is only needed after bulk
+        changes made with triggers disabled or when the table is first created.
+        """
+        if conn is None:
+            with self.writer() as conn:
+                return self.refresh_stats(conn)
+
+        conn.execute("DELETE FROM representative_stats")
+        conn.execute("""
+            INSERT INTO representative_stats (state, party, total, aipac_funded, war_industry_funded)
+            SELECT COALESCE(state, ''), COALESCE(party, ''), COUNT(*),
+                   SUM(is_aipac_funded), SUM(is_war_industry_funded)
+            FROM representatives
+            GROUP BY 1, 2
+        """)
+
+    def rebuild_search_index(self, conn: sqlite3.Connection = None):
+        """
+        Rebuild the full-text index from the representatives table and set
+        its ranking weights. Only needed after bulk loads with the FTS
+        triggers disabled or when the index is first created.
+        """
+        if conn is None:
+            with self.writer() as conn:
+                return self.rebuild_search_index(conn)
+
+        conn.execute("INSERT INTO representatives_fts (representatives_fts) VALUES ('rebuild')")
+        conn.execute(
+            "INSERT INTO representatives_fts (representatives_fts, rank) VALUES ('rank', ?)",
+            (f"bm25({', '.join(str(w) for w in FTS_WEIGHTS)})",)
+        )
 
     def create_tables(self):
-        """Create database tables with full schema"""
+        """
+        Create database tables with full schema if they do not exist yet.
+        Existing data is kept; import_csv_data() upserts into it.
+        """
         cursor = self.conn.cursor()
-
-        # Drop existing table if it exists (for development)
-        cursor.execute("DROP TABLE IF EXISTS representatives")
+        cursor.execute("PRAGMA journal_mode = WAL")
 
         # Create representatives table
         cursor.execute("""
-            CREATE TABLE representatives (
+            CREATE TABLE IF NOT EXISTS representatives (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 bioguide_id TEXT UNIQUE,
                 first_name TEXT,
@@ -57,117 +820,328 @@ class CongressDatabase:
                 twitter TEXT,
                 instagram TEXT,
                 tiktok TEXT,
-                aipac_funded TEXT DEFAULT 'No',
-                war_industrial_complex_funded TEXT DEFAULT 'No',
+                aipac_cents INTEGER DEFAULT 0,
+                war_industry_cents INTEGER DEFAULT 0,
+                is_aipac_funded INTEGER GENERATED ALWAYS AS (aipac_cents IS NOT 0) VIRTUAL,
+                is_war_industry_funded INTEGER GENERATED ALWAYS AS (war_industry_cents IS NOT 0) VIRTUAL,
                 photo_url TEXT,
                 in_office_since DATE,
+                end_current_term TEXT,
+                next_primary_election TEXT,
+                next_general_election TEXT,
+                content_hash TEXT,
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 data_verified BOOLEAN DEFAULT FALSE
             )
         """)
 
-        # Create indexes for fast querying
-        cursor.execute("CREATE INDEX idx_state ON representatives(state)")
-        cursor.execute("CREATE INDEX idx_district ON representatives(district)")
-        cursor.execute("CREATE INDEX idx_party ON representatives(party)")
-        cursor.execute("CREATE INDEX idx_aipac ON representatives(aipac_funded)")
-        cursor.execute("CREATE INDEX idx_war_industry ON representatives(war_industrial_complex_funded)")
-
         self.conn.commit()
-        print("[OK] Database tables created successfully")
 
-    def import_csv_data(self, csv_path: str = "data/FLORIDA_FEDERAL_OFFICIALS_COMPLETE.csv"):
-        """Import data from CSV file into database"""
-        # Read CSV
-        df = pd.read_csv(csv_path)
-
-        # Map CSV columns to database columns
-        column_mapping = {
-            'Office': 'office',
-            'Last_Name': 'last_name',
-            'First_Name': 'first_name',
-            'Middle_Name': 'middle_name',
-            'District': 'district',
-            'Party': 'party',
-            'DC_Office_Address': 'dc_office_address',
-            'DC_Zip': 'dc_zip',
-            'DC_Phone': 'dc_phone',
-            'Website': 'website',
-            'Contact_Form': 'contact_form',
-            'Email': 'email',
-            'Facebook': 'facebook',
-            'Twitter_X': 'twitter',
-            'Instagram': 'instagram',
-            'TikTok': 'tiktok',
-            'Geographic_Region': 'region',
-            'AIPAC_Funded': 'aipac_funded',
-            'War_Industrial_Complex_Funded': 'war_industrial_complex_funded'
-        }
+        # Upgrade older databases, then create indexes, stats and triggers
+        self.ensure_schema()
+        print("[OK] Database tables created successfully")
 
-        # Rename columns
-        df_renamed = df.rename(columns=column_mapping)
+    def import_csv_data(
+        self,
+        csv_paths: Union[str, Iterable[str]] = DEFAULT_CSV,
+        chunk_size: int = 5000,
+        default_state: str = 'FL',
+        delete_missing: bool = True
+    ) -> int:
+        """
+        Stream one or more state CSV files into the database as an upsert.
+        Rows are keyed on bioguide_id and carry a content hash: unchanged
+        rows are not written, changed rows are updated (bumping last_updated)
+        and, with delete_missing, members of the imported states who are no
+        longer in the files are removed. Everything runs in one transaction
+        with chunked executemany, so memory stays bounded.
+        Returns the number of rows read.
+        """
+        if isinstance(csv_paths, (str, Path)):
+            csv_paths = [csv_paths]
 
-        # Add state column (extract from district or set to FL for senators)
-        df_renamed['state'] = df_renamed['district'].apply(
-            lambda x: 'FL' if pd.isna(x) or x == 'Statewide' else x.split('-')[0]
+        updates = ', '.join(
+            f"{column} = excluded.{column}" for column in IMPORT_COLUMNS if column != 'bioguide_id'
         )
+        upsert_sql = f"""
+            INSERT INTO representatives ({', '.join(IMPORT_COLUMNS)})
+            VALUES ({', '.join('?' for _ in IMPORT_COLUMNS)})
+            ON CONFLICT (bioguide_id) DO UPDATE SET {updates}, last_updated = CURRENT_TIMESTAMP
+            WHERE content_hash IS NOT excluded.content_hash
+        """
 
-        # Generate simple bioguide_id (for now, use last_name + first initial)
-        df_renamed['bioguide_id'] = (
-            df_renamed['last_name'].str.upper() +
-            df_renamed['first_name'].str[0].str.upper()
-        )
+        count = written = 0
+        problems: List[str] = []
+        start = time.perf_counter()
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            existing = cursor.execute("SELECT COUNT(*) FROM representatives").fetchone()[0]
 
-        # Select and order columns for database
-        db_columns = [
-            'bioguide_id', 'first_name', 'middle_name', 'last_name',
-            'office', 'state', 'district', 'party', 'region',
-            'dc_office_address', 'dc_zip', 'dc_phone',
-            'website', 'contact_form', 'email',
-            'facebook', 'twitter', 'instagram', 'tiktok',
-            'aipac_funded', 'war_industrial_complex_funded'
-        ]
+            # A first load rebuilds stats and the search index in one pass
+            # instead of per row
+            if existing == 0:
+                for trigger in BULK_LOAD_TRIGGERS:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
 
-        df_final = df_renamed[db_columns]
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS import_seen (
+                    bioguide_id TEXT PRIMARY KEY, state TEXT
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("DELETE FROM temp.import_seen")
 
-        # Insert into database
-        df_final.to_sql('representatives', self.conn, if_exists='append', index=False)
+            seat_ids = dict(cursor.execute(
+                "SELECT external_id, bioguide_id FROM member_ids WHERE id_type = 'seat'"
+            ).fetchall())
 
-        self.conn.commit()
-        print(f"[OK] Imported {len(df_final)} representatives into database")
+            for csv_path in csv_paths:
+                with open(csv_path, newline='', encoding='utf-8') as f:
+                    reader = csv.reader(f)
+                    build = csv_record_builder(next(reader), default_state, seat_ids, problems)
+                    records = map(build, reader)
+                    while True:
+                        chunk = list(islice(records, chunk_size))
+                        if not chunk:
+                            break
+                        cursor.executemany(upsert_sql, chunk)
+                        written += cursor.rowcount
+                        cursor.executemany(
+                            "INSERT OR IGNORE INTO temp.import_seen VALUES (?, ?)",
+                            [record[:2] for record in chunk]
+                        )
+                        count += len(chunk)
+
+            added = cursor.execute("SELECT COUNT(*) FROM representatives").fetchone()[0] - existing
+
+            removed = 0
+            if delete_missing:
+                cursor.execute("""
+                    DELETE FROM representatives
+                    WHERE state IN (SELECT DISTINCT state FROM temp.import_seen)
+                      AND bioguide_id NOT IN (SELECT bioguide_id FROM temp.import_seen)
+                """)
+                removed = cursor.rowcount
+
+            if existing == 0:
+                for statement in GENERATION_SCHEMA + STATS_SCHEMA + FTS_SCHEMA:
+                    cursor.execute(statement)
+                cursor.execute("UPDATE representative_generation SET generation = generation + 1 WHERE id = 1")
+                self.refresh_stats(self.conn)
+                self.rebuild_search_index(self.conn)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else 0
+        updated = written - added
+        print(f"[OK] Imported {count} representatives into database ({rate:,.0f} rows/sec): "
+              f"{added} added, {updated} updated, {count - added - updated} unchanged, {removed} removed")
+        report_problems(problems)
+
+        return count
+
+    def import_id_crosswalk(self, csv_paths: Union[str, Iterable[str]] = DEFAULT_LEGISLATORS_CSV) -> int:
+        """
+        Load external member IDs from congress-legislators CSV files
+        (legislators-current.csv, legislators-historical.csv) into member_ids.
+        Besides the ID columns, each member's seat is stored (id_type 'seat')
+        so import_csv_data() can assign real bioguide IDs, and the bioguide
+        ID is stored as the ProPublica member ID.
+        Returns the number of (id_type, external_id) pairs written.
+        """
+        if isinstance(csv_paths, (str, Path)):
+            csv_paths = [csv_paths]
+        missing = [str(path) for path in csv_paths if not Path(path).exists()]
+        if missing:
+            raise FileNotFoundError(
+                f"ID crosswalk not found: {', '.join(missing)}. "
+                f"Download it with fetch_legislators_csv() or from {LEGISLATORS_URL}"
+            )
+
+        pairs = []
+        for csv_path in csv_paths:
+            with open(csv_path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    bioguide_id = row.get('bioguide_id')
+                    if not bioguide_id:
+                        continue
+
+                    pairs.append(('propublica', bioguide_id, bioguide_id))
+                    for column, id_type in LEGISLATOR_ID_COLUMNS.items():
+                        for external_id in (row.get(column) or '').split(','):
+                            if external_id.strip():
+                                pairs.append((id_type, external_id.strip(), bioguide_id))
+
+                    if row.get('type') == 'rep':
+                        district = int(row['district'] or 0)
+                        seat = f"{row['state']}-{district:02d}" if district else f"{row['state']}-AL"
+                        pairs.append(('seat', seat, bioguide_id))
+                    elif row.get('type') == 'sen':
+                        pairs.append(('seat', seat_key('U.S. Senate', row['state'], None, row['last_name']), bioguide_id))
+
+        with self.writer() as conn:
+            for statement in CROSSWALK_SCHEMA:
+                conn.execute(statement)
+            conn.executemany(
+                "INSERT OR REPLACE INTO member_ids (id_type, external_id, bioguide_id) VALUES (?, ?, ?)",
+                pairs
+            )
 
-        return len(df_final)
+        print(f"[OK] Loaded {len(pairs)} external IDs into the crosswalk")
+        return len(pairs)
+
+    def get_id_map(self, id_type: str) -> Dict[str, str]:
+        """All external IDs of one type as {external_id: bioguide_id}, for hash joins"""
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT external_id, bioguide_id FROM member_ids WHERE id_type = ?", (id_type,)
+            ).fetchall()
+        return {external_id: bioguide_id for external_id, bioguide_id in rows}
+
+    def get_bioguide_id(self, id_type: str, external_id: str) -> Optional[str]:
+        """Bioguide ID for one external ID (e.g., 'fec', 'H8FL27095')"""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT bioguide_id FROM member_ids WHERE id_type = ? AND external_id = ?",
+                (id_type, external_id)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_external_ids(self, bioguide_id: str) -> Dict[str, List[str]]:
+        """Every external ID of a member, grouped by id_type"""
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT id_type, external_id FROM member_ids WHERE bioguide_id = ? ORDER BY id_type",
+                (bioguide_id,)
+            ).fetchall()
+        ids = {}
+        for id_type, external_id in rows:
+            ids.setdefault(id_type, []).append(external_id)
+        return ids
+
+    def store_votes(self, votes: Iterable[Dict], positions: Iterable[tuple]) -> int:
+        """
+        Upsert roll-call votes (dicts keyed by VOTE_COLUMNS) and member
+        positions ((bioguide_id, vote_id, position) tuples) in one transaction.
+        Returns the number of votes written.
+        """
+        votes = list(votes)
+        dates = {vote['vote_id']: vote['vote_date'] for vote in votes}
+        placeholders = ', '.join('?' * len(VOTE_COLUMNS))
+        with self.writer() as conn:
+            for statement in VOTES_SCHEMA:
+                conn.execute(statement)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO votes ({', '.join(VOTE_COLUMNS)}) VALUES ({placeholders})",
+                [tuple(vote.get(column) for column in VOTE_COLUMNS) for vote in votes]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO member_votes (bioguide_id, vote_date, vote_id, position) VALUES (?, ?, ?, ?)",
+                [(bioguide_id, dates[vote_id], vote_id, position)
+                 for bioguide_id, vote_id, position in positions if vote_id in dates]
+            )
+        return len(votes)
+
+    def latest_vote_date(self, chamber: str) -> Optional[str]:
+        """Date (YYYY-MM-DD) of the newest stored vote of a chamber, or None"""
+        with self._read() as conn:
+            try:
+                row = conn.execute(
+                    "SELECT MAX(vote_date) FROM votes WHERE chamber = ?", (chamber.lower(),)
+                ).fetchone()
+            except sqlite3.OperationalError:  # votes table not created yet
+                return None
+        return row[0] if row else None
+
+    def get_vote_ids(self, chamber: str, since: str) -> set:
+        """IDs of the stored votes of a chamber on or after a date"""
+        with self._read() as conn:
+            try:
+                rows = conn.execute(
+                    "SELECT vote_id FROM votes WHERE chamber = ? AND vote_date >= ?", (chamber.lower(), since)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                return set()
+        return {row[0] for row in rows}
+
+    def get_recent_votes(self, bioguide_id: str, limit: int = 3) -> List[Dict]:
+        """A member's most recent roll-call votes with their position, newest first"""
+        with self._read() as conn:
+            try:
+                rows = conn.execute("""
+                    SELECT v.*, mv.position
+                    FROM member_votes mv
+                    JOIN votes v ON v.vote_id = mv.vote_id
+                    WHERE mv.bioguide_id = ?
+                    ORDER BY mv.vote_date DESC, mv.vote_id DESC
+                    LIMIT ?
+                """, (bioguide_id, limit)).fetchall()
+            except sqlite3.OperationalError:  # no votes synced into this database
+                return []
+        return [dict(row) for row in rows]
 
     def get_representative_by_district(self, district: str) -> Optional[Dict]:
         """Get representative by district code (e.g., 'FL-01')"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM representatives
-            WHERE district = ? AND office = 'U.S. House'
-        """, (district,))
+        with self._read() as conn:
+            row = conn.execute("""
+                SELECT * FROM representatives
+                WHERE district = ? AND office = 'U.S. House'
+            """, (district,)).fetchone()
 
-        row = cursor.fetchone()
         return dict(row) if row else None
 
     def get_senators_by_state(self, state: str = 'FL') -> List[Dict]:
         """Get both senators for a state"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM representatives
-            WHERE state = ? AND office = 'U.S. Senate'
-            ORDER BY last_name
-        """, (state,))
+        with self._read() as conn:
+            rows = conn.execute("""
+                SELECT * FROM representatives
+                WHERE state = ? AND office = 'U.S. Senate'
+                ORDER BY last_name
+            """, (state,)).fetchall()
 
-        rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
-    def get_all_representatives(self, state: str = None, party: str = None) -> List[Dict]:
-        """Get all representatives with optional filters"""
-        cursor = self.conn.cursor()
+    def _projection(self, columns: Optional[Sequence[str]], extra: Sequence[str] = ()) -> str:
+        """
+        SELECT list for a column projection (None = every column), checked
+        against the table so column names are never taken from user input.
+        Call it before checking out a connection: the first call checks out
+        one itself, which would wait forever on an exhausted pool.
+        """
+        if columns is None:
+            return '*'
+        if self._columns is None:
+            with self._read() as conn:
+                self._columns = {row['name'] for row in conn.execute("PRAGMA table_xinfo(representatives)")}
+        unknown = set(columns) - self._columns
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+        return ', '.join(dict.fromkeys(list(columns) + list(extra)))
 
-        query = "SELECT * FROM representatives WHERE 1=1"
+    def _filter_clause(
+        self,
+        state: str = None,
+        party: str = None,
+        office: str = None,
+        aipac_funded: str = None,
+        war_industry_funded: str = None,
+        aipac_min_cents: int = None,
+        war_industry_min_cents: int = None
+    ):
+        """
+        WHERE conditions (' AND ...') and parameters shared by the list queries.
+        Raises ValueError for a funded filter outside FUNDED_FILTERS.
+        """
+        query = ""
         params = []
 
+        for name, value in (('aipac_funded', aipac_funded), ('war_industry_funded', war_industry_funded)):
+            if value and value not in FUNDED_FILTERS:
+                raise ValueError(f"{name} must be one of {', '.join(FUNDED_FILTERS)}, not {value!r}")
+
         if state:
             query += " AND state = ?"
             params.append(state)
@@ -176,92 +1150,328 @@ class CongressDatabase:
             query += " AND party = ?"
             params.append(party)
 
-        query += " ORDER BY state, office DESC, district"
+        if office:
+            query += " AND office = ?"
+            params.append(office)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+        if aipac_funded and aipac_funded != "All":
+            if aipac_funded == "Yes":
+                query += " AND is_aipac_funded"
+            else:
+                query += " AND NOT is_aipac_funded"
+
+        if war_industry_funded and war_industry_funded != "All":
+            if war_industry_funded == "Yes":
+                query += " AND is_war_industry_funded"
+            else:
+                query += " AND NOT is_war_industry_funded"
+
+        # Range filters repeat the flag so SQLite can use the partial index
+        if aipac_min_cents is not None:
+            query += " AND is_aipac_funded AND aipac_cents >= ?"
+            params.append(aipac_min_cents)
+
+        if war_industry_min_cents is not None:
+            query += " AND is_war_industry_funded AND war_industry_cents >= ?"
+            params.append(war_industry_min_cents)
+
+        return query, params
+
+    def get_representative(self, bioguide_id: str, columns: Sequence[str] = None) -> Optional[Dict]:
+        """Get one representative by bioguide ID"""
+        query = f"SELECT {self._projection(columns)} FROM representatives WHERE bioguide_id = ?"
+        with self._read() as conn:
+            row = conn.execute(query, (bioguide_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_all_representatives(self, state: str = None, party: str = None, columns: Sequence[str] = None) -> List[Dict]:
+        """Get all representatives with optional filters (and optional column projection)"""
+        return self.search_representatives(state=state, party=party, columns=columns)
 
     def search_representatives(
         self,
         state: str = None,
         party: str = None,
         aipac_funded: str = None,
-        war_industry_funded: str = None
+        war_industry_funded: str = None,
+        aipac_min_cents: int = None,
+        war_industry_min_cents: int = None,
+        office: str = None,
+        columns: Sequence[str] = None
     ) -> List[Dict]:
-        """Advanced search with multiple filters"""
-        cursor = self.conn.cursor()
+        """
+        Advanced search with multiple filters
+        *_min_cents restrict to members funded at least that amount
+        (e.g., aipac_min_cents=5_000_000 for "over $50k").
+        columns limits the fields returned (e.g., ['last_name', 'district']).
+        """
+        where, params = self._filter_clause(
+            state, party, office, aipac_funded, war_industry_funded,
+            aipac_min_cents, war_industry_min_cents
+        )
+        query = f"""
+            SELECT {self._projection(columns)} FROM representatives
+            WHERE 1=1{where}
+            ORDER BY state, office DESC, district
+        """
 
-        query = "SELECT * FROM representatives WHERE 1=1"
-        params = []
+        with self._read() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_representatives(
+        self,
+        columns: Sequence[str] = None,
+        limit: int = 50,
+        cursor: str = None,
+        **filters
+    ) -> RepresentativePage:
+        """
+        One page of representatives in list order, using keyset pagination:
+        pass page.next_cursor back as `cursor` for the next page. Each page
+        is a bounded index range scan, however deep into the list it is.
+        Filters are those of search_representatives.
+        """
+        where, params = self._filter_clause(**filters)
+        if cursor:
+            state, office, district, row_id = decode_cursor(cursor)
+            where += LIST_KEYSET
+            params += [state, state, office, office, district, district, row_id]
+
+        query = f"""
+            SELECT {self._projection(columns, LIST_ORDER_COLUMNS)} FROM representatives
+            WHERE 1=1{where}
+            ORDER BY {LIST_ORDER}
+            LIMIT ?
+        """
+        params.append(limit + 1)
+
+        with self._read() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        rows = rows[:limit]
+        if columns is None:
+            return RepresentativePage([dict(row) for row in rows], next_cursor)
+        return RepresentativePage(
+            [{column: row[column] for column in columns} for row in rows], next_cursor
+        )
+
+    def iter_representatives(
+        self,
+        columns: Sequence[str] = None,
+        page_size: int = 500,
+        **filters
+    ) -> Iterator[Dict]:
+        """
+        Stream every matching representative page by page, so callers never
+        hold more than page_size rows (and no connection between pages)
+        """
+        cursor = None
+        while True:
+            page = self.list_representatives(columns, page_size, cursor, **filters)
+            yield from page.rows
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
 
+    def count_representatives(self, **filters) -> int:
+        """Number of representatives matching the search_representatives filters"""
+        where, params = self._filter_clause(**filters)
+        with self._read() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM representatives WHERE 1=1{where}", params).fetchone()[0]
+
+    def top_funded(self, source: str = 'aipac', limit: int = 5, state: str = None) -> List[Dict]:
+        """
+        Members with the largest recorded amounts from a funding source
+        ('aipac' or 'war_industry'), ranked in SQL on the partial index
+        """
+        column = FUNDING_COLUMNS[source]
+        flag = f"is_{source}_funded"
+
+        query = f"SELECT * FROM representatives WHERE {flag} AND {column} > 0"
+        params = []
         if state:
-            query += " AND state = ?"
+            # Unary + keeps SQLite walking the funding index in amount order
+            # instead of using a state index and sorting
+            query += " AND +state = ?"
             params.append(state)
+        query += f" ORDER BY {column} DESC LIMIT ?"
+        params.append(limit)
 
-        if party:
-            query += " AND party = ?"
-            params.append(party)
+        with self._read() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
 
-        if aipac_funded and aipac_funded != "All":
-            if aipac_funded == "Yes":
-                query += " AND aipac_funded != 'No'"
-            else:
-                query += " AND aipac_funded = 'No'"
+    def _match_expression(self, conn: sqlite3.Connection, query: str) -> Optional[str]:
+        """
+        FTS5 MATCH expression for a user query, or None if a word matches nothing.
+        Each word matches as a prefix; a word that is no prefix of any indexed
+        term is replaced by the indexed terms within one or two edits of it.
+        """
+        groups = []
+        for term in search_terms(query):
+            has_prefix = conn.execute(
+                "SELECT 1 FROM representatives_fts_vocab WHERE term >= ? AND term < ? LIMIT 1",
+                (term, term + '\U0010ffff')
+            ).fetchone()
+            if has_prefix:
+                groups.append(f'"{term}"*')
+                continue
 
-        if war_industry_funded and war_industry_funded != "All":
-            if war_industry_funded == "Yes":
-                query += " AND war_industrial_complex_funded != 'No'"
-            else:
-                query += " AND war_industrial_complex_funded = 'No'"
+            candidates = self._similar_terms(conn, term)
+            if not candidates:
+                return None
+            groups.append('(' + ' OR '.join(f'"{candidate}"' for candidate in candidates) + ')')
+
+        return ' AND '.join(groups) or None
+
+    def _similar_terms(self, conn: sqlite3.Connection, term: str, max_terms: int = 5) -> List[str]:
+        """
+        Indexed terms sharing the first letter of `term` and at most one edit
+        away (two for words over five letters), comparing both the whole term
+        and its prefix so half-typed words still match. Most common first.
+        """
+        if len(term) < 3 or not term.isalpha():
+            return []
+        limit = 1 if len(term) <= 5 else 2
+
+        rows = conn.execute(
+            "SELECT term, doc FROM representatives_fts_vocab WHERE term >= ? AND term < ?",
+            (term[0], chr(ord(term[0]) + 1))
+        ).fetchall()
+
+        scored = []
+        for candidate, docs in rows:
+            distance = min(
+                edit_distance(term, candidate, limit),
+                edit_distance(term, candidate[:len(term)], limit),
+            )
+            if distance <= limit:
+                scored.append((distance, -docs, candidate))
+        return [candidate for _, _, candidate in sorted(scored)[:max_terms]]
 
-        query += " ORDER BY state, office DESC, district"
+    def _ranked_matches(self, columns: str, query: str, limit: int, state: str = None) -> List[Dict]:
+        """Run a ranked full-text query, selecting `columns` of representatives r"""
+        with self._read() as conn:
+            expression = self._match_expression(conn, query)
+            if expression is None:
+                return []
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+            sql = f"""
+                SELECT {columns}
+                FROM representatives_fts f
+                JOIN representatives r ON r.id = f.rowid
+                WHERE representatives_fts MATCH ?
+            """
+            params = [expression]
+            if state:
+                sql += " AND r.state = ?"
+                params.append(state)
+            sql += " ORDER BY f.rank LIMIT ?"
+            params.append(limit)
+
+            rows = conn.execute(sql, params).fetchall()
         return [dict(row) for row in rows]
 
+    def search_text(self, query: str, limit: int = 10, state: str = None) -> List[Dict]:
+        """
+        Ranked full-text search over names, district, state, region, DC office
+        address and social handles (e.g., 'salazar', 'mar sal', 'FL-27',
+        'doral', 'salazr'). Words match as prefixes and tolerate small typos;
+        best matches first.
+        """
+        return self._ranked_matches('r.*', query, limit, state)
+
+    def autocomplete(self, query: str, limit: int = 8, state: str = None) -> List[Dict]:
+        """
+        Lightweight suggestions for a partially typed query:
+        [{'bioguide_id': ..., 'label': 'Maria Elvira Salazar (R) - FL-27'}, ...]
+        """
+        rows = self._ranked_matches(
+            "r.bioguide_id, r.first_name, r.middle_name, r.last_name, r.party, r.district",
+            query, limit, state
+        )
+        return [{'bioguide_id': row['bioguide_id'], 'label': member_label(row)} for row in rows]
+
     def get_stats(self) -> Dict:
-        """Get database statistics"""
-        cursor = self.conn.cursor()
+        """Get database statistics (read from the materialized stats table)"""
+        with self._read() as conn:
+            rows = conn.execute("""
+                SELECT state, party, total, aipac_funded, war_industry_funded
+                FROM representative_stats
+            """).fetchall()
 
-        stats = {}
+        stats = {
+            'total': 0,
+            'by_party': {},
+            'by_state': {},
+            'aipac_funded_count': 0,
+            'war_industry_funded_count': 0,
+        }
+        for state, party, total, aipac, war_industry in rows:
+            state, party = state or None, party or None
+            stats['total'] += total
+            stats['by_party'][party] = stats['by_party'].get(party, 0) + total
+            stats['by_state'][state] = stats['by_state'].get(state, 0) + total
+            stats['aipac_funded_count'] += aipac
+            stats['war_industry_funded_count'] += war_industry
 
-        # Total representatives
-        cursor.execute("SELECT COUNT(*) FROM representatives")
-        stats['total'] = cursor.fetchone()[0]
+        return stats
 
-        # By party
-        cursor.execute("""
-            SELECT party, COUNT(*) as count
-            FROM representatives
-            GROUP BY party
-        """)
-        stats['by_party'] = {row[0]: row[1] for row in cursor.fetchall()}
+    def get_stats_breakdown(self, group_by: str = 'state', state: str = None) -> Dict:
+        """
+        Counts per state, party or (state, party), e.g.
+        {'FL': {'total': 30, 'aipac_funded': 25, 'war_industry_funded': 25}}
+        """
+        key_of = {
+            'state': lambda state, party: state,
+            'party': lambda state, party: party,
+            'state_party': lambda state, party: (state, party),
+        }[group_by]
 
-        # By state
-        cursor.execute("""
-            SELECT state, COUNT(*) as count
-            FROM representatives
-            GROUP BY state
-        """)
-        stats['by_state'] = {row[0]: row[1] for row in cursor.fetchall()}
+        query = """
+            SELECT state, party, total, aipac_funded, war_industry_funded
+            FROM representative_stats
+        """
+        params = []
+        if state:
+            query += " WHERE state = ?"
+            params.append(state)
 
-        # AIPAC funded count
-        cursor.execute("""
-            SELECT COUNT(*) FROM representatives
-            WHERE aipac_funded != 'No'
-        """)
-        stats['aipac_funded_count'] = cursor.fetchone()[0]
+        with self._read() as conn:
+            rows = conn.execute(query, params).fetchall()
 
-        # War industry funded count
-        cursor.execute("""
-            SELECT COUNT(*) FROM representatives
-            WHERE war_industrial_complex_funded != 'No'
-        """)
-        stats['war_industry_funded_count'] = cursor.fetchone()[0]
+        breakdown = {}
+        for row_state, row_party, total, aipac, war_industry in rows:
+            key = key_of(row_state or None, row_party or None)
+            counts = breakdown.setdefault(key, {'total': 0, 'aipac_funded': 0, 'war_industry_funded': 0})
+            counts['total'] += total
+            counts['aipac_funded'] += aipac
+            counts['war_industry_funded'] += war_industry
+        return breakdown
 
-        return stats
+
+def fetch_legislators_csv(path: str = DEFAULT_LEGISLATORS_CSV, url: str = LEGISLATORS_URL) -> str:
+    """
+    Download the congress-legislators current members file (the ID
+    crosswalk source) to path. Raises RuntimeError when it cannot be fetched.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(target.name + '.tmp')
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            tmp_path.write_bytes(response.read())
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        raise RuntimeError(
+            f"Could not download the ID crosswalk from {url} ({e}). "
+            f"Save that file as {path} and run this again."
+        ) from e
+    tmp_path.replace(target)
+    print(f"[OK] Downloaded {url} -> {path}")
+    return path
 
 
 def initialize_database():
@@ -272,6 +1482,12 @@ def initialize_database():
     print("Creating database tables...")
     db.create_tables()
 
+    # Real bioguide IDs come from the crosswalk, so load it before the members
+    print("Loading ID crosswalk...")
+    if not Path(DEFAULT_LEGISLATORS_CSV).exists():
+        fetch_legislators_csv()
+    db.import_id_crosswalk()
+
     print("Importing CSV data...")
     count = db.import_csv_data()
 
@@ -289,6 +1505,32 @@ def initialize_database():
     return True
 
 
+def upgrade_database(db_path: str = "data/congress.db"):
+    """Migrate an existing database to the current schema, keeping its data"""
+    db = CongressDatabase(db_path)
+    problems = db.schema_problems()
+    if not Path(db_path).exists():
+        raise RuntimeError(f"No database at {db_path}; create it with: python utils/database.py")
+    if not problems:
+        print(f"[OK] {db_path} is already up to date")
+        return
+    print(f"Upgrading {db_path} ({len(problems)} change(s))...")
+    db.ensure_schema()
+    print(f"[OK] {db_path} upgraded")
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create and load the database, or upgrade its schema")
+    parser.add_argument("--upgrade", action="store_true",
+                        help="Only migrate the existing database to the current schema (no import)")
+    args = parser.parse_args()
+
     # Run initialization if executed directly
-    initialize_database()
+    try:
+        if args.upgrade:
+            upgrade_database()
+        else:
+            initialize_database()
+    except Exception as e:
+        print(f"\n[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,345 @@
+"""
+Offline address-level district resolution
+Geocodes street addresses against TIGER/Line address-range features and
+finds the congressional district containing the point with a
+point-in-polygon test, using an STR-packed R-tree over the district
+boundaries. Everything is loaded once per process; no network access.
+
+Data (GeoJSON, e.g. converted with `ogr2ogr -f GeoJSON`):
+    data/cd_boundaries.geojson   Census cartographic boundary file for
+                                 congressional districts (GEOID property)
+    data/address_ranges/*.geojson
+                                 TIGER/Line ADDRFEAT address ranges (FULLNAME,
+                                 LFROMHN, LTOHN, RFROMHN, RTOHN, ZIPL, ZIPR)
+"""
+
+import json
+import math
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from utils.zip_index import district_label
+
+DEFAULT_BOUNDARIES = "data/cd_boundaries.geojson"
+DEFAULT_ADDRESS_RANGES = "data/address_ranges"
+
+# District GEOID properties, most specific first. Current cartographic
+# boundary files also carry GEOIDFQ ('5001800US1227'), listed before GEOID
+GEOID_KEYS = ('GEOID', 'GEOID20', 'GEOID10')
+
+# Geocoded points are moved this far (degrees, ~10 m) off the street
+# centerline towards the side of the address, since streets are often
+# district boundaries themselves
+SIDE_OFFSET = 0.0001
+
+# Street name words -> USPS standard abbreviations (TIGER FULLNAME style)
+STREET_ABBREVIATIONS = {
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W',
+    'NORTHEAST': 'NE', 'NORTHWEST': 'NW', 'SOUTHEAST': 'SE', 'SOUTHWEST': 'SW',
+    'STREET': 'ST', 'AVENUE': 'AVE', 'AV': 'AVE', 'BOULEVARD': 'BLVD', 'DRIVE': 'DR',
+    'ROAD': 'RD', 'LANE': 'LN', 'COURT': 'CT', 'PLACE': 'PL', 'TERRACE': 'TER',
+    'HIGHWAY': 'HWY', 'PARKWAY': 'PKWY', 'CIRCLE': 'CIR', 'TRAIL': 'TRL',
+    'EXPRESSWAY': 'EXPY', 'CAUSEWAY': 'CSWY', 'WAY': 'WAY', 'SQUARE': 'SQ',
+}
+
+# Unit designators dropped from addresses ("Apt 4", "Suite 100", "#12")
+UNIT_PATTERN = re.compile(r'\b(?:APT|APARTMENT|UNIT|STE|SUITE|FLOOR|RM|ROOM|BLDG)\b\.?\s*\S+|#\s*\S+')
+ADDRESS_PATTERN = re.compile(r'^\s*(\d+)[A-Z]?\s+([^,]+)')
+ZIP_PATTERN = re.compile(r'\b(\d{5})(?:-\d{4})?\s*$')
+
+BBox = Tuple[float, float, float, float]
+
+
+def normalize_street(name: str) -> str:
+    """'South West 8th Street' -> 'SW 8TH ST'"""
+    words = re.sub(r'[^\w\s]', ' ', name.upper()).split()
+    street = ' '.join(STREET_ABBREVIATIONS.get(word, word) for word in words)
+    return re.sub(r'\b([NS]) ([EW])\b', r'\1\2', street)
+
+
+def parse_address(address: str) -> Optional[Tuple[int, str, Optional[str]]]:
+    """'1234 SW 8th Street, Apt 2, Miami, FL 33135' -> (1234, 'SW 8TH ST', '33135')"""
+    text = UNIT_PATTERN.sub('', address.upper())
+    zip_match = ZIP_PATTERN.search(text)
+    if zip_match:
+        text = text[:zip_match.start()]
+    match = ADDRESS_PATTERN.match(text)
+    if not match:
+        return None
+    return int(match.group(1)), normalize_street(match.group(2)), zip_match.group(1) if zip_match else None
+
+
+def point_in_ring(x: float, y: float, ring: Sequence[Sequence[float]]) -> bool:
+    """Ray casting test for one closed ring of [x, y] points"""
+    inside = False
+    x1, y1 = ring[-1][0], ring[-1][1]
+    for point in ring:
+        x2, y2 = point[0], point[1]
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+def ring_bbox(ring: Sequence[Sequence[float]]) -> BBox:
+    """Bounding box of a ring"""
+    xs = [point[0] for point in ring]
+    ys = [point[1] for point in ring]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class STRTree:
+    """
+    Read-only R-tree bulk-loaded with Sort-Tile-Recursive packing.
+    Nodes are (bbox, children, is_leaf) tuples; leaf children are the items.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[BBox, object]], node_capacity: int = 16):
+        self.node_capacity = node_capacity
+        level = [(bbox, item, None) for bbox, item in entries]
+        self.size = len(level)
+        if not level:
+            # Empty or fully filtered boundary file: every query finds nothing
+            self.root = None
+            return
+        leaf = True
+        while len(level) > node_capacity or leaf:
+            level = self._pack(level, leaf)
+            leaf = False
+        self.root = (self._union(level), level, False)
+
+    @staticmethod
+    def _union(entries) -> BBox:
+        return (
+            min(entry[0][0] for entry in entries), min(entry[0][1] for entry in entries),
+            max(entry[0][2] for entry in entries), max(entry[0][3] for entry in entries),
+        )
+
+    def _pack(self, entries: List, leaf: bool) -> List:
+        """Group entries into nodes of node_capacity, tiled by x then y"""
+        capacity = self.node_capacity
+        node_count = math.ceil(len(entries) / capacity)
+        slice_size = math.ceil(math.sqrt(node_count)) * capacity
+
+        entries = sorted(entries, key=lambda entry: entry[0][0] + entry[0][2])
+        nodes = []
+        for i in range(0, len(entries), slice_size):
+            tile = sorted(entries[i:i + slice_size], key=lambda entry: entry[0][1] + entry[0][3])
+            for j in range(0, len(tile), capacity):
+                children = tile[j:j + capacity]
+                if leaf:
+                    nodes.append((self._union(children), [(bbox, item) for bbox, item, _ in children], True))
+                else:
+                    nodes.append((self._union(children), children, False))
+        return nodes
+
+    def query_point(self, x: float, y: float) -> List:
+        """Items whose bounding box contains (x, y)"""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            _, children, is_leaf = stack.pop()
+            for child in children:
+                bbox = child[0]
+                if bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]:
+                    if is_leaf:
+                        found.append(child[1])
+                    else:
+                        stack.append(child)
+        return found
+
+
+def feature_geoid(properties: Dict) -> str:
+    """
+    A boundary feature's 4-digit CD GEOID: an exact GEOID_KEYS property,
+    else any other GEOID* property, with a fully qualified value
+    ('5001800US1227') cut to the part after 'US'
+    """
+    upper = {key.upper(): value for key, value in properties.items() if value}
+    for key in GEOID_KEYS:
+        if key in upper:
+            return str(upper[key])
+    for key, value in upper.items():
+        if key.startswith('GEOID'):
+            return str(value).rpartition('US')[2]
+    return ''
+
+
+class DistrictBoundaries:
+    """District polygons behind an STR-tree, answering point-in-district queries"""
+
+    def __init__(self, polygons: Iterable[Tuple[str, List]]):
+        # One tree entry per polygon part: (district, [exterior, *holes])
+        self.tree = STRTree(
+            (ring_bbox(rings[0]), (district, rings)) for district, rings in polygons
+        )
+
+    @classmethod
+    def from_geojson(cls, path: str = DEFAULT_BOUNDARIES) -> 'DistrictBoundaries':
+        """Load a congressional district FeatureCollection (GEOID or district property)"""
+        with open(path, encoding='utf-8') as f:
+            collection = json.load(f)
+
+        polygons = []
+        for feature in collection['features']:
+            properties = feature.get('properties') or {}
+            district = properties.get('district')
+            if not district:
+                district = district_label(feature_geoid(properties))
+            geometry = feature.get('geometry')
+            if not district or not geometry:
+                continue
+            if geometry['type'] == 'Polygon':
+                polygons.append((district, geometry['coordinates']))
+            elif geometry['type'] == 'MultiPolygon':
+                polygons.extend((district, rings) for rings in geometry['coordinates'])
+        return cls(polygons)
+
+    def district_at(self, lon: float, lat: float) -> Optional[str]:
+        """District containing the point, or None"""
+        for district, rings in self.tree.query_point(lon, lat):
+            if point_in_ring(lon, lat, rings[0]) and not any(point_in_ring(lon, lat, hole) for hole in rings[1:]):
+                return district
+        return None
+
+
+class AddressGeocoder:
+    """Interpolating geocoder over TIGER/Line address ranges, keyed by (ZIP, street)"""
+
+    def __init__(self):
+        # (zip, street) -> [(low, high, from_hn, to_hn, parity, side, coordinates)]
+        self.ranges: Dict[Tuple[str, str], List] = {}
+
+    @classmethod
+    def from_geojson(cls, paths: Union[str, Iterable[str]] = DEFAULT_ADDRESS_RANGES) -> 'AddressGeocoder':
+        """Load ADDRFEAT features from GeoJSON files (a directory loads every *.geojson in it)"""
+        if isinstance(paths, (str, Path)):
+            path = Path(paths)
+            paths = sorted(path.glob('*.geojson')) if path.is_dir() else [path]
+
+        geocoder = cls()
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                collection = json.load(f)
+            for feature in collection['features']:
+                geocoder.add_feature(feature)
+        return geocoder
+
+    def add_feature(self, feature: Dict):
+        """Index both sides of one address-range street segment"""
+        properties = feature.get('properties') or {}
+        geometry = feature.get('geometry') or {}
+        name = properties.get('FULLNAME')
+        if not name or geometry.get('type') != 'LineString':
+            return
+        street = normalize_street(name)
+        coordinates = geometry['coordinates']
+
+        for side in ('L', 'R'):
+            from_hn = str(properties.get(f'{side}FROMHN') or '')
+            to_hn = str(properties.get(f'{side}TOHN') or '')
+            zip_code = properties.get(f'ZIP{side}')
+            if not (from_hn.isdigit() and to_hn.isdigit() and zip_code):
+                continue
+            from_hn, to_hn = int(from_hn), int(to_hn)
+            parity = from_hn % 2 if from_hn % 2 == to_hn % 2 else None
+            self.ranges.setdefault((str(zip_code), street), []).append(
+                (min(from_hn, to_hn), max(from_hn, to_hn), from_hn, to_hn, parity, side, coordinates)
+            )
+
+    def geocode(self, number: int, street: str, zip_code: str) -> Optional[Tuple[float, float]]:
+        """
+        (lon, lat) of a house number on a street, interpolated along its range.
+        Without commas the street may run into the city ('MAIN ST MIAMI FL'),
+        so shorter word prefixes of the street are tried as well.
+        """
+        words = street.split()
+        for end in range(len(words), 0, -1):
+            segments = self.ranges.get((zip_code, ' '.join(words[:end])))
+            if not segments:
+                continue
+            for low, high, from_hn, to_hn, parity, side, coordinates in segments:
+                if low <= number <= high and (parity is None or number % 2 == parity):
+                    fraction = (number - from_hn) / (to_hn - from_hn) if to_hn != from_hn else 0.5
+                    return interpolate(coordinates, fraction, side)
+            return None
+        return None
+
+
+def interpolate(coordinates: Sequence[Sequence[float]], fraction: float, side: str) -> Tuple[float, float]:
+    """Point at `fraction` of a line's length, offset to its left ('L') or right ('R')"""
+    segments = list(zip(coordinates, coordinates[1:]))
+    lengths = [math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in segments]
+    target = sum(lengths) * fraction
+
+    for position, ((a, b), length) in enumerate(zip(segments, lengths)):
+        if target <= length or position == len(segments) - 1:
+            t = min(target / length, 1.0) if length else 0.0
+            dx, dy = b[0] - a[0], b[1] - a[1]
+            norm = math.hypot(dx, dy) or 1.0
+            # Left normal of the digitized direction is (-dy, dx); right is its opposite
+            sign = 1 if side == 'L' else -1
+            return (
+                a[0] + dx * t - sign * dy / norm * SIDE_OFFSET,
+                a[1] + dy * t + sign * dx / norm * SIDE_OFFSET,
+            )
+        target -= length
+    return coordinates[0][0], coordinates[0][1]
+
+
+class DistrictResolver:
+    """Address or lat/lon -> congressional district, from local files only"""
+
+    def __init__(self, boundaries: DistrictBoundaries, geocoder: Optional[AddressGeocoder] = None):
+        self.boundaries = boundaries
+        self.geocoder = geocoder
+
+    def resolve_point(self, lat: float, lon: float) -> Optional[Dict]:
+        """{"district", "state", "lat", "lon"} for a point, or None outside every district"""
+        district = self.boundaries.district_at(lon, lat)
+        if not district:
+            return None
+        return {"district": district, "state": district.split('-')[0], "lat": lat, "lon": lon}
+
+    def resolve_address(self, address: str) -> Optional[Dict]:
+        """
+        Geocode a street address (house number, street and ZIP required)
+        and resolve its district; None when it cannot be placed
+        """
+        parsed = parse_address(address)
+        if not parsed or not self.geocoder:
+            return None
+        number, street, zip_code = parsed
+        if not zip_code:
+            return None
+        point = self.geocoder.geocode(number, street, zip_code)
+        if not point:
+            return None
+        lon, lat = point
+        return self.resolve_point(lat, lon)
+
+
+_resolver: Optional[DistrictResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver(
+    boundaries_path: str = DEFAULT_BOUNDARIES,
+    address_ranges: str = DEFAULT_ADDRESS_RANGES
+) -> Optional[DistrictResolver]:
+    """
+    Shared resolver, loaded on first use (once per process).
+    None when the boundary file has not been installed.
+    """
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            if not Path(boundaries_path).exists():
+                return None
+            geocoder = AddressGeocoder.from_geojson(address_ranges) if Path(address_ranges).exists() else None
+            _resolver = DistrictResolver(DistrictBoundaries.from_geojson(boundaries_path), geocoder)
+    return _resolver
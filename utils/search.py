@@ -1,8 +1,46 @@
 """Search utilities for Congress Connect"""
 
-from typing import Optional, Dict, List
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
 from utils.database import CongressDatabase
 from utils.api_clients import GoogleCivicAPI
+from utils.cache import MemoCache, SingleFlight
+from utils.geo import ZIP_PATTERN, get_resolver
+from utils.snapshot import get_fingerprint, get_snapshot
+from utils.zip_index import DEFAULT_ZIP_INDEX, ZipDistrictIndex, get_zip_index, lookup_zip
+from utils.zip_results import (
+    DEFAULT_ZIP_RESULTS, ZIP_COUNT, get_zip_results, source_fingerprint, write_zip_results
+)
+
+# A batch value is a ZIP only in this exact form (5 digits, optional +4)
+ZIP_FORMAT = r'\d{5}(?:-\d{4})?'
+
+# Member columns joined onto every row by search_by_zip_batch
+BATCH_MEMBER_COLUMNS = [
+    'district', 'state', 'representative', 'party', 'phone',
+    'senator_1', 'senator_1_phone', 'senator_2', 'senator_2_phone',
+]
+
+
+# Shared by every session in the process (Streamlit runs sessions as threads)
+_lookups = SingleFlight()
+_memo = MemoCache()
+
+
+def search_stats() -> Dict:
+    """Memoization and single-flight counters for the search functions"""
+    return {'memo': _memo.stats(), 'single_flight': _lookups.stats()}
+
+
+def _memoized(name: str, db: CongressDatabase, args: tuple, fn: Callable, *fn_args) -> Any:
+    """fn(*fn_args) through the memo cache, keyed on name, args and the current data version"""
+    key = (name, db.db_path, get_fingerprint(db.db_path)) + args
+    return _memo.get_or_compute(key, fn, *fn_args)
 
 
 def search_by_zip(zip_code: str, db: CongressDatabase, google_api: GoogleCivicAPI = None) -> Dict:
@@ -11,21 +49,42 @@ def search_by_zip(zip_code: str, db: CongressDatabase, google_api: GoogleCivicAP
     Returns: {
         "success": bool,
         "district": str or None,
+        "districts": list,     # every district of the ZIP, primary first
         "house_rep": dict or None,
+        "house_reps": list,    # House members of all those districts
         "senators": list,
         "message": str
     }
+    Offline results are memoized per data version (see MemoCache); API
+    answers are cached by GoogleCivicAPI instead, so an API outage's fallback
+    answer is not kept. On a miss, offline lookups are answered from the
+    precomputed results file when it matches the current data (see
+    build_zip_results); concurrent searches for the same ZIP share one
+    lookup (see SingleFlight).
     """
-    result = {
-        "success": False,
-        "district": None,
-        "house_rep": None,
-        "senators": [],
-        "message": ""
-    }
+    # Each caller gets its own top-level dict, so callers may edit theirs
+    if google_api is None:
+        # The index fingerprint keeps answers from the sample ranges from
+        # outliving a ZIP index built later
+        index = get_zip_index().fingerprint()
+        return dict(_memoized('search_by_zip', db, (zip_code, index), _lookup_zip, zip_code, db))
+    return dict(_lookup_zip(zip_code, db, google_api))
+
 
+def _lookup_zip(zip_code: str, db: CongressDatabase, google_api: GoogleCivicAPI = None) -> Dict:
+    if google_api is None:
+        precomputed = _precomputed_result(zip_code, db)
+        if precomputed is not None:
+            return precomputed
+
+    key = ('zip', db.db_path, zip_code, google_api.api_key if google_api else None)
+    return _lookups.do(key, _search_by_zip, zip_code, db, google_api)
+
+
+def _search_by_zip(zip_code: str, db: CongressDatabase, google_api: GoogleCivicAPI = None) -> Dict:
     # Validate ZIP code
     if not zip_code or len(zip_code) != 5 or not zip_code.isdigit():
+        result = _zip_result(None, db)
         result["message"] = "Please enter a valid 5-digit ZIP code"
         return result
 
@@ -35,23 +94,41 @@ def search_by_zip(zip_code: str, db: CongressDatabase, google_api: GoogleCivicAP
     else:
         district_info = manual_zip_to_district(zip_code)
 
+    return _zip_result(district_info, db)
+
+
+def _zip_result(district_info: Optional[Dict], db: CongressDatabase) -> Dict:
+    """search_by_zip result for a resolved {"district", "state", "districts"} (or None)"""
+    result = {
+        "success": False,
+        "district": None,
+        "districts": [],
+        "house_rep": None,
+        "house_reps": [],
+        "senators": [],
+        "message": ""
+    }
+
     if not district_info:
         result["message"] = "Could not determine district. Please select manually."
         return result
 
     district = district_info.get("district")
+    districts = district_info.get("districts", [district])
     state = district_info.get("state", "FL")
 
-    # Get house representative
-    house_rep = db.get_representative_by_district(district)
-
-    # Get senators
-    senators = db.get_senators_by_state(state)
+    # House members and senators come from the in-memory snapshot
+    snapshot = get_snapshot(db.db_path)
+    house_reps = [rep for rep in map(snapshot.house_rep, districts) if rep]
+    house_rep = snapshot.house_rep(district)
+    senators = snapshot.senators(state)
 
-    if house_rep or senators:
+    if house_rep or house_reps or senators:
         result["success"] = True
         result["district"] = district
+        result["districts"] = districts
         result["house_rep"] = house_rep
+        result["house_reps"] = house_reps
         result["senators"] = senators
         result["message"] = f"Found representatives for {district}"
     else:
@@ -60,39 +137,330 @@ def search_by_zip(zip_code: str, db: CongressDatabase, google_api: GoogleCivicAP
     return result
 
 
+# Seconds between looks for a results file while none matches the current data
+RESULTS_RECHECK_SECONDS = 10.0
+
+# (results file, (table, index) fingerprints, whether they match, check time) of the last check
+_fresh_results: Tuple = (None, None, False, 0.0)
+_fresh_results_lock = threading.Lock()
+
+
+def _needs_results_check(state: Tuple, data: Tuple) -> bool:
+    """A new check when the data changed, or now and then while no file matches"""
+    _, checked, fresh, checked_at = state
+    return checked != data or (not fresh and time.monotonic() - checked_at >= RESULTS_RECHECK_SECONDS)
+
+
+def _precomputed_result(zip_code: str, db: CongressDatabase) -> Optional[Dict]:
+    """The stored result for a ZIP, or None when no results file matches the current data"""
+    global _fresh_results
+    # Only the fingerprints are read here, never a full snapshot load
+    data = (get_fingerprint(db.db_path), get_zip_index().fingerprint())
+    state = _fresh_results
+    if _needs_results_check(state, data):
+        with _fresh_results_lock:
+            state = _fresh_results
+            if _needs_results_check(state, data):
+                # Missing or stale: pick up a results file built since the last check
+                results = get_zip_results(reload=True)
+                fresh = results is not None and results.fingerprint == source_fingerprint(*data)
+                state = _fresh_results = (results, data, fresh, time.monotonic())
+    results, _, fresh, _ = state
+    return results.lookup(zip_code) if fresh else None
+
+
+def district_set_result(districts: Sequence[str], db: CongressDatabase) -> Dict:
+    """
+    search_by_zip result for a ZIP covering these districts (primary first),
+    with plain-dict member rows so it can be serialized
+    """
+    result = _zip_result({
+        "district": districts[0],
+        "state": districts[0].split('-')[0],
+        "districts": list(districts),
+    }, db)
+    # Snapshot rows are read-only mappings
+    result['house_rep'] = dict(result['house_rep']) if result['house_rep'] else None
+    result['house_reps'] = [dict(rep) for rep in result['house_reps']]
+    result['senators'] = [dict(rep) for rep in result['senators']]
+    return result
+
+
+def build_zip_results(db: CongressDatabase, index_path: str = DEFAULT_ZIP_INDEX,
+                      output_path: str = DEFAULT_ZIP_RESULTS) -> int:
+    """
+    Precompute the offline search_by_zip result of every ZIP into a results
+    file. ZIPs with the same district set share one stored result, so the
+    live lookup runs once per set. Returns the number of distinct results.
+    """
+    global _fresh_results
+    index = get_zip_index(index_path)
+    snapshot = get_snapshot(db.db_path)
+
+    # Result 0: ZIPs outside the index
+    results = [_zip_result(None, db)]
+    numbers = {}
+    slots = [0] * ZIP_COUNT
+    for zip_number in range(ZIP_COUNT):
+        districts = tuple(index.districts(zip_number))
+        if not districts:
+            continue
+        if districts not in numbers:
+            numbers[districts] = len(results)
+            results.append(district_set_result(districts, db))
+        slots[zip_number] = numbers[districts]
+
+    fingerprint = source_fingerprint(snapshot.fingerprint, index.fingerprint())
+    size = write_zip_results(slots, results, fingerprint, time.time(), output_path)
+    with _fresh_results_lock:
+        _fresh_results = (None, None, False, 0.0)  # use the new file from the next lookup on
+    covered = sum(1 for slot in slots if slot)
+    print(f"[OK] Precomputed {covered:,} ZIPs as {len(results)} distinct results "
+          f"({size / 1024:.0f} KB) -> {output_path}")
+    return len(results)
+
+
+def search_by_address(location: Union[str, Tuple[float, float]], db: CongressDatabase) -> Dict:
+    """
+    Search for representatives by street address or (lat, lon), resolving
+    the exact district offline with utils/geo.py. Falls back to the ZIP
+    lookup when the address cannot be placed (or no boundary data is installed).
+    Returns the same shape as search_by_zip, with "lat"/"lon" when resolved.
+    Results are memoized per data version; concurrent searches for the
+    same location share one lookup.
+    """
+    if not isinstance(location, str):
+        location = tuple(location)
+    return dict(_memoized('search_by_address', db, (location,), _lookup_address, location, db))
+
+
+def _lookup_address(location: Union[str, Tuple[float, float]], db: CongressDatabase) -> Dict:
+    key = ('address', db.db_path, location)
+    return _lookups.do(key, _search_by_address, location, db)
+
+
+def _search_by_address(location: Union[str, Tuple[float, float]], db: CongressDatabase) -> Dict:
+    resolver = get_resolver()
+    resolved = None
+    if resolver:
+        if isinstance(location, str):
+            resolved = resolver.resolve_address(location)
+        else:
+            resolved = resolver.resolve_point(*location)
+
+    if not resolved:
+        zip_match = ZIP_PATTERN.search(location) if isinstance(location, str) else None
+        if zip_match:
+            result = search_by_zip(zip_match.group(1), db)
+            if result["success"]:
+                result["message"] += " (by ZIP code; address could not be matched)"
+            return result
+        return {
+            "success": False,
+            "district": None,
+            "districts": [],
+            "house_rep": None,
+            "house_reps": [],
+            "senators": [],
+            "message": "Could not locate that address. Please include the ZIP code."
+        }
+
+    district = resolved["district"]
+    snapshot = get_snapshot(db.db_path)
+    house_rep = snapshot.house_rep(district)
+    senators = snapshot.senators(resolved["state"])
+
+    return {
+        "success": bool(house_rep or senators),
+        "district": district,
+        "districts": [district],
+        "house_rep": house_rep,
+        "house_reps": [house_rep] if house_rep else [],
+        "senators": senators,
+        "lat": resolved["lat"],
+        "lon": resolved["lon"],
+        "message": f"Found representatives for {district}" if house_rep or senators
+                   else f"No representatives found for {district}"
+    }
+
+
 def search_by_district(district: str, db: CongressDatabase) -> Optional[Dict]:
-    """Search for representative by district code"""
-    return db.get_representative_by_district(district)
+    """Search for representative by district code (memoized per data version)"""
+    return _memoized('search_by_district', db, (district,), _house_rep, district, db)
 
 
 def get_all_florida_reps(db: CongressDatabase) -> List[Dict]:
-    """Get all Florida representatives"""
-    return db.get_all_representatives(state='FL')
+    """Get all Florida representatives (memoized per data version)"""
+    return list(_memoized('get_all_florida_reps', db, (), _state_reps, 'FL', db))
+
+
+def _house_rep(district: str, db: CongressDatabase) -> Optional[Dict]:
+    return get_snapshot(db.db_path).house_rep(district)
+
+
+def _state_reps(state: str, db: CongressDatabase) -> tuple:
+    return tuple(get_snapshot(db.db_path).filter(state=state))
 
 
 def manual_zip_to_district(zip_code: str) -> Optional[Dict]:
     """
-    Manual ZIP to district mapping for Florida
-    This is a simplified fallback - would need complete database for production
+    Offline ZIP to district lookup (no API key needed)
+    Uses the compiled index from utils/zip_index.py; returns every district
+    under "districts" when a ZIP spans more than one.
     """
-    zip_int = int(zip_code)
-
-    # Sample mappings (would need complete data)
-    mappings = {
-        range(32004, 32100): "FL-04",  # Jacksonville area
-        range(32301, 32400): "FL-02",  # Tallahassee
-        range(32601, 32700): "FL-03",  # Gainesville
-        range(33101, 33200): "FL-27",  # Miami
-        range(33301, 33400): "FL-23",  # Fort Lauderdale
-        range(33401, 33500): "FL-22",  # West Palm Beach
-        range(33601, 33700): "FL-14",  # Tampa
-        range(33701, 33800): "FL-13",  # St. Petersburg
-        range(33901, 34000): "FL-19",  # Fort Myers/Naples area
-        range(34101, 34200): "FL-25",  # Collier County
-    }
+    return lookup_zip(zip_code)
+
+
+def _member_name(rep: Dict) -> str:
+    return f"{rep['first_name']} {rep['last_name']}"
+
+
+# (db_path, index fingerprint) -> (snapshot fingerprint, table, positions),
+# oldest dropped first beyond DISTRICT_TABLE_LIMIT
+DISTRICT_TABLE_LIMIT = 8
+_district_tables: Dict[Tuple[str, str], Tuple[Tuple, pd.DataFrame, Dict[str, int]]] = {}
+_district_tables_lock = threading.Lock()
+
+
+def _district_table(index: ZipDistrictIndex, db_path: str) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    One row of BATCH_MEMBER_COLUMNS per district (the ZIP index labels plus
+    every House seat in the database), and a final empty row for unmatched
+    input, so batch lookups join by integer position. Cached per database
+    and index contents; rebuilt only when the snapshot changes.
+    """
+    snapshot = get_snapshot(db_path)
+    key = (db_path, index.fingerprint())
+    with _district_tables_lock:
+        cached = _district_tables.get(key)
+        if cached and cached[0] == snapshot.fingerprint:
+            return cached[1], cached[2]
+
+    house_districts = [rep['district'] for rep in snapshot.filter(office='U.S. House')]
+    labels = list(dict.fromkeys(list(index.labels) + house_districts))
+
+    records = []
+    for label in labels:
+        state = label.split('-')[0]
+        rep = snapshot.house_rep(label) or {}
+        senators = snapshot.senators(state)[:2]
+        senators += [{}] * (2 - len(senators))
+        records.append([
+            label, state,
+            _member_name(rep) if rep else None, rep.get('party'), rep.get('dc_phone'),
+            _member_name(senators[0]) if senators[0] else None, senators[0].get('dc_phone'),
+            _member_name(senators[1]) if senators[1] else None, senators[1].get('dc_phone'),
+        ])
+    records.append([None] * len(BATCH_MEMBER_COLUMNS))
+
+    table = pd.DataFrame(records, columns=BATCH_MEMBER_COLUMNS)
+    positions = {label: position for position, label in enumerate(labels)}
+    with _district_tables_lock:
+        _district_tables.pop(key, None)
+        _district_tables[key] = (snapshot.fingerprint, table, positions)
+        while len(_district_tables) > DISTRICT_TABLE_LIMIT:
+            del _district_tables[next(iter(_district_tables))]
+    return table, positions
+
+
+def search_by_zip_batch(
+    values: Union[Iterable, pd.Series],
+    db: CongressDatabase,
+    index: ZipDistrictIndex = None
+) -> pd.DataFrame:
+    """
+    Resolve many ZIP codes or street addresses at once.
+    ZIPs ('33139', 33139, '33139-1234') are located with one NumPy
+    searchsorted over the ZIP index intervals; addresses go through the
+    offline address resolver, falling back to their ZIP. Members are then
+    joined by position from a per-district table, so there is no per-row SQL.
+
+    Returns a DataFrame aligned with `values`: input, zip, match ('address',
+    'zip', 'invalid' for values that are neither a 5-digit ZIP (+4) nor an
+    address, or None when not found), districts (all districts of the ZIP, ';'-separated),
+    n_districts, then BATCH_MEMBER_COLUMNS for the primary district.
+    """
+    index = index or get_zip_index()
+    table, positions = _district_table(index, db.db_path)
+    empty_row = len(table) - 1
+
+    raw = pd.Series(values, dtype=object).reset_index(drop=True)
+    rows = np.full(len(raw), empty_row, dtype=np.int64)
+    match = np.full(len(raw), None, dtype=object)
+    districts = np.full(len(raw), None, dtype=object)
+    n_districts = np.zeros(len(raw), dtype=np.int64)
+
+    # ZIPs are exactly 5 digits with an optional +4 ('3313', '33139.0' and
+    # '3.3e4' are not ZIPs); they parse in one vectorized pass
+    text = raw[raw.notna()].astype(str).str.strip()
+    text = text[text != '']  # blank cells are missing, not invalid
+    is_zip = text.str.fullmatch(ZIP_FORMAT)
+    numbers = pd.Series(np.nan, index=raw.index)
+    numbers[is_zip[is_zip].index] = pd.to_numeric(text[is_zip].str[:5])
+
+    # Anything else with letters and spaces is an address; the rest is invalid
+    other = text[~is_zip]
+    is_address = other.str.contains(r'[^\W\d_]', regex=True) & other.str.contains(r'\s', regex=True)
+    match[other[~is_address].index] = 'invalid'
+    if len(other):
+        # Addresses: exact district when the address can be placed, else its ZIP
+        addresses = other[is_address]
+        resolver = get_resolver()
+        if resolver:
+            for position, address in addresses.items():
+                resolved = resolver.resolve_address(address)
+                if resolved and resolved['district'] in positions:
+                    rows[position] = positions[resolved['district']]
+                    match[position] = 'address'
+                    districts[position] = resolved['district']
+                    n_districts[position] = 1
+        pending = addresses[match[addresses.index] == None]  # noqa: E711 (element-wise)
+        numbers[pending.index] = pd.to_numeric(
+            pending.str.extract(r'\b(\d{5})(?:-\d{4})?\s*$', expand=False), errors='coerce'
+        )
+
+    zips = numbers.fillna(-1).to_numpy(np.int64)
+    by_zip = (zips >= 0) & (match == None)  # noqa: E711 (element-wise)
+
+    if len(index) and by_zip.any():
+        starts = np.asarray(index.starts, dtype=np.int64)
+        ends = np.asarray(index.ends, dtype=np.int64)
+        set_ids = np.asarray(index.set_ids, dtype=np.int64)
+        set_offs = np.asarray(index.set_offs, dtype=np.int64)
+        set_codes = np.asarray(index.set_codes, dtype=np.int64)
+
+        # District set of each interval: its label positions, ';'-joined names and size
+        label_rows = np.array([positions[label] for label in index.labels], dtype=np.int64)
+        set_names = np.array([
+            ';'.join(index.labels[code] for code in set_codes[set_offs[i]:set_offs[i + 1]])
+            for i in range(len(set_offs) - 1)
+        ], dtype=object)
+
+        interval = np.searchsorted(starts, zips, side='right') - 1
+        clipped = np.clip(interval, 0, None)
+        found = by_zip & (interval >= 0) & (zips <= ends[clipped])
+        sets = set_ids[clipped]
+
+        rows = np.where(found, label_rows[set_codes[set_offs[sets]]], rows)
+        districts = np.where(found, set_names[sets], districts)
+        n_districts = np.where(found, set_offs[sets + 1] - set_offs[sets], n_districts)
+        match = np.where(found, 'zip', match)
+
+    result = table.iloc[rows].reset_index(drop=True)
+    result.insert(0, 'n_districts', n_districts)
+    result.insert(0, 'districts', districts)
+    result.insert(0, 'match', match)
+    result.insert(0, 'zip', np.where(zips >= 0, _zip_strings()[np.clip(zips, 0, None)], None))
+    result.insert(0, 'input', raw)
+    return result
+
+
+_ZIP_STRINGS = None
 
-    for zip_range, district in mappings.items():
-        if zip_int in zip_range:
-            return {"district": district, "state": "FL"}
 
-    return None
+def _zip_strings() -> np.ndarray:
+    """'00000'..'99999' indexed by ZIP number, for formatting ZIP columns without per-row work"""
+    global _ZIP_STRINGS
+    if _ZIP_STRINGS is None:
+        _ZIP_STRINGS = np.array([f"{number:05d}" for number in range(100000)], dtype=object)
+    return _ZIP_STRINGS
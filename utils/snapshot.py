@@ -0,0 +1,166 @@
+"""
+In-memory snapshot of the representatives table
+Loaded once per process and indexed by district, state, party and office,
+so ZIP and district lookups are dictionary hits instead of SQL queries.
+The snapshot is reloaded only when the database file actually changes.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from utils.database import connect_read_only
+
+INDEXED_FIELDS = ('district', 'state', 'party', 'office')
+
+
+class RepresentativeSnapshot:
+    """Immutable, indexed copy of every row in the representatives table"""
+
+    def __init__(self, rows: List[Mapping], fingerprint: Tuple, generation: int):
+        # Rows keep the ORDER BY state, office DESC, district of get_all_representatives
+        self.rows = tuple(MappingProxyType(dict(row)) for row in rows)
+        self.fingerprint = fingerprint
+        self.generation = generation
+
+        indexes = {field: {} for field in INDEXED_FIELDS}
+        for position, row in enumerate(self.rows):
+            for field in INDEXED_FIELDS:
+                indexes[field].setdefault(row[field], []).append(position)
+        self._indexes = {
+            field: {key: tuple(positions) for key, positions in index.items()}
+            for field, index in indexes.items()
+        }
+
+        self._house = {
+            row['district']: row for row in self.rows if row['office'] == 'U.S. House'
+        }
+        senators = {}
+        for row in self.rows:
+            if row['office'] == 'U.S. Senate':
+                senators.setdefault(row['state'], []).append(row)
+        self._senators = {
+            state: tuple(sorted(rows, key=lambda r: r['last_name'] or ''))
+            for state, rows in senators.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def house_rep(self, district: str) -> Optional[Mapping]:
+        """House member for a district code (e.g., 'FL-01')"""
+        return self._house.get(district)
+
+    def senators(self, state: str) -> List[Mapping]:
+        """Senators for a state, ordered by last name"""
+        return list(self._senators.get(state, ()))
+
+    def filter(self, **criteria) -> List[Mapping]:
+        """
+        Rows matching every given field (district, state, party, office).
+        None values are ignored, so filter() returns every row.
+        """
+        positions = None
+        for field, value in criteria.items():
+            if field not in self._indexes:
+                raise ValueError(f"Snapshot is not indexed on '{field}'")
+            if value is None:
+                continue
+            matches = self._indexes[field].get(value, ())
+            positions = matches if positions is None else sorted(set(positions) & set(matches))
+
+        if positions is None:
+            return list(self.rows)
+        return [self.rows[p] for p in positions]
+
+
+class SnapshotLoader:
+    """
+    Holds the current snapshot for one database file.
+    `PRAGMA data_version` (which changes whenever another connection commits)
+    is checked on every access; only then is the table fingerprint
+    (schema version and the trigger-maintained generation counter) read,
+    and the rows reloaded if it moved.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.reloads = 0
+        self._conn = None
+        self._data_version = None
+        self._fingerprint = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def current(self) -> RepresentativeSnapshot:
+        """Return the snapshot, reloading it first if the table changed"""
+        with self._lock:
+            fingerprint = self._current_fingerprint()
+            if self._snapshot is None or fingerprint != self._snapshot.fingerprint:
+                rows = self._conn.execute("""
+                    SELECT * FROM representatives
+                    ORDER BY state, office DESC, district
+                """).fetchall()
+                self.reloads += 1
+                self._snapshot = RepresentativeSnapshot(rows, fingerprint, self.reloads)
+            return self._snapshot
+
+    def fingerprint(self) -> Tuple:
+        """The table fingerprint, without loading (or reloading) the rows"""
+        with self._lock:
+            return self._current_fingerprint()
+
+    def _current_fingerprint(self) -> Tuple:
+        if self._conn is None:
+            self._conn = connect_read_only(self.db_path)
+
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._fingerprint is None or data_version != self._data_version:
+            schema_version = self._conn.execute("PRAGMA schema_version").fetchone()[0]
+            try:
+                generation = self._conn.execute(
+                    "SELECT generation FROM representative_generation WHERE id = 1"
+                ).fetchone()[0]
+            except sqlite3.OperationalError:
+                raise RuntimeError(
+                    f"{self.db_path} has no generation counter; run python utils/database.py --upgrade first"
+                )
+            self._fingerprint = (schema_version, generation)
+            self._data_version = data_version
+        return self._fingerprint
+
+    def close(self):
+        """Close the change-detection connection"""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+
+_loaders: Dict[str, SnapshotLoader] = {}
+_loaders_lock = threading.Lock()
+
+
+def _loader(db_path: str) -> SnapshotLoader:
+    # Fast path by the path as given; resolving it costs more than a lookup
+    loader = _loaders.get(db_path)
+    if loader is None:
+        key = str(Path(db_path).resolve())
+        with _loaders_lock:
+            loader = _loaders.get(key)
+            if loader is None:
+                loader = _loaders[key] = SnapshotLoader(db_path)
+            _loaders[db_path] = loader
+    return loader
+
+
+def get_snapshot(db_path: str) -> RepresentativeSnapshot:
+    """Current snapshot for a database file (one loader per process and file)"""
+    return _loader(db_path).current()
+
+
+def get_fingerprint(db_path: str) -> Tuple:
+    """Current fingerprint of a database's representatives table, without loading a snapshot"""
+    return _loader(db_path).fingerprint()
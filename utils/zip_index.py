@@ -0,0 +1,361 @@
+"""
+Offline ZIP code to congressional district index
+Compiles a Census ZCTA-to-congressional-district relationship file into a
+sorted interval array stored as a memory-mappable binary, answered with
+bisect in microseconds and without any network access.
+
+Build (relationship file from https://www.census.gov/geographies/reference-files/time-series/geo/relationship-files.html,
+e.g. tab20_cd11920_zcta520_natl.txt):
+    python utils/zip_index.py tab20_cd11920_zcta520_natl.txt [data/zip_districts.bin]
+"""
+
+import csv
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_ZIP_INDEX = "data/zip_districts.bin"
+
+# File layout (little-endian):
+#   header     magic, version, n_intervals, n_sets, n_set_codes, labels_len
+#   starts     uint32[n_intervals]  first ZIP of each interval, sorted
+#   ends       uint32[n_intervals]  last ZIP of each interval (inclusive)
+#   set_ids    uint32[n_intervals]  district set of each interval
+#   set_offs   uint32[n_sets + 1]   slice of set_codes for each set
+#   set_codes  uint16[n_set_codes]  label numbers, primary district first
+#   labels     utf-8, newline-separated district labels ('FL-27', 'AK-AL')
+MAGIC = b'ZCDX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIII')
+
+# Census state FIPS code -> USPS abbreviation
+STATE_FIPS = {
+    '01': 'AL', '02': 'AK', '04': 'AZ', '05': 'AR', '06': 'CA', '08': 'CO', '09': 'CT',
+    '10': 'DE', '11': 'DC', '12': 'FL', '13': 'GA', '15': 'HI', '16': 'ID', '17': 'IL',
+    '18': 'IN', '19': 'IA', '20': 'KS', '21': 'KY', '22': 'LA', '23': 'ME', '24': 'MD',
+    '25': 'MA', '26': 'MI', '27': 'MN', '28': 'MS', '29': 'MO', '30': 'MT', '31': 'NE',
+    '32': 'NV', '33': 'NH', '34': 'NJ', '35': 'NM', '36': 'NY', '37': 'NC', '38': 'ND',
+    '39': 'OH', '40': 'OK', '41': 'OR', '42': 'PA', '44': 'RI', '45': 'SC', '46': 'SD',
+    '47': 'TN', '48': 'TX', '49': 'UT', '50': 'VT', '51': 'VA', '53': 'WA', '54': 'WV',
+    '55': 'WI', '56': 'WY', '60': 'AS', '66': 'GU', '69': 'MP', '72': 'PR', '78': 'VI',
+}
+
+# Census district codes for at-large seats and non-voting delegates
+AT_LARGE_CODES = {'00', '98'}
+
+# Used when no compiled index exists: the original hand-made Florida ranges
+SAMPLE_INTERVALS = [
+    (32004, 32099, ['FL-04']),  # Jacksonville area
+    (32301, 32399, ['FL-02']),  # Tallahassee
+    (32601, 32699, ['FL-03']),  # Gainesville
+    (33101, 33199, ['FL-27']),  # Miami
+    (33301, 33399, ['FL-23']),  # Fort Lauderdale
+    (33401, 33499, ['FL-22']),  # West Palm Beach
+    (33601, 33699, ['FL-14']),  # Tampa
+    (33701, 33799, ['FL-13']),  # St. Petersburg
+    (33901, 33999, ['FL-19']),  # Fort Myers/Naples area
+    (34101, 34199, ['FL-25']),  # Collier County
+]
+
+
+def district_label(cd_geoid: str) -> Optional[str]:
+    """Census CD GEOID ('1227', '0200') -> district label ('FL-27', 'AK-AL')"""
+    state = STATE_FIPS.get(cd_geoid[:2])
+    district = cd_geoid[2:]
+    if not state or not district.isdigit():
+        return None  # 'ZZ' = water / not defined
+    if district in AT_LARGE_CODES:
+        return f"{state}-AL"
+    return f"{state}-{district}"
+
+
+def _find_column(header: List[str], *prefixes: str) -> int:
+    """Position of the first column whose upper-cased name starts with a prefix"""
+    names = [name.strip().upper() for name in header]
+    for prefix in prefixes:
+        for position, name in enumerate(names):
+            if name.startswith(prefix):
+                return position
+    raise ValueError(f"No column starting with {' or '.join(prefixes)} in {header}")
+
+
+def read_relationship_file(path: str) -> Dict[int, List[str]]:
+    """
+    {zip: [district, ...]} from a Census ZCTA/CD relationship file
+    (pipe- or comma-delimited). Districts are ordered by the land area they
+    share with the ZCTA, largest (the primary district) first.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        delimiter = '|' if '|' in f.readline() else ','
+        f.seek(0)
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader)
+        zcta_col = _find_column(header, 'GEOID_ZCTA', 'ZCTA')
+        cd_col = _find_column(header, 'GEOID_CD', 'CD')
+        try:
+            area_col = _find_column(header, 'AREALAND_PART')
+        except ValueError:
+            area_col = None
+
+        areas = {}
+        for row in reader:
+            zcta = row[zcta_col].strip()
+            label = district_label(row[cd_col].strip())
+            if not zcta.isdigit() or label is None:
+                continue
+            area = int(row[area_col] or 0) if area_col is not None else 0
+            districts = areas.setdefault(int(zcta), {})
+            districts[label] = districts.get(label, 0) + area
+
+    return {
+        zcta: sorted(districts, key=lambda label: (-districts[label], label))
+        for zcta, districts in areas.items()
+    }
+
+
+def compile_intervals(zip_districts: Dict[int, List[str]]) -> List[Tuple[int, int, List[str]]]:
+    """
+    Sorted, non-overlapping (start, end, districts) intervals.
+    Runs of consecutive ZCTAs with the same districts collapse into one
+    interval, and each interval extends over the ZIPs that are not ZCTAs
+    (PO boxes, unique ZIPs) up to the next ZCTA in the same 3-digit area.
+    """
+    zips = sorted(zip_districts)
+    intervals = []
+    for position, zcta in enumerate(zips):
+        block_end = zcta // 100 * 100 + 99
+        next_zcta = zips[position + 1] if position + 1 < len(zips) else block_end + 1
+        end = min(next_zcta - 1, block_end)
+        districts = zip_districts[zcta]
+
+        if intervals and intervals[-1][2] == districts and intervals[-1][1] == zcta - 1:
+            intervals[-1] = (intervals[-1][0], end, districts)
+        else:
+            intervals.append((zcta, end, districts))
+    return intervals
+
+
+def write_index(intervals: Sequence[Tuple[int, int, List[str]]], output_path: str = DEFAULT_ZIP_INDEX) -> int:
+    """Write intervals in the binary layout above; returns the file size"""
+    labels = sorted({label for _, _, districts in intervals for label in districts})
+    label_number = {label: number for number, label in enumerate(labels)}
+
+    set_number = {}
+    set_offs = [0]
+    set_codes = []
+    set_ids = []
+    for _, _, districts in intervals:
+        key = tuple(districts)
+        if key not in set_number:
+            set_number[key] = len(set_number)
+            set_codes.extend(label_number[label] for label in key)
+            set_offs.append(len(set_codes))
+        set_ids.append(set_number[key])
+
+    count = len(intervals)
+    labels_blob = '\n'.join(labels).encode('utf-8')
+    data = b''.join([
+        HEADER.pack(MAGIC, VERSION, 0, count, len(set_number), len(set_codes), len(labels_blob)),
+        struct.pack(f'<{count}I', *(start for start, _, _ in intervals)),
+        struct.pack(f'<{count}I', *(end for _, end, _ in intervals)),
+        struct.pack(f'<{count}I', *set_ids),
+        struct.pack(f'<{len(set_offs)}I', *set_offs),
+        struct.pack(f'<{len(set_codes)}H', *set_codes),
+        labels_blob,
+    ])
+
+    # Write then rename, so processes with the old file mapped keep a valid view
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, output_path)
+    return len(data)
+
+
+def build_zip_index(relationship_path: str, output_path: str = DEFAULT_ZIP_INDEX) -> int:
+    """Compile a Census relationship file into the binary index; returns the interval count"""
+    zip_districts = read_relationship_file(relationship_path)
+    intervals = compile_intervals(zip_districts)
+    size = write_index(intervals, output_path)
+    print(f"[OK] Indexed {len(zip_districts)} ZCTAs as {len(intervals)} intervals "
+          f"({size / 1024:.0f} KB) -> {output_path}")
+    return len(intervals)
+
+
+class ZipDistrictIndex:
+    """Sorted interval array answering ZIP -> districts with bisect"""
+
+    def __init__(self, starts, ends, set_ids, set_offs, set_codes, labels: List[str], source=None):
+        # Array arguments are any int sequences: lists, or memoryviews over the mmap
+        self.starts = starts
+        self.ends = ends
+        self.set_ids = set_ids
+        self.set_offs = set_offs
+        self.set_codes = set_codes
+        self.labels = labels
+        self._source = source
+        self._fingerprint = None
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_ZIP_INDEX) -> 'ZipDistrictIndex':
+        """Memory-map a compiled index file"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count, n_sets, n_codes, labels_len = HEADER.unpack_from(mapped)
+        if magic != MAGIC or version != VERSION:
+            mapped.close()
+            raise ValueError(f"{path} is not a version {VERSION} ZIP district index")
+
+        view = memoryview(mapped)
+        offset = HEADER.size
+        arrays = []
+        for length, fmt, width in ((count, 'I', 4), (count, 'I', 4), (count, 'I', 4),
+                                   (n_sets + 1, 'I', 4), (n_codes, 'H', 2)):
+            raw = view[offset:offset + length * width]
+            if sys.byteorder == 'little':
+                arrays.append(raw.cast(fmt))
+            else:
+                arrays.append(struct.unpack(f'<{length}{fmt}', raw))
+            offset += length * width
+        labels = bytes(view[offset:offset + labels_len]).decode('utf-8').split('\n')
+
+        return cls(*arrays, labels=labels, source=mapped)
+
+    @classmethod
+    def from_intervals(cls, intervals: Sequence[Tuple[int, int, List[str]]]) -> 'ZipDistrictIndex':
+        """In-memory index over (start, end, districts) intervals"""
+        labels = sorted({label for _, _, districts in intervals for label in districts})
+        label_number = {label: number for number, label in enumerate(labels)}
+        set_offs = [0]
+        set_codes = []
+        for _, _, districts in intervals:
+            set_codes.extend(label_number[label] for label in districts)
+            set_offs.append(len(set_codes))
+        return cls(
+            [start for start, _, _ in intervals],
+            [end for _, end, _ in intervals],
+            list(range(len(intervals))),
+            set_offs, set_codes, labels
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def fingerprint(self) -> str:
+        """Content hash of the intervals and district sets (computed once)"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for array in (self.starts, self.ends, self.set_ids, self.set_offs, self.set_codes):
+                digest.update(struct.pack(f'<{len(array)}I', *array))
+            digest.update('\n'.join(self.labels).encode('utf-8'))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def districts(self, zip_code: int) -> List[str]:
+        """Every district of a ZIP, primary first ([] when not covered)"""
+        position = bisect_right(self.starts, zip_code) - 1
+        if position < 0 or zip_code > self.ends[position]:
+            return []
+        set_id = self.set_ids[position]
+        codes = self.set_codes[self.set_offs[set_id]:self.set_offs[set_id + 1]]
+        return [self.labels[code] for code in codes]
+
+    def lookup(self, zip_code: str) -> Optional[Dict]:
+        """
+        {"district": primary district, "state": its state, "districts": all}
+        for a 5-digit ZIP, or None when the ZIP is not covered
+        """
+        if not zip_code or len(zip_code) != 5 or not zip_code.isdigit():
+            return None
+        districts = self.districts(int(zip_code))
+        if not districts:
+            return None
+        return {
+            "district": districts[0],
+            "state": districts[0].split('-')[0],
+            "districts": districts,
+        }
+
+    def close(self):
+        """Release the memory map"""
+        if self._source is not None:
+            self.starts = self.ends = self.set_ids = self.set_offs = self.set_codes = None
+            self._source.close()
+            self._source = None
+
+
+# Seconds between checks whether a mapped index file was rebuilt
+INDEX_RECHECK_SECONDS = 5.0
+
+_indexes: Dict[str, ZipDistrictIndex] = {}
+# path -> ((st_ino, st_mtime_ns, st_size) of the mapped file, time of the last check)
+_index_files: Dict[str, Tuple[Optional[Tuple], float]] = {}
+_indexes_lock = threading.Lock()
+_sample_index: Optional[ZipDistrictIndex] = None
+_warned_missing = set()
+
+
+def get_zip_index(path: str = DEFAULT_ZIP_INDEX) -> ZipDistrictIndex:
+    """
+    Shared index for a compiled file (mapped once per process), or the
+    built-in sample Florida ranges while the file has not been built.
+    The sample is never cached for the path, so a file built later is
+    picked up by the next lookup. A rebuilt file (new inode, mtime or
+    size) is mapped again within INDEX_RECHECK_SECONDS; callers holding
+    the old index keep a valid view.
+    """
+    index = _indexes.get(path)
+    if index is not None and time.monotonic() - _index_files.get(path, (None, 0.0))[1] < INDEX_RECHECK_SECONDS:
+        return index
+
+    global _sample_index
+    with _indexes_lock:
+        index = _indexes.get(path)
+        file_id, checked_at = _index_files.get(path, (None, 0.0))
+        now = time.monotonic()
+        if index is not None and now - checked_at < INDEX_RECHECK_SECONDS:
+            return index
+
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stat = None
+        if stat is not None:
+            current = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if index is None or current != file_id:
+                index = _indexes[path] = ZipDistrictIndex.open(path)
+            _index_files[path] = (current, now)
+            return index
+        if index is not None:
+            # Removed after it was mapped: keep answering from the mapping
+            _index_files[path] = (file_id, now)
+            return index
+
+        if path not in _warned_missing:
+            _warned_missing.add(path)
+            print(f"[!] ZIP index {path} not found: only the sample Florida ZIP ranges resolve. "
+                  f"Build it with: python utils/zip_index.py <relationship file>", file=sys.stderr)
+        if _sample_index is None:
+            _sample_index = ZipDistrictIndex.from_intervals(SAMPLE_INTERVALS)
+        return _sample_index
+
+
+def lookup_zip(zip_code: str, path: str = DEFAULT_ZIP_INDEX) -> Optional[Dict]:
+    """Districts for a ZIP code from the offline index"""
+    return get_zip_index(path).lookup(zip_code)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    build_zip_index(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else DEFAULT_ZIP_INDEX)
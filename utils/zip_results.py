@@ -0,0 +1,164 @@
+"""
+Precomputed search_by_zip results for every ZIP code
+A build step (build_zip_results.py) runs the live lookup once per distinct
+district set and stores the answers in a memory-mappable file. The app then
+answers any ZIP with one slot read; each distinct result is decoded from
+JSON once, on first use, and shared after that. The file records a
+fingerprint of the roster snapshot and ZIP index it was built from, and it
+is only used while both are unchanged.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_ZIP_RESULTS = "data/zip_results.bin"
+
+# File layout (little-endian):
+#   header     magic, version, fingerprint (32 hex chars), built_at, n_results, blob_len
+#   slots      uint16[100000]        result number of each ZIP 00000-99999
+#   offsets    uint32[n_results + 1] slice of blob for each result
+#   blob       utf-8 JSON documents, one per distinct result
+# Result 0 is the answer for ZIPs the index does not cover.
+MAGIC = b'ZCRS'
+VERSION = 1
+HEADER = struct.Struct('<4sH32sdII')
+ZIP_COUNT = 100_000
+
+MISSING = object()
+
+
+def source_fingerprint(snapshot_fingerprint: Tuple, index_fingerprint: str) -> str:
+    """Identity of the data a result file is built from: roster snapshot + ZIP index"""
+    digest = hashlib.sha256(repr(tuple(snapshot_fingerprint)).encode('utf-8'))
+    digest.update(index_fingerprint.encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def write_zip_results(slots: List[int], results: List[Dict], fingerprint: str,
+                      built_at: float, output_path: str = DEFAULT_ZIP_RESULTS) -> int:
+    """Write per-ZIP result numbers and the distinct results; returns the file size"""
+    if len(slots) != ZIP_COUNT:
+        raise ValueError(f"Expected {ZIP_COUNT} slots, got {len(slots)}")
+    if len(results) > 0xFFFF:
+        raise ValueError(f"Too many distinct results ({len(results)}) for 16-bit slots")
+
+    documents = [json.dumps(result, separators=(',', ':')).encode('utf-8') for result in results]
+    offsets = [0]
+    for document in documents:
+        offsets.append(offsets[-1] + len(document))
+    blob = b''.join(documents)
+
+    data = b''.join([
+        HEADER.pack(MAGIC, VERSION, fingerprint.encode('ascii'), built_at, len(results), len(blob)),
+        struct.pack(f'<{ZIP_COUNT}H', *slots),
+        struct.pack(f'<{len(offsets)}I', *offsets),
+        blob,
+    ])
+
+    # Write then rename, so processes with the old file mapped keep a valid view
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, output_path)
+    return len(data)
+
+
+class ZipResults:
+    """Memory-mapped precomputed results, one slot per ZIP"""
+
+    def __init__(self, path: str = DEFAULT_ZIP_RESULTS):
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, fingerprint, built_at, count, blob_len = HEADER.unpack_from(self._mapped)
+        if magic != MAGIC or version != VERSION:
+            self._mapped.close()
+            raise ValueError(f"{path} is not a version {VERSION} ZIP results file")
+
+        self.path = path
+        self.file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self.fingerprint = fingerprint.decode('ascii')
+        self.built_at = built_at
+        self.count = count
+
+        view = memoryview(self._mapped)
+        offset = HEADER.size
+        slots = view[offset:offset + ZIP_COUNT * 2]
+        offset += ZIP_COUNT * 2
+        offsets = view[offset:offset + (count + 1) * 4]
+        offset += (count + 1) * 4
+        if sys.byteorder == 'little':
+            self._slots, self._offsets = slots.cast('H'), offsets.cast('I')
+        else:
+            self._slots = struct.unpack(f'<{ZIP_COUNT}H', slots)
+            self._offsets = struct.unpack(f'<{count + 1}I', offsets)
+        self._blob = view[offset:offset + blob_len]
+        # Decoded results by result number (ZIPs with the same districts share one)
+        self._decoded: Dict[int, Dict] = {}
+
+    def lookup(self, zip_code: str) -> Optional[Dict]:
+        """
+        The stored result for a 5-digit ZIP, or None for invalid input.
+        Results are shared between callers and must be treated as read-only
+        (member rows are read-only mappings, as in the snapshot).
+        """
+        if not zip_code or len(zip_code) != 5 or not zip_code.isdigit():
+            return None
+        number = self._slots[int(zip_code)]
+        result = self._decoded.get(number)
+        if result is None:
+            # Two threads may both decode a result; either copy is the same
+            result = self._decoded[number] = self._decode(number)
+        return result
+
+    def _decode(self, number: int) -> Dict:
+        result = json.loads(self._blob[self._offsets[number]:self._offsets[number + 1]].tobytes())
+        if result['house_rep'] is not None:
+            result['house_rep'] = MappingProxyType(result['house_rep'])
+        result['house_reps'] = [MappingProxyType(rep) for rep in result['house_reps']]
+        result['senators'] = [MappingProxyType(rep) for rep in result['senators']]
+        return result
+
+    def close(self):
+        """Release the memory map"""
+        self._slots = self._offsets = self._blob = None
+        self._decoded = {}
+        self._mapped.close()
+
+
+_results: Dict[str, Optional[ZipResults]] = {}
+_results_lock = threading.Lock()
+
+
+def get_zip_results(path: str = DEFAULT_ZIP_RESULTS, reload: bool = False) -> Optional[ZipResults]:
+    """
+    Shared mapping of a results file (mapped once per process), or None when
+    it has not been built. reload=True first checks whether the file was
+    rebuilt (or created) and maps the new one; readers of the old mapping
+    keep a valid view.
+    """
+    results = _results.get(path, MISSING)
+    if results is not MISSING and not reload:
+        return results
+
+    with _results_lock:
+        results = _results.get(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            results = None
+        else:
+            if results is None or results.file_id != (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+                results = ZipResults(path)
+        _results[path] = results
+    return results